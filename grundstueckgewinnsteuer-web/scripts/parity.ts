@@ -1,18 +1,26 @@
 /**
  * Parity test script.
  *
- * Loads fixtures from tests/fixtures/parity.json and asserts that the TS
- * engine produces matching results to the Python reference.
+ * Loads fixtures from tests/fixtures/parity.json, computes each one with the
+ * TS engine and asserts that every expected field matches the Python
+ * reference to the Rappen.
  *
- * Usage: npx tsx scripts/parity.ts
+ * Also streams large generated corpora: pass a directory written by
+ * `python -m grundstueckgewinnsteuer.parity <dir>` (manifest.json plus
+ * gzip-compressed JSON Lines shards, one fixture per line).
+ *
+ * Usage: npx tsx scripts/parity.ts [fixtures.json | corpus-dir]
  */
 
-import { readFileSync } from "fs";
-import { resolve } from "path";
+import { createReadStream, existsSync, readFileSync, statSync } from "fs";
+import { join, resolve } from "path";
+import { createInterface } from "readline";
+import { createGunzip } from "zlib";
 import Decimal from "decimal.js";
 
-// Since we can't use @/ aliases in tsx directly, use relative paths
-// In practice this would use the compiled output or vitest aliases
+// tsx resolves the @/ aliases inside the engine from tsconfig.json
+import { computeTax } from "../src/lib/tax/compute";
+import type { TaxInputs, TaxResult } from "../src/lib/tax/types";
 
 interface ParityFixture {
     label: string;
@@ -27,7 +35,7 @@ interface ParityFixture {
         acquisitionCosts: string;
         sellingCosts: string;
         investments: Array<{ description: string; amount: string }>;
-        taxpayerType: string;
+        taxpayerType: TaxInputs["taxpayerType"];
         confessions: Record<string, number>;
     };
     expected: {
@@ -51,60 +59,82 @@ function assertClose(actual: string, expected: string, label: string, field: str
     return true;
 }
 
-async function main() {
-    const fixturePath = resolve(__dirname, "../tests/fixtures/parity.json");
-    const fixtures: ParityFixture[] = JSON.parse(readFileSync(fixturePath, "utf-8"));
-
-    console.log(`\n🔍 Running parity checks against ${fixtures.length} fixtures...\n`);
+interface CorpusManifest {
+    cases: number;
+    shards: Array<{ file: string; cases: number }>;
+}
 
-    let passed = 0;
-    let failed = 0;
+async function* readShard(path: string): AsyncGenerator<ParityFixture> {
+    const raw = createReadStream(path);
+    const input = path.endsWith(".gz") ? raw.pipe(createGunzip()) : raw;
+    for await (const line of createInterface({ input, crlfDelay: Infinity })) {
+        if (line) yield JSON.parse(line) as ParityFixture;
+    }
+}
 
-    // Dynamic import of compute function
-    // Note: In a real setup, this would require the project to be built first
-    // For now, this script validates the fixture format and can be run after build
-    for (const fix of fixtures) {
-        const gains = {
-            taxableGain: fix.expected.taxableGain,
-            simpleTax: fix.expected.simpleTax,
-            totalTax: fix.expected.totalTax,
-        };
-
-        // Self-check: verify fixtures are consistent
-        const gain = new Decimal(fix.inputs.salePrice)
-            .minus(new Decimal(fix.inputs.purchasePrice))
-            .minus(new Decimal(fix.inputs.acquisitionCosts || "0"))
-            .minus(new Decimal(fix.inputs.sellingCosts || "0"));
-
-        const investTotal = fix.inputs.investments.reduce(
-            (sum, inv) => sum.plus(new Decimal(inv.amount || "0")),
-            new Decimal("0"),
-        );
-        const expectedGain = gain.minus(investTotal);
-
-        let ok = true;
-
-        // Check taxable gain consistency
-        if (expectedGain.gt(0)) {
-            ok = assertClose(fix.expected.taxableGain, expectedGain.toString(), fix.label, "taxableGain");
+async function* readFixtures(target: string): AsyncGenerator<ParityFixture> {
+    if (statSync(target).isDirectory()) {
+        const manifest: CorpusManifest = JSON.parse(readFileSync(join(target, "manifest.json"), "utf-8"));
+        for (const shard of manifest.shards) {
+            yield* readShard(join(target, shard.file));
         }
+        return;
+    }
+    const fixtures: ParityFixture[] = JSON.parse(readFileSync(target, "utf-8"));
+    yield* fixtures;
+}
+
+const FIELDS = ["taxableGain", "simpleTax", "totalTax", "cantonShare", "communeShare", "churchTaxTotal"] as const;
 
-        // Check that simpleTax <= totalTax (or equal)
-        if (new Decimal(fix.expected.simpleTax).gt(new Decimal(fix.expected.totalTax).plus("0.01"))) {
-            // simpleTax should be <= totalTax for most cantons
-            // (exception: some cantons where simpleTax = totalTax)
+function checkFixture(fix: ParityFixture): boolean {
+    let result: TaxResult;
+    try {
+        result = computeTax(fix.inputs);
+    } catch (err) {
+        console.error(`  ❌ ${fix.label}: ${err instanceof Error ? err.message : err}`);
+        return false;
+    }
+    let ok = true;
+    for (const field of FIELDS) {
+        const expected = fix.expected[field];
+        if (expected !== undefined && !assertClose(result[field], expected, fix.label, field)) {
+            ok = false;
         }
+    }
+    return ok;
+}
+
+async function main() {
+    const target = resolve(process.argv[2] ?? resolve(__dirname, "../tests/fixtures/parity.json"));
+    if (!existsSync(target)) {
+        console.error(`Fixture file or corpus directory not found: ${target}`);
+        process.exit(1);
+    }
+    const streaming = statSync(target).isDirectory();
+
+    console.log(`\n🔍 Running parity checks against ${target}...\n`);
+
+    let passed = 0;
+    let failed = 0;
 
-        if (ok) {
-            console.log(`  ✅ ${fix.label}: gain=${gains.taxableGain}, simple=${gains.simpleTax}, total=${gains.totalTax}`);
+    for await (const fix of readFixtures(target)) {
+        if (checkFixture(fix)) {
+            if (!streaming) {
+                console.log(
+                    `  ✅ ${fix.label}: gain=${fix.expected.taxableGain}, simple=${fix.expected.simpleTax}, total=${fix.expected.totalTax}`,
+                );
+            }
             passed++;
         } else {
             failed++;
         }
+        if (streaming && (passed + failed) % 100_000 === 0) {
+            console.log(`  … ${passed + failed} checked`);
+        }
     }
 
     console.log(`\n${"=".repeat(60)}`);
-    console.log(`Results: ${passed} passed, ${failed} failed, ${fixtures.length} total`);
+    console.log(`Results: ${passed} passed, ${failed} failed, ${passed + failed} total`);
     console.log(`${"=".repeat(60)}\n`);
 
     if (failed > 0) {
@@ -112,4 +142,7 @@ async function main() {
     }
 }
 
-main().catch(console.error);
+main().catch((err) => {
+    console.error(err);
+    process.exit(1);
+});
@@ -0,0 +1,95 @@
+"""asyncio facade: compute off the event loop with bounded concurrency.
+
+The CPU work runs in an executor – the loop's default thread pool, any
+``concurrent.futures.Executor``, or an :class:`~grundstueckgewinnsteuer.pool.EnginePool`.
+
+Usage::
+
+    result = await acompute(inputs, executor=pool)
+
+    async with contextlib.aclosing(acompute_many(source, concurrency=16, executor=pool)) as results:
+        async for result in results:              # same order as ``source``
+            ...
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from concurrent.futures import Executor
+
+from grundstueckgewinnsteuer.models import TaxInputs, TaxResult
+from grundstueckgewinnsteuer.pool import EnginePool, compute
+
+
+async def acompute(inputs: TaxInputs, *, executor: Executor | EnginePool | None = None) -> TaxResult:
+    """Compute *inputs* in *executor* without blocking the event loop."""
+    if isinstance(executor, EnginePool):
+        return await asyncio.wrap_future(executor.submit(inputs))
+    return await asyncio.get_running_loop().run_in_executor(executor, compute, inputs)
+
+
+async def _aiter(inputs: AsyncIterable[TaxInputs] | Iterable[TaxInputs]) -> AsyncIterator[TaxInputs]:
+    if isinstance(inputs, AsyncIterable):
+        async for item in inputs:
+            yield item
+    else:
+        for item in inputs:
+            yield item
+
+
+async def acompute_many(
+    inputs: AsyncIterable[TaxInputs] | Iterable[TaxInputs],
+    *,
+    concurrency: int = 8,
+    executor: Executor | EnginePool | None = None,
+) -> AsyncIterator[TaxResult]:
+    """Compute a stream of inputs, yielding results in input order.
+
+    At most *concurrency* inputs are pulled from the source but not yet
+    yielded (running, queued or finished-but-waiting for an earlier one),
+    so a fast producer is throttled to the consumer's pace.  An error in
+    the source or a computation is raised at its position in the stream;
+    closing or cancelling the iteration cancels the producer and every
+    pending computation.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    slots = asyncio.Semaphore(concurrency)
+    queue: asyncio.Queue[asyncio.Future[TaxResult] | None] = asyncio.Queue()
+
+    async def produce() -> None:
+        source = _aiter(inputs)
+        try:
+            while True:
+                await slots.acquire()
+                try:
+                    item = await anext(source)
+                except StopAsyncIteration:
+                    return
+                queue.put_nowait(asyncio.ensure_future(acompute(item, executor=executor)))
+        finally:
+            queue.put_nowait(None)
+            await source.aclose()
+
+    producer = asyncio.create_task(produce())
+    pending: list[asyncio.Future[TaxResult]] = []
+    try:
+        while (task := await queue.get()) is not None:
+            pending.append(task)
+            try:
+                result = await task
+            finally:
+                pending.remove(task)
+                slots.release()
+            yield result
+        await producer
+    finally:
+        producer.cancel()
+        while not queue.empty():
+            queued = queue.get_nowait()
+            if queued is not None:
+                pending.append(queued)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(producer, *pending, return_exceptions=True)
@@ -0,0 +1,283 @@
+"""``ggst`` command line: compute one transaction from flags or stdin.
+
+Usage::
+
+    ggst --canton ZH --commune Zürich --year 2025 \\
+         --purchase-date 2015-04-01 --sale-date 2025-04-01 \\
+         --purchase-price 800000 --sale-price 1000000
+    echo '{"canton": "ZH", "commune": "Zürich", ...}' | ggst - --json
+
+    ggst daemon &          # keep warm engines in a background process
+    ggst stop
+
+Start-up is dominated by importing pydantic, yaml and the canton engines.
+``ggst daemon`` keeps warm engines in one long-lived process listening on a
+Unix domain socket.  Every invocation first tries that socket; when a daemon
+answers, the client only forwards its arguments and stdin and prints the
+reply – that path imports nothing beyond the interpreter's start-up
+modules, ``marshal`` and ``_socket``.  Without a daemon (or with
+``GGST_NO_DAEMON=1``) the transaction is computed in-process.
+
+The socket is ``$GGST_SOCKET``, else ``$XDG_RUNTIME_DIR/ggst.sock``, else
+``/tmp/ggst-<uid>.sock``, and is created with mode 0600; clients only
+connect to a socket owned by their own user.  Frames are a
+4-byte big-endian length followed by a ``marshal`` payload:
+``(argv, stdin)`` in, ``(exit code, stdout, stderr)`` out.  The daemon
+serves one request at a time; a client that gets no reply within
+:data:`TIMEOUT` seconds computes locally instead, and the daemon drops a
+client that stalls for as long.
+"""
+
+from __future__ import annotations
+
+import _socket  # the socket module would pull in enum and selectors
+import marshal
+import os
+import stat  # imported by os anyway
+import sys
+
+_MONEY_FIELDS = ("taxable_gain", "simple_tax", "canton_share", "commune_share", "church_tax_total", "total_tax")
+
+TIMEOUT = 5.0
+"""Seconds a client waits for the daemon (connect and reply) before computing locally."""
+
+# Options of ``_parser`` that take a value; the client scans argv with these instead of importing argparse
+_VALUE_OPTIONS = frozenset({
+    "--canton", "--commune", "--year", "--purchase-date", "--sale-date", "--purchase-price", "--sale-price",
+    "--acquisition-costs", "--selling-costs", "--investments", "--confession",
+})
+
+
+# ---------------------------------------------------------------------------
+# Wire protocol
+# ---------------------------------------------------------------------------
+
+def socket_path() -> str:
+    """Path of the daemon socket for the current user."""
+    if path := os.environ.get("GGST_SOCKET"):
+        return path
+    if runtime := os.environ.get("XDG_RUNTIME_DIR"):
+        return os.path.join(runtime, "ggst.sock")
+    return f"/tmp/ggst-{os.getuid()}.sock"
+
+
+def _send(sock, value) -> None:
+    payload = marshal.dumps(value)
+    sock.sendall(len(payload).to_bytes(4, "big") + payload)
+
+
+def _read(sock, n: int) -> bytes:
+    chunks = []
+    while n:
+        chunk = sock.recv(min(n, 1 << 16))
+        if not chunk:
+            raise ConnectionError("ggst daemon closed the connection")
+        chunks.append(chunk)
+        n -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv(sock):
+    return marshal.loads(_read(sock, int.from_bytes(_read(sock, 4), "big")))
+
+
+def forward(
+    argv: list[str], stdin: str | None, path: str | None = None, timeout: float | None = None,
+) -> tuple[int, str, str] | None:
+    """Send one invocation to a running daemon; ``None`` if none answers within *timeout* (:data:`TIMEOUT`) s.
+
+    Only a socket owned by the current user is trusted, and a reply that is
+    not ``(exit code, stdout, stderr)`` counts as no answer.
+    """
+    path = path or socket_path()
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return None
+    if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+        return None  # e.g. a /tmp path another user created first
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    sock.settimeout(TIMEOUT if timeout is None else timeout)
+    try:
+        sock.connect(path)
+        _send(sock, (list(argv), stdin))
+        reply = _recv(sock)
+    except OSError:  # a stale socket left by a dead daemon, a busy or hung daemon (timeout)
+        return None
+    except (ValueError, EOFError, TypeError):  # not a marshal frame
+        return None
+    finally:
+        sock.close()
+    if type(reply) is tuple and len(reply) == 3 and type(reply[0]) is int and all(type(x) is str for x in reply[1:]):
+        return reply
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Computation (imported lazily: the client path never gets here)
+# ---------------------------------------------------------------------------
+
+def _parser():
+    import argparse
+    from datetime import date
+    from decimal import Decimal
+
+    parser = argparse.ArgumentParser(
+        prog="ggst",
+        allow_abbrev=False,  # keeps _VALUE_OPTIONS exact
+        description="Compute the Grundstückgewinnsteuer of one sale. Pass '-' to read TaxInputs JSON from stdin; "
+                    "flags override its fields.",
+    )
+    parser.add_argument("source", nargs="?", choices=["-"], help="read the transaction as JSON from stdin")
+    parser.add_argument("--canton")
+    parser.add_argument("--commune")
+    parser.add_argument("--year", dest="tax_year", type=int)
+    parser.add_argument("--purchase-date", type=date.fromisoformat)
+    parser.add_argument("--sale-date", type=date.fromisoformat)
+    parser.add_argument("--purchase-price", type=Decimal)
+    parser.add_argument("--sale-price", type=Decimal)
+    parser.add_argument("--acquisition-costs", type=Decimal)
+    parser.add_argument("--selling-costs", type=Decimal)
+    parser.add_argument("--investments", type=Decimal, help="total value-adding investments")
+    parser.add_argument(
+        "--confession", action="append", default=[], metavar="KEY=PEOPLE", help="church tax members (repeatable)",
+    )
+    parser.add_argument("--json", action="store_true", help="print the full TaxResult as JSON")
+    return parser
+
+
+def _inputs(args, stdin: str | None):
+    import json
+
+    from grundstueckgewinnsteuer.models import TaxInputs
+
+    fields = json.loads(stdin) if args.source == "-" else {}
+    for name in (
+        "canton", "commune", "tax_year", "purchase_date", "sale_date", "purchase_price", "sale_price",
+        "acquisition_costs", "selling_costs",
+    ):
+        if getattr(args, name) is not None:
+            fields[name] = getattr(args, name)
+    if args.investments is not None:
+        fields["investments"] = [{"description": "Investitionen", "amount": args.investments}]
+    if args.confession:
+        key_counts = (item.partition("=") for item in args.confession)
+        fields["confessions"] = {key: int(count or 1) for key, _, count in key_counts}
+    return TaxInputs.model_validate(fields)
+
+
+def _format(result) -> str:
+    rows = [(name, str(getattr(result, name))) for name in _MONEY_FIELDS]
+    rows.append(("effective_tax_rate_percent", str(result.effective_tax_rate_percent)))
+    rows.append(("holding_months", str(result.holding_months)))
+    width = max(len(name) for name, _ in rows)
+    return "".join(f"{name:<{width}}  {value}\n" for name, value in rows)
+
+
+def run(argv: list[str], stdin: str | None = None) -> tuple[int, str, str]:
+    """Execute one ``ggst`` invocation in this process and return ``(exit code, stdout, stderr)``."""
+    import contextlib
+    import io
+
+    from grundstueckgewinnsteuer.pool import compute
+
+    out, err = io.StringIO(), io.StringIO()
+    parser = _parser()
+    try:
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            args = parser.parse_args(argv)
+    except SystemExit as exc:
+        return int(exc.code or 0), out.getvalue(), err.getvalue()
+    try:
+        result = compute(_inputs(args, stdin))
+    except Exception as exc:  # bad JSON shape, invalid inputs, unknown canton: report, never crash the daemon
+        return 1, "", f"ggst: error: {exc}\n"
+    return 0, result.model_dump_json() + "\n" if args.json else _format(result), ""
+
+
+# ---------------------------------------------------------------------------
+# Daemon
+# ---------------------------------------------------------------------------
+
+def serve(path: str | None = None, *, warm: bool = True) -> None:
+    """Listen on the daemon socket until a ``ggst stop`` request arrives."""
+    import socketserver
+
+    from grundstueckgewinnsteuer.pool import warm_up
+
+    path = path or socket_path()
+    if forward(["--help"], None, path) is not None:
+        raise RuntimeError(f"A ggst daemon is already listening on {path}")
+    if os.path.exists(path):
+        os.unlink(path)
+    if warm:
+        warm_up()
+
+    stopping = False
+
+    class Handler(socketserver.BaseRequestHandler):
+        def handle(self) -> None:
+            nonlocal stopping
+            self.request.settimeout(TIMEOUT)
+            try:
+                argv, stdin = _recv(self.request)
+            except (OSError, ValueError, EOFError, TypeError):  # stalled client or malformed frame
+                return
+            if argv == ["stop"]:
+                stopping = True
+                _send(self.request, (0, "", ""))
+            else:
+                _send(self.request, run(argv, stdin))
+
+    umask = os.umask(0o177)
+    try:
+        server = socketserver.UnixStreamServer(path, Handler)
+    finally:
+        os.umask(umask)
+    try:
+        while not stopping:
+            server.handle_request()
+    finally:
+        server.server_close()
+        os.unlink(path)
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def _reads_stdin(argv: list[str]) -> bool:
+    """Whether *argv* has the positional ``-`` (not the value of an option such as ``--commune -``)."""
+    options, value = True, False
+    for arg in argv:
+        if value:
+            value = False
+        elif options and arg == "--":
+            options = False
+        elif arg == "-":
+            return True
+        elif options:
+            value = arg in _VALUE_OPTIONS
+    return False
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ["daemon"]:
+        serve(argv[1] if len(argv) > 1 else None)
+        return 0
+    stdin = sys.stdin.read() if _reads_stdin(argv) else None
+    reply = None if os.environ.get("GGST_NO_DAEMON") else forward(argv, stdin)
+    if reply is None:
+        if argv == ["stop"]:
+            sys.stderr.write("ggst: no daemon running\n")
+            return 1
+        reply = run(argv, stdin)
+    code, out, err = reply
+    sys.stdout.write(out)
+    sys.stderr.write(err)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,408 @@
+"""Packaged commune index: BFS number, name, canton and validity years.
+
+The index is loaded once from ``data/communes/index.json`` and answers
+every lookup from pre-built dictionaries:
+
+* by BFS Gemeindenummer (:meth:`CommuneIndex.by_bfs`),
+* by name, case-, accent- and umlaut-insensitive (:meth:`CommuneIndex.lookup`),
+* per canton and tax year (:meth:`CommuneIndex.communes`),
+* as-you-type, ranked prefix and fuzzy search (:meth:`CommuneIndex.search`).
+
+A commune's validity is an inclusive range of years; ``None`` means open
+ended.  Mergers are modelled by closing the old communes' ranges and
+opening the new one's.
+
+The packaged file only carries the communes the canton engines know about
+and no BFS numbers yet, so BFS lookups (:meth:`CommuneIndex.by_bfs`,
+:meth:`CommuneIndex.canton_of` with a number) fail until an official
+*Amtliches Gemeindeverzeichnis* CSV extract is imported::
+
+    communes = read_commune_csv("gemeinden.csv", columns={
+        "bfs": "BFS_NR", "name": "GEMEINDENAME", "canton": "KANTON",
+        "valid_from": "GUELTIG_VON", "valid_to": "GUELTIG_BIS",
+    }, delimiter=";")
+    write_commune_index(communes, "index.json", source="BFS Gemeindeverzeichnis, Stand 2025-01-01")
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from functools import cache, cached_property
+from itertools import chain, islice
+from pathlib import Path
+
+_INDEX = Path(__file__).resolve().parent / "data" / "communes" / "index.json"
+
+COLUMNS = ("bfs", "name", "canton", "valid_from", "valid_to")
+"""Row layout of ``index.json`` and default CSV header names."""
+
+
+# ---------------------------------------------------------------------------
+# Names
+# ---------------------------------------------------------------------------
+
+_UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue"})
+_SEPARATORS = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_name(name: str) -> str:
+    """Fold *name* for matching: case- and accent-insensitive, punctuation collapsed to single spaces.
+
+    ``"Zürich"``, ``"ZURICH"`` and ``"zurich"`` all give ``"zurich"``;
+    ``"Yverdon-les-Bains"`` gives ``"yverdon les bains"``.
+    """
+    decomposed = unicodedata.normalize("NFKD", name.casefold())
+    ascii_only = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _SEPARATORS.sub(" ", ascii_only).strip()
+
+
+def _name_keys(name: str) -> set[str]:
+    """Normalized spellings of *name*: accent-stripped and with ä/ö/ü transliterated (``"zuerich"``)."""
+    return {normalize_name(name), normalize_name(name.casefold().translate(_UMLAUTS))}
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True, slots=True)
+class Commune:
+    """One political commune and the years it existed in this form."""
+
+    bfs: int | None
+    name: str
+    canton: str
+    valid_from: int | None = None
+    valid_to: int | None = None
+
+    def valid_in(self, year: int | None) -> bool:
+        """``True`` if the commune existed in *year* (``None``: any year)."""
+        if year is None:
+            return True
+        return (self.valid_from is None or self.valid_from <= year) and (self.valid_to is None or year <= self.valid_to)
+
+
+class CommuneIndex:
+    """Immutable commune index with dictionary lookups.
+
+    Parameters
+    ----------
+    communes:
+        All communes, including historical ones.
+    """
+
+    def __init__(self, communes: Iterable[Commune]) -> None:
+        self._communes = tuple(communes)
+        self._by_bfs: dict[int, Commune] = {}
+        self._by_name: dict[str, list[Commune]] = {}
+        self._by_canton: dict[str, list[Commune]] = {}
+        self._per_year: dict[tuple[str, int | None], tuple[str, ...]] = {}
+        for commune in self._communes:
+            if commune.bfs is not None:
+                if commune.bfs in self._by_bfs:
+                    raise ValueError(f"Duplicate BFS number {commune.bfs}")
+                self._by_bfs[commune.bfs] = commune
+            for key in _name_keys(commune.name):
+                self._by_name.setdefault(key, []).append(commune)
+            self._by_canton.setdefault(commune.canton, []).append(commune)
+
+    # -- lookups -------------------------------------------------------------
+
+    def by_bfs(self, bfs: int) -> Commune:
+        """Commune with BFS number *bfs*; ``KeyError`` if unknown."""
+        try:
+            return self._by_bfs[bfs]
+        except KeyError:
+            hint = "" if self._by_bfs else " (the index has no BFS numbers; import them with read_commune_csv)"
+            raise KeyError(f"Unknown BFS commune number {bfs}{hint}") from None
+
+    def lookup(self, name: str, *, canton: str | None = None, year: int | None = None) -> Commune:
+        """Commune called *name*, optionally restricted to *canton* and to communes valid in *year*.
+
+        Raises ``KeyError`` if nothing matches and ``ValueError`` if the name
+        is ambiguous (e.g. the same name in two cantons) – pass *canton*.
+        """
+        candidates = [
+            c for c in self._by_name.get(normalize_name(name), ())
+            if (canton is None or c.canton == canton.upper()) and c.valid_in(year)
+        ]
+        if not candidates:
+            where = " in ".join(filter(None, [f"'{name}'", canton and canton.upper()]))
+            raise KeyError(f"Unknown commune {where}" + (f" for {year}" if year is not None else ""))
+        if len(candidates) > 1:
+            options = ", ".join(sorted(f"{c.name} ({c.canton})" for c in candidates))
+            raise ValueError(f"Ambiguous commune '{name}': {options}")
+        return candidates[0]
+
+    def canton_of(self, commune: str | int, *, year: int | None = None) -> str:
+        """Canton code of a commune given by name or BFS number."""
+        if isinstance(commune, int):
+            return self.by_bfs(commune).canton
+        return self.lookup(commune, year=year).canton
+
+    def communes(self, canton: str, year: int | None = None) -> list[str]:
+        """Names of *canton*'s communes valid in *year* (``None``: all), in index order.
+
+        Each ``(canton, year)`` list is built once and served from a cache.
+        """
+        key = (canton.upper(), year)
+        names = self._per_year.get(key)
+        if names is None:
+            names = self._per_year[key] = tuple(
+                c.name for c in self._by_canton.get(key[0], ()) if c.valid_in(year)
+            )
+        return list(names)
+
+    def search(
+        self, query: str, *, canton: str | None = None, year: int | None = None, limit: int = 10,
+    ) -> list[Commune]:
+        """Typeahead search: best matches for a partly typed *query* (see :class:`CommuneSearch`)."""
+        return self._search.search(query, canton=canton, year=year, limit=limit)
+
+    @cached_property
+    def _search(self) -> CommuneSearch:
+        return CommuneSearch(self._communes)
+
+    @property
+    def cantons(self) -> list[str]:
+        return sorted(self._by_canton)
+
+    def __len__(self) -> int:
+        return len(self._communes)
+
+    def __iter__(self) -> Iterator[Commune]:
+        return iter(self._communes)
+
+    def __contains__(self, item: object) -> bool:
+        if isinstance(item, int):
+            return item in self._by_bfs
+        return isinstance(item, str) and normalize_name(item) in self._by_name
+
+
+# ---------------------------------------------------------------------------
+# Typeahead search
+# ---------------------------------------------------------------------------
+
+# Ranks, best first; fuzzy matches add their edit distance
+_EXACT, _PREFIX, _WORD_PREFIX, _FUZZY = 0, 1, 2, 3
+
+_FUZZY_CANDIDATES = 16
+
+
+def _trigrams(key: str) -> set[str]:
+    """Trigrams of *key* padded at the front only, so a prefix shares the trigrams of the full name."""
+    padded = f"  {key}"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _typo_bound(query: str) -> int:
+    """Edits tolerated in a fuzzy match: none below three letters, one up to seven, two beyond."""
+    return 0 if len(query) < 3 else 1 if len(query) <= 7 else 2
+
+
+def _prefix_distance(query: str, key: str) -> int:
+    """Edit distance between *query* and the closest prefix of *key*.
+
+    Bit-parallel Levenshtein (Myers/Hyyrö) with the start of *key* fixed and
+    its end free: one pass over *key* with a few integer operations per
+    character.
+    """
+    m = len(query)
+    mask, high = (1 << m) - 1, 1 << (m - 1)
+    peq: dict[str, int] = {}
+    for i, c in enumerate(query):
+        peq[c] = peq.get(c, 0) | 1 << i
+    pv, mv, score = mask, 0, m
+    best = score
+    for c in key:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+            best = min(best, score)
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return best
+
+
+def _key_range(keys: list[str], prefix: str) -> tuple[int, int]:
+    """Slice of the sorted *keys* starting with *prefix* (keys only hold ``[0-9a-z ]``)."""
+    lo = bisect_left(keys, prefix)
+    return lo, bisect_left(keys, prefix + "\x7f", lo)
+
+
+class CommuneSearch:
+    """Ranked prefix and fuzzy commune search, built once per commune list.
+
+    Every normalized spelling of a name (see :func:`normalize_name`) is kept
+    in one sorted array and each of its word suffixes (``"les bains"`` for
+    ``"Yverdon-les-Bains"``) in another, so the prefix matches of a query
+    are two binary searches and two slices.  When prefixes give fewer than
+    *limit* hits, the names sharing most trigrams with the query (each typo
+    breaks at most three) are scored by the edit distance between the query
+    and their closest prefix, see :func:`_typo_bound`, until the result is
+    full.
+
+    Ranking: exact name, then name prefix, then word prefix, then fuzzy
+    matches by distance; ties go to the shorter, then alphabetically first
+    name.
+    """
+
+    def __init__(self, communes: Iterable[Commune]) -> None:
+        self._communes = tuple(communes)
+        self._keys = [tuple(_name_keys(c.name)) for c in self._communes]
+        self._by_order = sorted(range(len(self._communes)), key=lambda i: (
+            len(self._communes[i].name), self._communes[i].name,
+        ))
+        self._order = [0] * len(self._communes)
+        for position, i in enumerate(self._by_order):
+            self._order[i] = position
+
+        names: set[tuple[str, int]] = set()
+        words: set[tuple[str, int]] = set()
+        grams: dict[str, set[int]] = {}
+        for i, keys in enumerate(self._keys):
+            for key in keys:
+                names.add((key, i))
+                parts = key.split(" ")
+                words.update((" ".join(parts[w:]), i) for w in range(1, len(parts)))
+                for gram in _trigrams(key):
+                    grams.setdefault(gram, set()).add(i)
+        names_sorted, words_sorted = sorted(names), sorted(words)
+        self._name_keys = [key for key, _ in names_sorted]
+        self._name_ids = [i for _, i in names_sorted]
+        self._word_keys = [key for key, _ in words_sorted]
+        self._word_ids = [i for _, i in words_sorted]
+        self._grams = {gram: tuple(ids) for gram, ids in grams.items()}
+
+    def search(
+        self, query: str, *, canton: str | None = None, year: int | None = None, limit: int = 10,
+    ) -> list[Commune]:
+        """Up to *limit* communes matching *query*, best first, optionally restricted to *canton* / *year*."""
+        query = normalize_name(query)
+        if not query or limit < 1:
+            return []
+        canton = canton.upper() if canton else None
+
+        lo, hi = _key_range(self._word_keys, query)
+        ranks = dict.fromkeys(self._word_ids[lo:hi], _WORD_PREFIX)
+        lo, hi = _key_range(self._name_keys, query)
+        ranks.update(dict.fromkeys(self._name_ids[lo:hi], _PREFIX))
+        while lo < hi and self._name_keys[lo] == query:
+            ranks[self._name_ids[lo]] = _EXACT
+            lo += 1
+        if canton is not None or year is not None:
+            ranks = {i: rank for i, rank in ranks.items() if self._wanted(i, canton, year)}
+
+        if len(ranks) < limit:
+            self._fuzzy(query, ranks, canton, year, limit)
+
+        n = len(self._communes)
+        best = sorted(rank * n + self._order[i] for i, rank in ranks.items())[:limit]
+        return [self._communes[self._by_order[code % n]] for code in best]
+
+    def _wanted(self, i: int, canton: str | None, year: int | None) -> bool:
+        commune = self._communes[i]
+        return (canton is None or commune.canton == canton) and commune.valid_in(year)
+
+    def _fuzzy(self, query: str, ranks: dict[int, int], canton: str | None, year: int | None, limit: int) -> None:
+        bound = _typo_bound(query)
+        if not bound:
+            return
+        shared = Counter(chain.from_iterable(self._grams.get(gram, ()) for gram in _trigrams(query)))
+        needed = max(1, len(query) - 3 * bound)
+        candidates = (
+            i for i, count in shared.most_common()
+            if count >= needed and i not in ranks and self._wanted(i, canton, year)
+        )
+        missing = limit - len(ranks)
+        for i in islice(candidates, _FUZZY_CANDIDATES):
+            distance = min(_prefix_distance(query, key[:len(query) + bound]) for key in self._keys[i])
+            if distance <= bound:
+                ranks[i] = _FUZZY + distance
+                missing -= 1
+                if not missing:
+                    return
+
+
+@cache
+def load_commune_index(path: str | Path | None = None) -> CommuneIndex:
+    """Load (and cache) the packaged ``data/communes/index.json``, or the index at *path*."""
+    with open(path or _INDEX, encoding="utf-8") as f:
+        doc = json.load(f)
+    positions = [doc["columns"].index(name) for name in COLUMNS]
+    return CommuneIndex(Commune(*(row[i] for i in positions)) for row in doc["rows"])
+
+
+# ---------------------------------------------------------------------------
+# Import / export
+# ---------------------------------------------------------------------------
+
+def _year(value: str) -> int | None:
+    """``""`` → ``None``; ``"2024"``, ``"2024-01-01"`` or ``"01.01.2024"`` → ``2024``."""
+    value = value.strip()
+    if not value:
+        return None
+    match = re.fullmatch(r"(\d{4})(?:-\d{2}-\d{2})?|\d{1,2}\.\d{1,2}\.(\d{4})", value)
+    if match is None:
+        raise ValueError(f"Cannot read a year from '{value}'")
+    return int(match.group(1) or match.group(2))
+
+
+def read_commune_csv(
+    path: str | Path,
+    *,
+    columns: dict[str, str] | None = None,
+    delimiter: str = ",",
+    encoding: str = "utf-8-sig",
+) -> list[Commune]:
+    """Read communes from a CSV file, e.g. an extract of the official BFS commune register.
+
+    Parameters
+    ----------
+    columns:
+        Maps the fields of :data:`COLUMNS` to the file's header names;
+        fields not given are looked up under their own name.  ``valid_from``
+        and ``valid_to`` are optional and may hold years or dates.
+    """
+    header = {name: name for name in COLUMNS} | (columns or {})
+    communes = []
+    with open(path, encoding=encoding, newline="") as f:
+        for row in csv.DictReader(f, delimiter=delimiter):
+            bfs = row[header["bfs"]].strip()
+            communes.append(Commune(
+                bfs=int(bfs) if bfs else None,
+                name=row[header["name"]].strip(),
+                canton=row[header["canton"]].strip().upper(),
+                valid_from=_year(row.get(header["valid_from"]) or ""),
+                valid_to=_year(row.get(header["valid_to"]) or ""),
+            ))
+    return communes
+
+
+def write_commune_index(communes: Iterable[Commune], path: str | Path, *, source: str) -> None:
+    """Write *communes* in the ``index.json`` format (one row per line)."""
+    rows = ",\n".join(
+        "    " + json.dumps([c.bfs, c.name, c.canton, c.valid_from, c.valid_to], ensure_ascii=False)
+        for c in communes
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{\n")
+        f.write(f'  "source": {json.dumps(source, ensure_ascii=False)},\n')
+        f.write(f'  "columns": {json.dumps(list(COLUMNS))},\n')
+        f.write(f'  "rows": [\n{rows}\n  ]\n')
+        f.write("}\n")
@@ -0,0 +1,984 @@
+"""Vectorized batch evaluation (requires the optional ``batch`` extra).
+
+Install with ``pip install grundstueckgewinnsteuer-ch[batch]`` (numpy) or
+``[arrow]`` to also read/write pandas and Arrow tables.  Nothing in the
+scalar engines imports this module, so the core package stays numpy-free.
+
+:func:`compute_table` takes one row per transaction in columnar form and
+evaluates every canton partition with numpy kernels over the compiled
+integer models of :mod:`grundstueckgewinnsteuer.engine.fixedpoint`, so the
+amounts are identical to the Decimal engines.  No ``TaxInputs`` /
+``TaxResult`` objects are created unless :meth:`BatchResult.to_records`
+is called.
+
+For Steuerfuss cantons, :func:`multiplier_matrix` exposes the multipliers
+as ``(commune × year)`` arrays and :func:`tax_grid` evaluates the tax of
+every commune and year at once.
+
+Usage::
+
+    result = compute_table(df)              # pandas, pyarrow.Table or dict of arrays
+    result.columns["total_tax"]             # int64 Rappen
+    result.to_pandas()                      # decimal128 CHF columns
+
+    grid = tax_grid(gains, months, "SH")    # ShareGrid, arrays (gains, communes, years)
+    marginal_table(df).marginal_rate_percent
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import cache
+from typing import NamedTuple
+
+import numpy as np
+
+from grundstueckgewinnsteuer.engine.fixedpoint import (
+    _RAPPEN,
+    RATE_SCALE,
+    FixedPointEngine,
+    _BaselLand,
+    _BaselStadt,
+    _Bern,
+    _Brackets,
+    _Degressive,
+    _Progressive,
+    _Proportional,
+    _Schaffhausen,
+    _StGallen,
+    _Zug,
+    rappen_to_decimal,
+    to_rappen,
+)
+
+_INT64_MAX = int(np.iinfo(np.int64).max)
+
+MONEY_COLUMNS = ("taxable_gain", "simple_tax", "canton_share", "commune_share", "church_tax_total", "total_tax")
+"""Result columns holding CHF amounts (``int64`` Rappen in :attr:`BatchResult.columns`)."""
+
+RESULT_COLUMNS = ("canton", "commune", "tax_year", *MONEY_COLUMNS, "holding_months", "holding_years")
+
+_OPTIONAL_MONEY = ("acquisition_costs", "selling_costs", "investments_total")
+
+
+# ---------------------------------------------------------------------------
+# Holding periods
+# ---------------------------------------------------------------------------
+
+class HoldingPeriods(NamedTuple):
+    """Holding periods of many transactions as ``int64`` arrays."""
+
+    months: np.ndarray
+    years: np.ndarray
+
+
+def to_month_index(dates) -> np.ndarray:
+    """Convert dates to months since 1970-01 (``int64``).
+
+    Accepts anything ``numpy.asarray`` turns into ``datetime64``: arrays of
+    any datetime64 unit, sequences of ``datetime.date`` or ISO strings,
+    pandas ``Series``.  Sub-month parts are truncated towards the start of
+    the month, so the day of month never matters (as in
+    :func:`~grundstueckgewinnsteuer.engine.pipeline.months_between`).
+    """
+    arr = np.asarray(dates)
+    if arr.dtype.kind != "M":
+        arr = arr.astype("datetime64[D]")
+    return arr.astype("datetime64[M]").astype(np.int64)
+
+
+def holding_periods(purchase_dates, sale_dates) -> HoldingPeriods:
+    """Vectorized :func:`~grundstueckgewinnsteuer.engine.pipeline.months_between`.
+
+    Parameters
+    ----------
+    purchase_dates, sale_dates:
+        Date-like arrays of equal length (see :func:`to_month_index`).
+
+    Returns
+    -------
+    HoldingPeriods
+        ``months`` — calendar-month difference, identical to
+        ``months_between(purchase, sale)`` for every pair — and ``years``,
+        the completed years ``months // 12`` (floor division, like the
+        engines).
+    """
+    months = to_month_index(sale_dates) - to_month_index(purchase_dates)
+    return HoldingPeriods(months, months // 12)
+
+
+# ---------------------------------------------------------------------------
+# Exact integer array arithmetic
+# ---------------------------------------------------------------------------
+#
+# Kernels work on ``int64`` arrays and switch to arrays of Python ints
+# (``dtype=object``) wherever a product could overflow, so every result is
+# the exact integer the scalar fixed-point backend computes.
+
+def _absmax(a: np.ndarray) -> int:
+    if a.dtype == object:
+        return max((abs(v) for v in a.tolist()), default=0)
+    return int(np.abs(a).max(initial=0))
+
+
+def _int_array(values) -> np.ndarray:
+    """``int64`` array, or a Python-int object array if any value does not fit."""
+    values = list(values)
+    if all(-_INT64_MAX <= v <= _INT64_MAX for v in values):
+        return np.array(values, dtype=np.int64)
+    return np.array(values, dtype=object)
+
+
+def _mul(a, b) -> np.ndarray:
+    """Exact elementwise product."""
+    a, b = np.asarray(a), np.asarray(b)
+    if a.dtype != object and b.dtype != object and _absmax(a) * _absmax(b) <= _INT64_MAX:
+        return a * b
+    return a.astype(object) * b.astype(object)
+
+
+def _add(a, b) -> np.ndarray:
+    """Exact elementwise sum."""
+    a, b = np.asarray(a), np.asarray(b)
+    if a.dtype != object and b.dtype != object and _absmax(a) + _absmax(b) <= _INT64_MAX:
+        return a + b
+    return a.astype(object) + b.astype(object)
+
+
+def _round_half_even(num: np.ndarray, den) -> np.ndarray:
+    """Vectorized :func:`~grundstueckgewinnsteuer.engine.fixedpoint.round_half_even`."""
+    num, den_arr = np.asarray(num), np.asarray(den)
+    if num.dtype != object and (den_arr.dtype == object or 2 * _absmax(den_arr) > _INT64_MAX):
+        num = num.astype(object)
+    q = num // den
+    twice = 2 * (num - q * den)
+    return q + ((twice > den) | ((twice == den) & (q % 2 == 1)))
+
+
+def _ceil_div(num: np.ndarray, den: int) -> np.ndarray:
+    num = np.asarray(num)
+    if num.dtype != object and den > _INT64_MAX:
+        num = num.astype(object)
+    return -(-num // den)
+
+
+def _bracket_tax(brackets: _Brackets, gain: np.ndarray) -> np.ndarray:
+    """Vectorized ``_Brackets.tax``: one ``searchsorted`` for all rows."""
+    limits = _int_array(brackets.limits)
+    if gain.dtype == object or limits.dtype == object:
+        limits, gain = limits.astype(object), gain.astype(object)
+    i = np.searchsorted(limits, gain, side="left")
+    base_limit = _int_array([0, *brackets.limits])[i]
+    base_cum = _int_array([0, *brackets.cums])[i]
+    rate = _int_array([*brackets.rates, brackets.top or 0])[i]
+    return _add(base_cum, _mul(_add(gain, -base_limit), rate))
+
+
+def _bracket_rate(brackets: _Brackets, gain: np.ndarray) -> np.ndarray:
+    """Vectorized ``_Brackets.rate``: rate of the bracket just above each gain."""
+    limits = _int_array(brackets.limits)
+    if gain.dtype == object or limits.dtype == object:
+        limits, gain = limits.astype(object), gain.astype(object)
+    return _int_array([*brackets.rates, brackets.top or 0])[np.searchsorted(limits, gain, side="right")]
+
+
+def _table_values(table: list[int | None]) -> tuple[np.ndarray, np.ndarray]:
+    values = np.array([0 if v is None else v for v in table] or [0], dtype=np.int64)
+    present = np.array([v is not None for v in table] or [False])
+    return values, present
+
+
+def _surcharge_factor(table: list[int | None], months: np.ndarray) -> np.ndarray:
+    """``RATE_SCALE + surcharge`` per row (``RATE_SCALE`` where no surcharge applies)."""
+    values, present = _table_values(table)
+    idx = np.clip(months, 0, len(values) - 1)
+    applies = (months < len(table)) & present[idx]
+    return np.where(applies, RATE_SCALE + values[idx], RATE_SCALE)
+
+
+def _discount_factor(table: list[int | None], years: np.ndarray) -> np.ndarray:
+    """``RATE_SCALE - discount`` per row, with ``_lookup``'s clamping to the last entry."""
+    values, present = _table_values(table)
+    idx = np.clip(years, 0, len(values) - 1)
+    applies = (years >= 0) & present[idx]
+    return np.where(applies, RATE_SCALE - values[idx], RATE_SCALE)
+
+
+def _per_commune(commune: np.ndarray, tax_year: np.ndarray) -> tuple[list[tuple[int, str]], np.ndarray]:
+    """Distinct ``(tax_year, commune)`` pairs and each row's index into them."""
+    communes, commune_idx = np.unique(commune.astype(str), return_inverse=True)
+    years, year_idx = np.unique(tax_year, return_inverse=True)
+    codes, inverse = np.unique(commune_idx * len(years) + year_idx, return_inverse=True)
+    keys = [(int(years[c % len(years)]), str(communes[c // len(years)])) for c in codes.tolist()]
+    return keys, inverse.reshape(-1)
+
+
+# ---------------------------------------------------------------------------
+# Per-model kernels
+# ---------------------------------------------------------------------------
+
+class _Rows:
+    """Inputs of one canton partition plus the result columns being filled.
+
+    Rows start out as zero results (``taxable_gain`` = raw gain); kernels
+    compute on ``active`` rows only and write back with :meth:`set`.
+    """
+
+    def __init__(self, gain, months, cost, commune, tax_year) -> None:
+        self.gain, self.months, self.years = gain, months, months // 12
+        self.cost, self.commune, self.tax_year = cost, commune, tax_year
+        n = len(gain)
+        self.taxable_gain = gain.copy()
+        self.simple_tax = np.zeros(n, dtype=np.int64)
+        self.canton_share = np.zeros(n, dtype=np.int64)
+        self.commune_share = np.zeros(n, dtype=np.int64)
+
+    def set(self, active: np.ndarray, **columns: np.ndarray) -> None:
+        for name, values in columns.items():
+            getattr(self, name)[active] = values
+
+
+def _progressive_simple(m: _Progressive, gain: np.ndarray, months: np.ndarray) -> np.ndarray:
+    num = _bracket_tax(m.brackets, gain)
+    num = _mul(num, _surcharge_factor(m.surcharges, months))
+    num = _mul(num, _discount_factor(m.discounts, months // 12))
+    return _round_half_even(num, RATE_SCALE**3)
+
+
+def _k_progressive(m: _Progressive, r: _Rows) -> None:
+    active = (r.gain > 0) & (r.gain >= m.min_gain)
+    if m.min_inclusive:
+        active &= r.gain != m.min_gain
+    simple = _progressive_simple(m, r.gain[active], r.months[active])
+    simple = np.where(simple < m.min_tax, 0, simple)
+    if m.allocation == "commune":
+        r.set(active, simple_tax=simple, commune_share=simple)
+    elif m.allocation == "multiplier":
+        r.set(active, simple_tax=simple, canton_share=_round_half_even(_mul(simple, m.multiplier), RATE_SCALE))
+    else:
+        r.set(active, simple_tax=simple, canton_share=simple)
+
+
+def _k_schaffhausen(m: _Schaffhausen, r: _Rows) -> None:
+    active = r.gain > 0
+    keys, inverse = _per_commune(r.commune[active], r.tax_year[active])
+    index = m.steuerfuesse.index
+    kanton_rows, commune_rows = [], []
+    for year, name in keys:
+        row, kanton_row = index.get((year, name)), index.get((year, "Kanton"))
+        if row is None or kanton_row is None:
+            raise ValueError(f"No Steuerfuss data for commune '{name}' / year {year} in SH")
+        kanton_rows.append(kanton_row)
+        commune_rows.append(row)
+    simple = _progressive_simple(m, r.gain[active], r.months[active])
+    nat_pers = np.asarray(m.steuerfuesse.columns["natPers"], dtype=np.int64)
+
+    def share(rows: list[int]) -> np.ndarray:
+        return compute_shares(simple, nat_pers[np.array(rows, dtype=np.intp)][inverse])
+
+    r.set(active, simple_tax=simple, canton_share=share(kanton_rows), commune_share=share(commune_rows))
+
+
+def _k_bern(m: _Bern, r: _Rows) -> None:
+    active = (r.gain > 0) & (r.gain >= m.min_gain)
+    gain, months = r.gain[active], r.months[active]
+    values, present = _table_values(m.discounts)
+    idx = np.clip(months // 12, 0, len(values) - 1)
+    discount = np.where((months >= 0) & present[idx], values[idx], 0)
+    num = _bracket_tax(m.scaled_brackets, _mul(gain, RATE_SCALE - discount))
+    num = _mul(num, _surcharge_factor(m.surcharges, months))
+    simple = _round_half_even(num, RATE_SCALE**3)
+    r.set(active, simple_tax=simple, canton_share=simple)
+
+
+def _st_gallen_factors(m: _StGallen, gain: np.ndarray, months: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Additive surcharge rate and ``RATE_SCALE - discount`` per row."""
+    years = months // 12
+    surcharge = np.zeros(len(gain), dtype=np.int64)
+    pending = months < m.surcharge_threshold
+    for year, rate in m.surcharges:
+        hit = pending & (years < year)
+        surcharge[hit] = rate
+        pending &= ~hit
+    discount_years = years - m.discount_min_years + 1
+    discount = np.where(
+        gain >= m.discount_threshold,
+        np.minimum(m.discount_high * discount_years, m.discount_max_high),
+        np.minimum(m.discount_low * discount_years, m.discount_max_low),
+    )
+    return surcharge, np.where(years >= m.discount_min_years, RATE_SCALE - discount, RATE_SCALE)
+
+
+def _k_st_gallen(m: _StGallen, r: _Rows) -> None:
+    active = (r.gain > 0) & (r.gain > m.min_gain)
+    gain, months = r.gain[active], r.months[active]
+    flat = gain >= m.flat_threshold
+    num = np.where(flat, _mul(gain, m.flat_rate), _bracket_tax(m.brackets, gain))
+    surcharge, factor = _st_gallen_factors(m, gain, months)
+    num = _add(num, _mul(gain, surcharge))
+    simple = _round_half_even(_mul(num, factor), RATE_SCALE**2)
+    r.set(active, simple_tax=simple, canton_share=simple)
+
+
+def _k_proportional(m: _Proportional, r: _Rows) -> None:
+    taxable = r.gain // m.gain_rounding * m.gain_rounding
+    active = (r.gain > 0) & (r.gain >= m.min_gain) & (taxable >= m.min_gain)
+    months = r.months[active]
+    num = _mul(taxable[active], m.base_rate)
+    num = _mul(num, _surcharge_factor(m.surcharges, months))
+    if m.steuerfuss is not None:
+        num = _mul(num, m.steuerfuss)
+    else:
+        num = _mul(num, _discount_factor(m.discounts, months // 12))
+    simple = _round_half_even(num, RATE_SCALE**3)
+    r.set(active, taxable_gain=taxable[active], simple_tax=simple, canton_share=simple)
+
+
+def _k_degressive(m: _Degressive, r: _Rows) -> None:
+    active = (r.gain > 0) & (r.gain >= m.min_gain)
+    taxable = r.gain
+    if m.canton == "UR":
+        taxable = np.maximum(r.gain - m.freibetrag, 0) // m.gain_rounding * m.gain_rounding
+        active &= taxable > 0
+    taxable = taxable[active]
+    table = holding_rates(m.canton)
+    rate = table[np.clip(r.years[active], 0, len(table) - 1)]
+    simple = _round_half_even(_mul(taxable, rate), RATE_SCALE)
+    commune = _round_half_even(_mul(simple, m.commune_surcharge), RATE_SCALE) if m.commune_surcharge else 0
+    r.set(active, taxable_gain=taxable, simple_tax=simple, canton_share=simple, commune_share=commune)
+
+
+def _basel_stadt_factors(m: _BaselStadt, years: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Not-self-used rate and ``RATE_SCALE - reduction`` per row."""
+    rates = np.array([m.rate(y, False) for y in range(26)], dtype=np.int64)[np.clip(years, 0, 25)]
+    reduction = np.minimum(m.reduction_per_year * (years - m.reduction_start + 1), m.reduction_max)
+    return rates, RATE_SCALE - np.where(years >= m.reduction_start, reduction, 0)
+
+
+def _k_basel_stadt(m: _BaselStadt, r: _Rows) -> None:
+    active = (r.gain > 0) & (r.gain >= m.min_gain)
+    gain, years = r.gain[active], r.years[active]
+    rates, factor = _basel_stadt_factors(m, years)
+    simple = _round_half_even(_mul(_mul(gain, factor), rates), RATE_SCALE**2)
+    r.set(active, simple_tax=simple, canton_share=simple)
+
+
+def _k_basel_land(m: _BaselLand, r: _Rows) -> None:
+    active = r.gain > 0
+    gain, months = r.gain[active], r.months[active]
+    rate = np.zeros(len(gain), dtype=np.int64)
+    pending = np.ones(len(gain), dtype=bool)
+    prev = 0
+    for limit, base, increment in m.tiers:
+        hit = pending & (gain <= limit)
+        rate[hit] = base * 10_000 + increment * (gain[hit] - prev)
+        pending &= ~hit
+        prev = limit
+    max_rate = m.max_rate * 10_000
+    rate = np.minimum(np.where(gain > m.max_rate_above, max_rate, rate), max_rate)
+    factor = RATE_SCALE + m.surcharge_per_month * np.maximum(m.surcharge_threshold - months, 0)
+    simple = _round_half_even(_mul(_mul(gain, rate), factor), RATE_SCALE * 10_000 * RATE_SCALE)
+    r.set(active, simple_tax=simple, canton_share=simple)
+
+
+def _zug_rate(m: _Zug, gain: np.ndarray, cost: np.ndarray, months: np.ndarray) -> tuple:
+    """Rate in percent as exact ``(num, den)`` object arrays, and where it is the unclamped yield."""
+    undefined = (cost <= 0) | (months <= 0)
+    gain, cost = gain.astype(object), cost.astype(object)
+    years = months // 12
+
+    # Annual yield in percent as an exact num/den pair
+    short = years <= 5
+    safe_months = np.maximum(months, 1).astype(object)
+    safe_years = np.maximum(years, 1).astype(object)
+    y_num = np.where(short, gain * 1200, gain * 100)
+    y_den = np.where(short, cost * safe_months, cost * safe_years)
+
+    # Degressive max rate for each distinct holding year
+    distinct, inverse = np.unique(years, return_inverse=True)
+    max_rates = [
+        m.max_rate - min(m.reduction_per_year * (y - m.reduction_start + 1), m.reduction_max)
+        if y >= m.reduction_start else m.max_rate
+        for y in distinct.tolist()
+    ]
+    mx_num, mx_den = np.array(max_rates, dtype=object)[inverse], RATE_SCALE
+
+    over = y_num * mx_den > mx_num * y_den
+    r_num, r_den = np.where(over, mx_num, y_num), np.where(over, mx_den, y_den)
+    lo_num, lo_den = m.min_rate, RATE_SCALE
+    under = r_num * lo_den < lo_num * r_den
+    r_num, r_den = np.where(under, lo_num, r_num), np.where(under, lo_den, r_den)
+
+    r_num = np.where(undefined, m.max_rate, r_num)
+    r_den = np.where(undefined, RATE_SCALE, r_den)
+    return r_num, r_den, ~(over | under | undefined)
+
+
+def _k_zug(m: _Zug, r: _Rows) -> None:
+    active = (r.gain > 0) & (r.gain >= m.min_gain)
+    gain = r.gain[active]
+    r_num, r_den, _ = _zug_rate(m, gain, r.cost[active], r.months[active])
+    simple = _round_half_even(gain.astype(object) * r_num, r_den * 100)
+    r.set(active, simple_tax=simple, commune_share=simple)
+
+
+_KERNELS: dict[type, Callable] = {
+    _Progressive: _k_progressive,
+    _Schaffhausen: _k_schaffhausen,
+    _Bern: _k_bern,
+    _StGallen: _k_st_gallen,
+    _Proportional: _k_proportional,
+    _Degressive: _k_degressive,
+    _BaselStadt: _k_basel_stadt,
+    _BaselLand: _k_basel_land,
+    _Zug: _k_zug,
+}
+
+
+# ---------------------------------------------------------------------------
+# Marginal rates
+# ---------------------------------------------------------------------------
+#
+# Vectorized ``_Model.slope``: d total_tax / d gain per row as ``float64``
+# (0 where no tax is due).  Church tax is not included – the columnar input
+# carries no confessions.
+
+def _ratio(num, den) -> np.ndarray:
+    return np.asarray(num, dtype=np.float64) / np.asarray(den, dtype=np.float64)
+
+
+def _s_progressive(m: _Progressive, r: _Rows) -> np.ndarray:
+    active = (r.gain > 0) & (r.gain >= m.min_gain)
+    if m.min_inclusive:
+        active &= r.gain != m.min_gain
+    active[active] = _progressive_simple(m, r.gain[active], r.months[active]) >= m.min_tax
+    slope = np.zeros(len(r.gain))
+    gain, months = r.gain[active], r.months[active]
+    factors = _ratio(_surcharge_factor(m.surcharges, months), RATE_SCALE) * _ratio(
+        _discount_factor(m.discounts, months // 12), RATE_SCALE,
+    )
+    slope[active] = _ratio(_bracket_rate(m.brackets, gain), RATE_SCALE) * factors
+    if m.allocation == "multiplier":
+        slope *= m.multiplier / RATE_SCALE
+    return slope
+
+
+def _s_schaffhausen(m: _Schaffhausen, r: _Rows) -> np.ndarray:
+    active = r.gain > 0
+    keys, inverse = _per_commune(r.commune[active], r.tax_year[active])
+    nat_pers = m.steuerfuesse.columns["natPers"]
+    multipliers = np.array([nat_pers[row] + nat_pers[kanton_row] for row, kanton_row in (
+        m.rows(name, year) for year, name in keys
+    )], dtype=np.int64)
+    months = r.months[active]
+    slope = np.zeros(len(r.gain))
+    slope[active] = (
+        _ratio(_bracket_rate(m.brackets, r.gain[active]), RATE_SCALE)
+        * _ratio(_surcharge_factor(m.surcharges, months), RATE_SCALE)
+        * _ratio(_discount_factor(m.discounts, months // 12), RATE_SCALE)
+        * _ratio(multipliers[inverse], 100 * RATE_SCALE)
+    )
+    return slope
+
+
+def _s_bern(m: _Bern, r: _Rows) -> np.ndarray:
+    active = (r.gain > 0) & (r.gain >= m.min_gain)
+    gain, months = r.gain[active], r.months[active]
+    factor = _discount_factor(m.discounts, months // 12)
+    slope = np.zeros(len(r.gain))
+    slope[active] = (
+        _ratio(_bracket_rate(m.scaled_brackets, _mul(gain, factor)), RATE_SCALE)
+        * _ratio(factor, RATE_SCALE)
+        * _ratio(_surcharge_factor(m.surcharges, months), RATE_SCALE)
+    )
+    return slope
+
+
+def _s_st_gallen(m: _StGallen, r: _Rows) -> np.ndarray:
+    active = (r.gain > 0) & (r.gain > m.min_gain)
+    gain = r.gain[active]
+    rate = np.where(gain >= m.flat_threshold, m.flat_rate, _bracket_rate(m.brackets, gain))
+    surcharge, factor = _st_gallen_factors(m, gain, r.months[active])
+    slope = np.zeros(len(r.gain))
+    slope[active] = _ratio(rate + surcharge, RATE_SCALE) * _ratio(factor, RATE_SCALE)
+    return slope
+
+
+def _s_proportional(m: _Proportional, r: _Rows) -> np.ndarray:
+    # The gain_rounding staircase is smoothed to its average slope, as in ``_Proportional.slope``
+    active = (r.gain > 0) & (r.gain >= m.min_gain)
+    months = r.months[active]
+    factor = m.steuerfuss if m.steuerfuss is not None else _discount_factor(m.discounts, months // 12)
+    slope = np.zeros(len(r.gain))
+    slope[active] = (
+        m.base_rate / RATE_SCALE
+        * _ratio(_surcharge_factor(m.surcharges, months), RATE_SCALE)
+        * _ratio(factor, RATE_SCALE)
+    )
+    return slope
+
+
+def _s_degressive(m: _Degressive, r: _Rows) -> np.ndarray:
+    active = (r.gain > 0) & (r.gain >= m.min_gain)
+    if m.canton == "UR":
+        active &= r.gain >= m.freibetrag + m.gain_rounding
+    table = holding_rates(m.canton)
+    slope = np.zeros(len(r.gain))
+    slope[active] = _ratio(table[np.clip(r.years[active], 0, len(table) - 1)], RATE_SCALE)
+    return slope * (1 + m.commune_surcharge / RATE_SCALE)
+
+
+def _s_basel_stadt(m: _BaselStadt, r: _Rows) -> np.ndarray:
+    active = (r.gain > 0) & (r.gain >= m.min_gain)
+    rates, factor = _basel_stadt_factors(m, r.years[active])
+    slope = np.zeros(len(r.gain))
+    slope[active] = _ratio(rates, RATE_SCALE) * _ratio(factor, RATE_SCALE)
+    return slope
+
+
+def _s_basel_land(m: _BaselLand, r: _Rows) -> np.ndarray:
+    active = r.gain > 0
+    gain, months = r.gain[active], r.months[active]
+    # d(gain × rate(gain)) / d gain, with the tier of the next Rappen
+    above = gain + 1
+    rate = np.zeros(len(gain), dtype=np.int64)
+    capped = above > m.max_rate_above
+    pending = np.ones(len(gain), dtype=bool)
+    prev = 0
+    for limit, base, increment in m.tiers:
+        hit = pending & (above <= limit)
+        capped[hit] |= base * 10_000 + increment * (above[hit] - prev) >= m.max_rate * 10_000
+        rate[hit] = base * 10_000 + increment * (2 * gain[hit] - prev)
+        pending &= ~hit
+        prev = limit
+    rate = np.where(capped, m.max_rate * 10_000, rate)
+    factor = RATE_SCALE + m.surcharge_per_month * np.maximum(m.surcharge_threshold - months, 0)
+    slope = np.zeros(len(r.gain))
+    slope[active] = _ratio(rate, RATE_SCALE * 10_000) * _ratio(factor, RATE_SCALE)
+    return slope
+
+
+def _s_zug(m: _Zug, r: _Rows) -> np.ndarray:
+    active = (r.gain > 0) & (r.gain >= m.min_gain)
+    r_num, r_den, proportional = _zug_rate(m, r.gain[active], r.cost[active], r.months[active])
+    slope = np.zeros(len(r.gain))
+    # tax = gain × rate, and the unclamped rate is itself proportional to the gain
+    slope[active] = _ratio(np.where(proportional, 2 * r_num, r_num), r_den * 100)
+    return slope
+
+
+_SLOPES: dict[type, Callable] = {
+    _Progressive: _s_progressive,
+    _Schaffhausen: _s_schaffhausen,
+    _Bern: _s_bern,
+    _StGallen: _s_st_gallen,
+    _Proportional: _s_proportional,
+    _Degressive: _s_degressive,
+    _BaselStadt: _s_basel_stadt,
+    _BaselLand: _s_basel_land,
+    _Zug: _s_zug,
+}
+
+
+@cache
+def _model(canton: str):
+    return FixedPointEngine(canton)._model
+
+
+@cache
+def holding_rates(canton: str) -> np.ndarray:
+    """Holding-period rate of a degressive canton (AG, NW, GE, TI, VD, FR, UR) by completed years.
+
+    ``int64`` scaled by ``RATE_SCALE`` and read only; index with
+    ``np.clip(years, 0, len(table) - 1)`` – the last entry applies to every
+    longer holding.
+    """
+    model = _model(canton.upper())
+    if not isinstance(model, _Degressive):
+        raise ValueError(f"Canton {canton.upper()} has no holding-period rate table")
+    table = np.array(model.table, dtype=np.int64)
+    table.flags.writeable = False
+    return table
+
+
+@cache
+def holding_breaks(canton: str) -> np.ndarray:
+    """Holding periods (months, ``int64``, read only) at which a holding-dependent parameter of *canton* changes."""
+    breaks = np.array(_model(canton.upper()).holding_breaks(), dtype=np.int64)
+    breaks.flags.writeable = False
+    return breaks
+
+
+# ---------------------------------------------------------------------------
+# Steuerfuss matrices
+# ---------------------------------------------------------------------------
+
+CONFESSIONS = ("evangR", "roemK", "christK")
+
+
+def compute_shares(simple_tax, multiplier) -> np.ndarray:
+    """Vectorized :func:`~grundstueckgewinnsteuer.engine.tariff.compute_share` on integers.
+
+    ``roundUpTo005(simple_tax × multiplier / 100)`` with *simple_tax* in
+    Rappen and *multiplier* (percent) scaled by ``RATE_SCALE``; the result
+    is in Rappen.  The arguments broadcast against each other.
+    """
+    return 5 * _ceil_div(_mul(_mul(simple_tax, multiplier), 20), 100 * 100 * RATE_SCALE)
+
+
+@dataclass(frozen=True)
+class MultiplierMatrix:
+    """Steuerfuss multipliers of one canton as ``(commune × year)`` arrays.
+
+    All multipliers are percent scaled by ``RATE_SCALE`` (``int64``, read
+    only); divide by ``RATE_SCALE`` for percent.  Cells of communes without
+    a row in a year are 0 and ``False`` in :attr:`present`.
+    """
+
+    communes: list[str]
+    years: list[int]
+    canton: np.ndarray
+    """``natPers`` of the canton itself, shape ``(years,)``."""
+    commune: np.ndarray
+    """Commune ``natPers``, shape ``(communes, years)``."""
+    church: dict[str, np.ndarray]
+    """Church rate per confession (:data:`CONFESSIONS`), shape ``(communes, years)``."""
+    present: np.ndarray
+
+    def cell(self, commune: str, tax_year: int) -> tuple[int, int]:
+        """``(row, column)`` of a commune and year; ``KeyError`` if either is unknown."""
+        try:
+            return self.communes.index(commune), self.years.index(tax_year)
+        except ValueError:
+            raise KeyError(f"No Steuerfuss data for commune '{commune}' / year {tax_year}") from None
+
+
+@cache
+def multiplier_matrix(canton: str = "SH") -> MultiplierMatrix:
+    """The ``(commune × year)`` Steuerfuss matrix of *canton*, built once from its compiled model."""
+    canton = canton.upper()
+    table = getattr(_model(canton), "steuerfuesse", None)
+    if table is None:
+        raise ValueError(f"Canton {canton} has no Steuerfuss data")
+    years = sorted({year for year, _ in table.keys})
+    communes = list(dict.fromkeys(name for _, name in table.keys if name != "Kanton"))
+    commune_pos = {name: i for i, name in enumerate(communes)}
+    year_pos = {year: j for j, year in enumerate(years)}
+    rows = np.full((len(communes), len(years)), -1, dtype=np.intp)
+    canton_rows = np.full(len(years), -1, dtype=np.intp)
+    for row, (year, name) in enumerate(table.keys):
+        if name == "Kanton":
+            canton_rows[year_pos[year]] = row
+        else:
+            rows[commune_pos[name], year_pos[year]] = row
+    missing = [year for year, row in zip(years, canton_rows.tolist(), strict=True) if row < 0]
+    if missing:
+        raise ValueError(f"No canton Steuerfuss for year(s) {missing} in {canton}")
+    present = rows >= 0
+
+    def gather(column: str, index: np.ndarray) -> np.ndarray:
+        values = np.asarray(table.columns[column], dtype=np.int64) if column in table.columns else None
+        out = np.zeros(index.shape, dtype=np.int64) if values is None else np.where(index >= 0, values[index], 0)
+        out.flags.writeable = False
+        return out
+
+    present.flags.writeable = False
+    return MultiplierMatrix(
+        communes=communes,
+        years=years,
+        canton=gather("natPers", canton_rows),
+        commune=gather("natPers", rows),
+        church={key: gather(key, rows) for key in CONFESSIONS},
+        present=present,
+    )
+
+
+class ShareGrid(NamedTuple):
+    """Tax per ``(…, commune, year)`` cell in ``int64`` Rappen; 0 where the matrix has no data."""
+
+    canton_share: np.ndarray
+    commune_share: np.ndarray
+    church_tax_total: np.ndarray
+    total_tax: np.ndarray
+
+
+def share_grid(simple_tax, matrix: MultiplierMatrix, confessions: dict[str, int] | None = None) -> ShareGrid:
+    """Canton, commune and church tax of every commune and year for one or more simple taxes.
+
+    Parameters
+    ----------
+    simple_tax:
+        Simple tax in Rappen, a scalar or an array of shape ``S``; the
+        result has shape ``S + (communes, years)``.
+    matrix:
+        From :func:`multiplier_matrix`.
+    confessions:
+        Confession → number of people, as ``TaxInputs.confessions``.  The
+        church tax is rounded half-even to the Rappen (the scalar engines
+        keep it unrounded); unknown confessions pay no church tax.
+    """
+    simple = np.asarray(simple_tax)[..., None, None]
+    canton = compute_shares(simple, matrix.canton)
+    commune = compute_shares(simple, matrix.commune)
+    church = np.zeros((), dtype=np.int64)
+    people = sum((confessions or {}).values())
+    if people:
+        weighted = sum(
+            (_mul(matrix.church[key], count) for key, count in confessions.items() if key in matrix.church),
+            np.zeros(matrix.commune.shape, dtype=np.int64),
+        )
+        church = _round_half_even(_mul(simple, weighted), RATE_SCALE * 100 * people)
+    shape = np.broadcast_shapes(simple.shape, matrix.commune.shape)
+
+    def masked(values) -> np.ndarray:
+        return np.where(matrix.present, np.broadcast_to(values, shape), 0)
+
+    canton, commune, church = masked(canton), masked(commune), masked(church)
+    return ShareGrid(canton, commune, church, _add(_add(canton, commune), church))
+
+
+def tax_grid(taxable_gain, months, canton: str = "SH", confessions: dict[str, int] | None = None) -> ShareGrid:
+    """Full ``(commune × year)`` tax grid for taxable gains (CHF) and holding months in one call.
+
+    *taxable_gain* and *months* are scalars or equal-length arrays; the
+    simple tax is computed with the canton's compiled tariff and then
+    passed to :func:`share_grid`.
+    """
+    model = _model(canton.upper())
+    matrix = multiplier_matrix(canton)
+    gain = money_to_rappen(np.atleast_1d(taxable_gain))
+    months_arr = np.broadcast_to(np.asarray(months, dtype=np.int64), gain.shape)
+    simple = np.where(gain > 0, _progressive_simple(model, gain, months_arr), 0)
+    grid = share_grid(simple, matrix, confessions)
+    if np.ndim(taxable_gain) == 0:
+        return ShareGrid(*(values[0] for values in grid))
+    return grid
+
+
+# ---------------------------------------------------------------------------
+# Columnar input
+# ---------------------------------------------------------------------------
+
+def _column(table, name: str):
+    """Raw column *name* of a pandas DataFrame, pyarrow Table or mapping (``None`` if absent)."""
+    if hasattr(table, "column_names"):
+        return table.column(name) if name in table.column_names else None
+    return table.get(name)
+
+
+def _to_numpy(values) -> np.ndarray:
+    if hasattr(values, "to_numpy"):
+        return values.to_numpy()
+    return np.asarray(values)
+
+
+def money_to_rappen(values) -> np.ndarray:
+    """Convert a CHF column to ``int64`` Rappen exactly.
+
+    Integer, float (must be whole Rappen), ``Decimal``/string object and
+    Arrow decimal columns are accepted; sub-Rappen amounts raise
+    ``ValueError``.
+    """
+    if hasattr(values, "type") and str(values.type).startswith("decimal"):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        return pc.multiply(values, _RAPPEN).cast(pa.int64()).to_numpy()
+    arr = _to_numpy(values)
+    if arr.dtype.kind in "iub":
+        return arr.astype(np.int64) * _RAPPEN
+    if arr.dtype.kind == "f":
+        scaled = np.rint(arr * _RAPPEN)
+        if not np.all(np.abs(scaled - arr * _RAPPEN) < 1e-6):
+            raise ValueError("Float money column is not a whole number of Rappen")
+        return scaled.astype(np.int64)
+    return np.fromiter((to_rappen(Decimal(str(v))) for v in arr.tolist()), dtype=np.int64, count=len(arr))
+
+
+# ---------------------------------------------------------------------------
+# Columnar result
+# ---------------------------------------------------------------------------
+
+def rappen_to_decimal128(rappen: np.ndarray, precision: int = 18):
+    """``int64`` Rappen → ``pyarrow`` ``decimal128(precision, 2)`` array without per-row objects."""
+    import pyarrow as pa
+
+    rappen = np.ascontiguousarray(rappen, dtype=np.int64)
+    words = np.empty((len(rappen), 2), dtype=np.int64)
+    words[:, 0] = rappen
+    words[:, 1] = rappen >> 63
+    return pa.Array.from_buffers(pa.decimal128(precision, 2), len(rappen), [None, pa.py_buffer(words)])
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Columnar results of :func:`compute_table`, one entry per input row.
+
+    ``columns`` maps each of :data:`RESULT_COLUMNS` to a numpy array; money
+    columns hold ``int64`` Rappen.  Church tax is zero – the columnar input
+    carries no confessions.
+    """
+
+    columns: dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.columns["total_tax"])
+
+    def to_arrow(self):
+        """``pyarrow.Table`` in :data:`~grundstueckgewinnsteuer.engine.writer.RESULT_SCHEMA`.
+
+        Money columns are ``decimal128(18, 2)`` CHF, canton and commune are
+        dictionary encoded.
+        """
+        import pyarrow as pa
+
+        from grundstueckgewinnsteuer.engine.writer import to_record_batch
+
+        return pa.Table.from_batches([to_record_batch(self.columns)])
+
+    def to_pandas(self):
+        """``pandas.DataFrame`` backed by Arrow dtypes (exact decimal money, no per-row objects)."""
+        import pandas as pd
+
+        return self.to_arrow().to_pandas(types_mapper=pd.ArrowDtype)
+
+    def to_records(self) -> list[dict]:
+        """One dict per row with ``Decimal`` CHF amounts (creates per-row Python objects)."""
+        names = list(self.columns)
+        records = []
+        for row in zip(*(self.columns[name].tolist() for name in names), strict=True):
+            record = dict(zip(names, row, strict=True))
+            for name in MONEY_COLUMNS:
+                record[name] = rappen_to_decimal(record[name])
+            records.append(record)
+        return records
+
+
+class _Inputs(NamedTuple):
+    canton: np.ndarray
+    commune: np.ndarray
+    tax_year: np.ndarray
+    periods: HoldingPeriods
+    gain: np.ndarray
+    cost: np.ndarray
+
+
+def _inputs(table) -> _Inputs:
+    required = ("canton", "commune", "tax_year", "purchase_date", "sale_date", "purchase_price", "sale_price")
+    raw = {name: _column(table, name) for name in (*required, *_OPTIONAL_MONEY)}
+    missing = [name for name in required if raw[name] is None]
+    if missing:
+        raise KeyError(f"Missing input columns: {missing}")
+
+    canton = _to_numpy(raw["canton"]).astype(str)
+    purchase = money_to_rappen(raw["purchase_price"])
+    extra = {
+        name: money_to_rappen(raw[name]) if raw[name] is not None else np.zeros(len(canton), dtype=np.int64)
+        for name in _OPTIONAL_MONEY
+    }
+    gain = (
+        money_to_rappen(raw["sale_price"]) - purchase
+        - extra["acquisition_costs"] - extra["selling_costs"] - extra["investments_total"]
+    )
+    return _Inputs(
+        canton=canton,
+        commune=_to_numpy(raw["commune"]).astype(object),
+        tax_year=_to_numpy(raw["tax_year"]).astype(np.int64),
+        periods=holding_periods(_to_numpy(raw["purchase_date"]), _to_numpy(raw["sale_date"])),
+        gain=gain,
+        cost=purchase + extra["acquisition_costs"] + extra["investments_total"],
+    )
+
+
+def _partitions(t: _Inputs):
+    """``(model, row indices, _Rows)`` per canton present in *t*."""
+    codes, partition = np.unique(t.canton, return_inverse=True)
+    for k, code in enumerate(codes.tolist()):
+        idx = np.flatnonzero(partition == k)
+        yield code.upper(), idx, _Rows(t.gain[idx], t.periods.months[idx], t.cost[idx], t.commune[idx], t.tax_year[idx])
+
+
+def compute_table(table) -> BatchResult:
+    """Compute every row of a columnar table of transactions.
+
+    Parameters
+    ----------
+    table:
+        pandas ``DataFrame``, ``pyarrow.Table`` or mapping of column name →
+        array with the columns ``canton``, ``commune``, ``tax_year``,
+        ``purchase_date``, ``sale_date``, ``purchase_price``, ``sale_price``
+        and optionally ``acquisition_costs``, ``selling_costs`` and
+        ``investments_total`` (default 0).
+
+    Returns
+    -------
+    BatchResult
+        Rows in input order.  Each canton partition is evaluated by one
+        vectorized kernel; amounts equal the canton engines' ``compute``.
+    """
+    t = _inputs(table)
+    out = {name: np.zeros(len(t.canton), dtype=np.int64) for name in MONEY_COLUMNS}
+    for code, idx, rows in _partitions(t):
+        model = _model(code)
+        _KERNELS[type(model)](model, rows)
+        out["taxable_gain"][idx] = rows.taxable_gain
+        out["simple_tax"][idx] = rows.simple_tax
+        out["canton_share"][idx] = rows.canton_share
+        out["commune_share"][idx] = rows.commune_share
+    out["total_tax"] = out["canton_share"] + out["commune_share"]
+
+    return BatchResult({
+        "canton": t.canton,
+        "commune": t.commune,
+        "tax_year": t.tax_year,
+        **out,
+        "holding_months": t.periods.months,
+        "holding_years": t.periods.years,
+    })
+
+
+class MarginalColumns(NamedTuple):
+    """Columns of :func:`marginal_table`, one entry per input row."""
+
+    marginal_rate_percent: np.ndarray
+    """``float64`` d total_tax / d gain in percent (0 where no tax is due)."""
+    holding_months: np.ndarray
+    next_holding_months: np.ndarray
+    """``int64`` next holding period at which a holding-dependent parameter changes, -1 if none."""
+    holding_delta: np.ndarray
+    """``int64`` Rappen change of ``total_tax`` when sold at ``next_holding_months`` instead (0 if none)."""
+
+
+def marginal_table(table) -> MarginalColumns:
+    """Vectorized :meth:`~grundstueckgewinnsteuer.engine.pipeline.PipelineEngine.marginal`.
+
+    Takes the same columns as :func:`compute_table`.  The marginal rates
+    come from per-model slope kernels (the same formulas as
+    ``_Model.slope``, in ``float64``); the holding delta re-runs the
+    canton kernel with every row moved to its next holding break.
+    """
+    t = _inputs(table)
+    n = len(t.canton)
+    rate = np.zeros(n)
+    next_months = np.full(n, -1, dtype=np.int64)
+    delta = np.zeros(n, dtype=np.int64)
+    for code, idx, rows in _partitions(t):
+        model = _model(code)
+        rate[idx] = 100 * _SLOPES[type(model)](model, rows)
+        breaks = holding_breaks(code)
+        i = np.searchsorted(breaks, rows.months, side="right")
+        later = i < len(breaks)
+        if not later.any():
+            continue
+        months = np.where(later, breaks[np.minimum(i, len(breaks) - 1)], rows.months)
+        moved = _Rows(rows.gain, months, rows.cost, rows.commune, rows.tax_year)
+        _KERNELS[type(model)](model, rows)
+        _KERNELS[type(model)](model, moved)
+        before = rows.canton_share + rows.commune_share
+        after = moved.canton_share + moved.commune_share
+        next_months[idx] = np.where(later, moved.months, -1)
+        delta[idx] = np.where(later, after - before, 0)
+    return MarginalColumns(rate, t.periods.months, next_months, delta)
+
@@ -0,0 +1,247 @@
+"""Adaptive tax-vs-gain curves for charts.
+
+:func:`tax_curve` samples the total tax of one canton, holding period and
+commune over a range of gains with as few points as possible: every point
+is an exact kernel result, and :meth:`TaxCurve.at` reproduces the tax at
+every Rappen to within ``tolerance``.  Kinks (bracket limits, rate tiers)
+are located to the Rappen – or to the canton's gain rounding step – with
+the models' exact marginal rates (``_Model.slope``), and a discontinuity
+(minimum gain, minimum tax, a flat-rate threshold, the first stair above a
+Freibetrag) gets a point one Rappen below it, so no chord ramps across the
+jump.  Where the tax is piecewise linear, ``tolerance`` only absorbs result
+rounding; BL's and ZG's curved segments are refined until the chord error
+is within it.
+
+Cantons that round the gain down (AR, UR) tax a staircase: the points are
+its corners on the rounding grid (``TaxCurve.step``) and :meth:`TaxCurve.at`
+evaluates it as such, while a polyline drawn through the points smooths
+each stair – by up to one stair's tax (e.g. CHF 150 per CHF 500 step in
+AR).  A typical curve has a few dozen points.
+
+Curves depend on the holding period only through the holding-dependent
+tariff parameters, so they are cached per *holding bucket* – the number of
+``holding_breaks`` at or below the holding period – rather than per month,
+and keyed only by the inputs the canton's model reads (commune, year and
+confessions in SH, cost in ZG, owner occupation in BS).
+Like :mod:`~grundstueckgewinnsteuer.engine.kernel`, this module needs
+neither ``pydantic`` nor ``yaml``.
+
+Usage::
+
+    curve = tax_curve("ZH", 84, commune="Zürich", tax_year=2025)
+    curve.gains, curve.taxes        # Rappen; plot as a polyline
+    curve.at(150_000_00)            # interpolated total tax in Rappen
+    curve.to_decimals()             # [(gain CHF, tax CHF), ...] for JSON
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import namedtuple
+from decimal import Decimal
+from functools import cache, lru_cache
+
+from grundstueckgewinnsteuer.engine.kernel import (
+    _BaselLand,
+    _BaselStadt,
+    _Schaffhausen,
+    _Zug,
+    model,
+    rappen_to_decimal,
+    round_half_even,
+)
+
+MAX_GAIN = 2_000_000_00
+"""Default upper end of the gain range, in Rappen."""
+
+TOLERANCE = 100
+"""Default maximum deviation of the polyline from the tax between points, in Rappen."""
+
+CURVE_CACHE_SIZE = 1024
+
+# Models whose tax is curved (not piecewise linear) in the gain within a segment
+_SMOOTH = (_BaselLand, _Zug)
+
+
+class TaxCurve(namedtuple("TaxCurve", "gains taxes step", defaults=(1,))):
+    """Sample points of a tax curve: increasing ``gains`` and their ``taxes``, both in Rappen.
+
+    ``step`` is the canton's gain rounding step (1: none); the tax is
+    constant between its multiples.
+    """
+
+    __slots__ = ()
+
+    def at(self, gain: int) -> int:
+        """Total tax at *gain* interpolated linearly (clamped to the sampled range), in Rappen."""
+        gain -= gain % self.step
+        i = bisect_right(self.gains, gain)
+        if i == 0:
+            return self.taxes[0]
+        if i == len(self.gains):
+            return self.taxes[-1]
+        a, b = self.gains[i - 1], self.gains[i]
+        fa, fb = self.taxes[i - 1], self.taxes[i]
+        return fa + round_half_even((fb - fa) * (gain - a), b - a)
+
+    def to_decimals(self) -> list[tuple[Decimal, Decimal]]:
+        """``(gain, total tax)`` pairs in CHF."""
+        return [(rappen_to_decimal(g), rappen_to_decimal(t)) for g, t in zip(self.gains, self.taxes, strict=True)]
+
+
+def holding_bucket(canton: str, holding_months: int) -> int:
+    """Index of the holding-period segment of *holding_months*; equal buckets give equal curves."""
+    return bisect_right(_breaks(canton.upper()), holding_months)
+
+
+def tax_curve(
+    canton: str,
+    holding_months: int,
+    *,
+    commune: str = "",
+    tax_year: int = 0,
+    confessions: dict[str, int] | None = None,
+    cost: int = 0,
+    self_used: bool = False,
+    max_gain: int = MAX_GAIN,
+    tolerance: int = TOLERANCE,
+) -> TaxCurve:
+    """Adaptively sampled total tax over gains ``0 … max_gain`` (Rappen).
+
+    Parameters
+    ----------
+    canton:
+        Canton code.
+    holding_months:
+        Holding period; every period in the same :func:`holding_bucket`
+        yields the same (cached) curve.
+    commune, tax_year, confessions:
+        As in ``TaxInputs``; only used by SH.
+    cost:
+        Purchase price plus acquisition costs and investments in Rappen;
+        only used by ZG, whose rate depends on the yield.
+    self_used:
+        BS owner-occupier rates.
+    max_gain:
+        Upper end of the gain range, in Rappen.
+    tolerance:
+        Maximum deviation of the polyline from the tax between points, in
+        Rappen.
+    """
+    code = canton.upper()
+    m = model(code)
+    months = holding_months
+    # Key the cache only by what the model reads, so e.g. every ZH property shares a curve
+    if not isinstance(m, _Zug):  # ZG's yield divides by the holding period and the cost itself
+        bucket = holding_bucket(code, holding_months)
+        months = _breaks(code)[bucket - 1] if bucket else 0
+        cost = 0
+    if not isinstance(m, _Schaffhausen):
+        commune, tax_year, confessions = "", 0, None
+    if not isinstance(m, _BaselStadt):
+        self_used = False
+    return _curve(
+        code, months, commune, tax_year, tuple(sorted((confessions or {}).items())),
+        cost, self_used, max_gain, tolerance,
+    )
+
+
+@cache
+def _breaks(code: str) -> tuple[int, ...]:
+    return model(code).holding_breaks()
+
+
+@lru_cache(maxsize=CURVE_CACHE_SIZE)
+def _curve(
+    code: str,
+    months: int,
+    commune: str,
+    tax_year: int,
+    confessions: tuple[tuple[str, int], ...],
+    cost: int,
+    self_used: bool,
+    max_gain: int,
+    tolerance: int,
+) -> TaxCurve:
+    m = model(code)
+    extra = (self_used,) if isinstance(m, _BaselStadt) else ()
+    arguments = (months, cost, commune, tax_year, dict(confessions), *extra)
+
+    def tax(gain: int) -> int:
+        total = m.run(gain, *arguments).total_tax
+        return round_half_even(total.numerator, total.denominator)
+
+    def slope(gain: int) -> tuple[int, int]:
+        return m.slope(gain, *arguments)
+
+    step = getattr(m, "gain_rounding", 1)
+    points = _sample(tax, slope, 0, max(max_gain // step * step, step), step, tolerance, isinstance(m, _SMOOTH))
+    gains = sorted(points)
+    return TaxCurve(tuple(gains), tuple(points[g] for g in gains), step)
+
+
+# ---------------------------------------------------------------------------
+# Sampling
+# ---------------------------------------------------------------------------
+
+def _sample(tax, slope, lo: int, hi: int, step: int, tolerance: int, smooth: bool) -> dict[int, int]:
+    """Exact ``gain → tax`` points on multiples of *step* whose polyline is within *tolerance*."""
+    points = {lo: tax(lo), hi: tax(hi)}
+
+    def value(x: int) -> int:
+        if x not in points:
+            points[x] = tax(x)
+        return points[x]
+
+    def same(r: tuple[int, int], s: tuple[int, int]) -> bool:
+        return r[0] * s[1] == s[0] * r[1]
+
+    def off(a: int, b: int, x: int) -> bool:
+        """Whether the chord from *a* to *b* misses the tax at *x* by more than *tolerance*."""
+        fa, fb = points[a], points[b]
+        return abs((tax(x) - fa) * (b - a) - (fb - fa) * (x - a)) > tolerance * (b - a)
+
+    def middle(a: int, b: int) -> int:
+        return a + (b - a) // (2 * step) * step
+
+    stack = [(lo, hi)]
+    while stack:
+        a, b = stack.pop()
+        if b - a <= step:
+            continue
+        if smooth:
+            # Within tolerance at the quartiles, and a rate change small enough to bound the chord error
+            (ra, da), (rb, db) = slope(a), slope(b - step)
+            probes = {a + (b - a) * k // (4 * step) * step for k in (1, 2, 3)} - {a, b}
+            if abs(ra * db - rb * da) * (b - a) <= 4 * tolerance * da * db and not any(off(a, b, x) for x in probes):
+                continue
+            c = middle(a, b)
+            value(c)
+            stack += [(a, c), (c, b)]
+            continue
+
+        rate = slope(a)
+        if same(rate, slope(b - step)):
+            if not off(a, b, middle(a, b)):
+                continue
+            c = middle(a, b)  # the rate changes and changes back in between
+            value(c)
+            stack += [(a, c), (c, b)]
+            continue
+
+        # First grid point after a where the marginal rate differs: the kink, to the step
+        inside, changed = a, b - step
+        while changed - inside > step:
+            c = middle(inside, changed)
+            if same(slope(c), rate):
+                inside = c
+            else:
+                changed = c
+        value(changed)
+        if changed - 1 > a and off(a, changed, changed - 1):
+            value(changed - 1)  # a jump at the kink: sample both sides, a Rappen apart
+            stack.append((a, changed - 1))
+        else:
+            stack.append((a, changed))
+        stack.append((changed, b))
+    return points
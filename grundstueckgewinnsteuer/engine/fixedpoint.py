@@ -0,0 +1,148 @@
+"""Integer fixed-point backend – an alternative to the ``Decimal`` engines.
+
+Money is held as integer **Rappen** and every tariff rate, multiplier and
+percentage as an integer scaled by ``RATE_SCALE``.  Products of the two are
+kept exact by tracking the denominator as a power of ten; the JS-parity
+roundings (``to_fixed_2``, ``round_up_to_005``) are done with integer
+division.  Where the Decimal path divides by a non-power of ten (church tax
+per person, the ZG yield rate) the backend keeps the exact quotient.
+
+The models themselves live in the stdlib-only
+:mod:`~grundstueckgewinnsteuer.engine.kernel`; this module compiles them
+from ``tariff.yaml`` into the packaged ``data/kernel.bin``, which
+:class:`FixedPointEngine` (and every worker process using it) loads
+without parsing YAML, and accepts ``TaxInputs``.
+
+Results are numerically identical to the Decimal engines in
+``grundstueckgewinnsteuer.cantons`` – ``tests/test_fixedpoint.py`` checks
+this differentially over a generated corpus for every canton.
+
+Usage::
+
+    engine = FixedPointEngine("SH")
+    result = engine.compute(inputs)          # FixedResult, amounts in Rappen
+    result.to_decimals()["total_tax"]        # Decimal, equal to engine.compute()
+    engine.marginal(inputs).rate             # exact (num, den) d total_tax / d gain
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from grundstueckgewinnsteuer.engine.kernel import (  # noqa: F401 – re-exported
+    _RAPPEN,
+    KERNEL_FILE,
+    RATE_SCALE,
+    FixedResult,
+    Marginal,
+    MultiplierTable,
+    _BaselLand,
+    _BaselStadt,
+    _Bern,
+    _Brackets,
+    _Degressive,
+    _Model,
+    _Progressive,
+    _Proportional,
+    _Schaffhausen,
+    _StGallen,
+    _Zug,
+    dump_models,
+    marginal,
+    model,
+    rappen_to_decimal,
+    round_half_even,
+    run,
+    scale_rate,
+    to_rappen,
+    transaction,
+)
+from grundstueckgewinnsteuer.engine.pipeline import compiled_tariff
+
+if TYPE_CHECKING:
+    from grundstueckgewinnsteuer.models import TaxInputs
+
+
+_MODELS = {
+    "SH": _Schaffhausen,
+    "ZH": lambda t: _Progressive(t, allocation="commune"),
+    "BE": _Bern,
+    "LU": lambda t: _Progressive(t, allocation="multiplier"),
+    "AG": lambda t: _Degressive(t, canton="AG"),
+    "SG": _StGallen,
+    "ZG": _Zug,
+    "BS": _BaselStadt,
+    "BL": _BaselLand,
+    "GR": _Progressive,
+    "SO": lambda t: _Progressive(t, min_inclusive=True),
+    "TG": _Proportional,
+    "SZ": _Progressive,
+    "GL": _Progressive,
+    "AI": _Progressive,
+    "AR": _Proportional,
+    "NW": lambda t: _Degressive(t, canton="NW"),
+    "OW": _Proportional,
+    "UR": lambda t: _Degressive(t, canton="UR"),
+    "VS": _Progressive,
+    "FR": lambda t: _Degressive(t, canton="FR"),
+    "GE": lambda t: _Degressive(t, canton="GE"),
+    "JU": _Progressive,
+    "NE": _Progressive,
+    "TI": lambda t: _Degressive(t, canton="TI"),
+    "VD": lambda t: _Degressive(t, canton="VD"),
+}
+
+
+def available_cantons() -> list[str]:
+    return sorted(_MODELS)
+
+
+def compile_model(canton_code: str) -> _Model:
+    """Compile the fixed-point model of one canton from its ``tariff.yaml``."""
+    return _MODELS[canton_code](compiled_tariff(canton_code).source)
+
+
+def write_kernel_data(path: str = KERNEL_FILE) -> str:
+    """Compile every canton's model and write them to *path* (default: the packaged ``data/kernel.bin``)."""
+    with open(path, "wb") as f:
+        f.write(dump_models({code: compile_model(code) for code in available_cantons()}))
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Public engine
+# ---------------------------------------------------------------------------
+
+class FixedPointEngine:
+    """Integer fixed-point counterpart of a canton's ``CantonEngine``."""
+
+    def __init__(self, canton_code: str) -> None:
+        code = canton_code.upper()
+        if code not in _MODELS:
+            raise KeyError(f"No fixed-point model for canton '{code}'. Available: {available_cantons()}")
+        self.canton_code = code
+        self._model = model(code)  # packaged data/kernel.bin: no YAML parsing per process
+        self._breaks: tuple[int, ...] | None = None
+
+    def compute_rappen(
+        self,
+        gain: int,
+        holding_months: int,
+        *,
+        cost: int = 0,
+        commune: str = "",
+        tax_year: int = 0,
+        confessions: dict[str, int] | None = None,
+    ) -> FixedResult:
+        """Compute from integer Rappen inputs (``cost`` is only used by ZG)."""
+        return self._model.run(gain, holding_months, cost, commune, tax_year, confessions or {})
+
+    def compute(self, inputs: TaxInputs) -> FixedResult:
+        """Compute from ``TaxInputs``; all amounts must be whole Rappen."""
+        return run(self._model, transaction(inputs))
+
+    def marginal(self, inputs: TaxInputs) -> Marginal:
+        """Exact marginal rate of *inputs* and the total tax at the next holding break."""
+        if self._breaks is None:
+            self._breaks = self._model.holding_breaks()
+        return marginal(self._model, transaction(inputs), self._breaks)
@@ -0,0 +1,961 @@
+"""Pure-stdlib compute kernel over compiled tariff data.
+
+The integer fixed-point models of every canton (see
+:mod:`grundstueckgewinnsteuer.engine.fixedpoint`) live here, together with
+a loader for their compiled state, ``data/kernel.bin``.  Importing this
+module pulls in neither ``pydantic`` nor ``yaml`` nor the canton engines –
+only ``abc``, ``decimal``, ``array``, ``bisect``, ``collections`` and ``marshal`` –
+so a cold process can compute a transaction in a few milliseconds.
+``tests/test_kernel.py`` enforces the import-time budget.
+
+Inputs and outputs are plain tuples: a :class:`Transaction` with amounts in
+integer Rappen in, a :class:`FixedResult` out.  ``TaxInputs`` is an
+optional façade on top – :func:`transaction` converts one without
+importing ``pydantic`` itself.
+
+``data/kernel.bin`` is a ``marshal`` dump of the models compiled from the
+canton ``tariff.yaml`` files – tariff constants only; SH reads its
+multipliers from the memory-mapped ``steuerfuesse.bin`` store of
+:mod:`~grundstueckgewinnsteuer.engine.steuerfuss`.  Rebuild it after
+editing a tariff::
+
+    python -m grundstueckgewinnsteuer.engine.kernel
+
+Usage::
+
+    from grundstueckgewinnsteuer.engine import kernel
+
+    result = kernel.compute("ZH", 150_000_00, 84, commune="Zürich", tax_year=2025)
+    result.to_decimals()["total_tax"]        # Decimal CHF, equal to TaxResult.total_tax
+"""
+
+from __future__ import annotations
+
+import marshal
+import os
+import sys
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from decimal import Decimal
+
+RATE_SCALE = 10**6
+"""Scale of every rate/multiplier integer: ``0.0144`` → ``14400``."""
+
+_RAPPEN = 100
+
+
+# ---------------------------------------------------------------------------
+# Scaled-integer helpers
+# ---------------------------------------------------------------------------
+
+def to_rappen(amount: Decimal) -> int:
+    """Convert a CHF amount to integer Rappen; sub-Rappen amounts are rejected."""
+    scaled = Decimal(amount) * _RAPPEN
+    if scaled != scaled.to_integral_value():
+        raise ValueError(f"Amount {amount} is not a whole number of Rappen")
+    return int(scaled)
+
+
+def rappen_to_decimal(rappen: int) -> Decimal:
+    """Integer Rappen → CHF ``Decimal`` with two places (like ``to_fixed_2`` output)."""
+    return Decimal(rappen).scaleb(-2)
+
+
+def scale_rate(value: object) -> int:
+    """Parse a YAML/JSON rate into an integer scaled by ``RATE_SCALE`` (must be exact)."""
+    scaled = Decimal(str(value)) * RATE_SCALE
+    if scaled != scaled.to_integral_value():
+        raise ValueError(f"Rate {value} has more precision than RATE_SCALE allows")
+    return int(scaled)
+
+
+def round_half_even(num: int, den: int) -> int:
+    """``num / den`` rounded to an integer with banker's rounding (``to_fixed_2`` on Rappen)."""
+    q, r = divmod(num, den)
+    twice = 2 * r
+    if twice > den or (twice == den and q & 1):
+        q += 1
+    return q
+
+
+def _ceil_div(num: int, den: int) -> int:
+    return -(-num // den)
+
+
+def months_between(d1, d2) -> int:
+    """Calculate total months between two dates (same as JS month difference)."""
+    return (d2.year - d1.year) * 12 + (d2.month - d1.month)
+
+# ---------------------------------------------------------------------------
+# Result container
+# ---------------------------------------------------------------------------
+
+
+class FixedResult(namedtuple(
+    "FixedResult", "taxable_gain simple_tax canton_share commune_share holding_months church_terms", defaults=((),),
+)):
+    """Core amounts of a computation, in integer Rappen.
+
+    ``church_terms`` keeps the ``(confession, simple_tax × rate, people)``
+    terms of the per-person church tax split; ``church_tax_total`` and
+    ``total_tax`` are exact ``Fraction`` Rappen derived from them, and
+    :meth:`to_decimals` reproduces the Decimal path's values exactly.
+    """
+
+    __slots__ = ()
+
+    @property
+    def holding_years(self) -> int:
+        return self.holding_months // 12
+
+    @property
+    def church_tax_total(self):
+        """Church tax as an exact ``Fraction`` of Rappen."""
+        from fractions import Fraction  # deferred: costs more than the rest of the kernel's imports
+
+        people = sum(count for _, _, count in self.church_terms)
+        if not people:
+            return Fraction(0)
+        return Fraction(sum(p * count for _, p, count in self.church_terms), RATE_SCALE * _RAPPEN * people)
+
+    @property
+    def total_tax(self):
+        """Total tax as an exact ``Fraction`` of Rappen."""
+        return self.canton_share + self.commune_share + self.church_tax_total
+
+    def to_decimals(self) -> dict[str, Decimal]:
+        """Materialize the amounts as CHF ``Decimal`` values equal to ``TaxResult``'s."""
+        canton = rappen_to_decimal(self.canton_share)
+        commune = rappen_to_decimal(self.commune_share)
+        church = Decimal("0")
+        people = sum(count for _, _, count in self.church_terms)
+        for _, p_num, count in self.church_terms:
+            # Same operation order as compute_church_tax: (simple × rate / 100 / people) × count
+            church += Decimal(p_num).scaleb(-10) / Decimal(people) * Decimal(count)
+        return {
+            "taxable_gain": rappen_to_decimal(self.taxable_gain),
+            "simple_tax": rappen_to_decimal(self.simple_tax),
+            "canton_share": canton,
+            "commune_share": commune,
+            "church_tax_total": church,
+            "total_tax": canton + commune + church if self.church_terms else canton + commune,
+        }
+
+
+def _zero(gain: int, months: int) -> FixedResult:
+    return FixedResult(gain, 0, 0, 0, months)
+
+
+def _canton_only(gain: int, simple: int, months: int) -> FixedResult:
+    return FixedResult(gain, simple, simple, 0, months)
+
+
+# ---------------------------------------------------------------------------
+# Compiled tariff pieces
+# ---------------------------------------------------------------------------
+
+class _Brackets:
+    """Progressive bracket table with pre-accumulated tax at every limit.
+
+    ``tax(gain)`` takes the gain in Rappen × ``scale`` and returns the tax in
+    Rappen × ``scale`` × ``RATE_SCALE`` – one bisect instead of a loop.
+    """
+
+    __slots__ = ("limits", "rates", "cums", "top")
+
+    def __init__(self, brackets: list[dict], top_rate: object | None, scale: int = 1) -> None:
+        self.limits = [to_rappen(Decimal(str(b["limit"]))) * scale for b in brackets]
+        self.rates = [scale_rate(b["rate"]) for b in brackets]
+        self.top = scale_rate(top_rate) if top_rate is not None else None
+        self.cums = []
+        cum, prev = 0, 0
+        for limit, rate in zip(self.limits, self.rates, strict=True):
+            cum += (limit - prev) * rate
+            self.cums.append(cum)
+            prev = limit
+
+    def tax(self, gain: int) -> int:
+        i = bisect_left(self.limits, gain)
+        if i < len(self.limits):
+            if i == 0:
+                return gain * self.rates[0]
+            return self.cums[i - 1] + (gain - self.limits[i - 1]) * self.rates[i]
+        tax = self.cums[-1] if self.cums else 0
+        if self.top is not None:
+            tax += (gain - (self.limits[-1] if self.limits else 0)) * self.top
+        return tax
+
+    def rate(self, gain: int) -> int:
+        """Rate (× ``RATE_SCALE``) of the bracket the next Rappen above *gain* falls into."""
+        i = bisect_right(self.limits, gain)
+        return self.rates[i] if i < len(self.limits) else self.top or 0
+
+
+def _surcharge_table(entries: list[dict], threshold: int) -> list[int | None]:
+    """Dense month → rate table with ``apply_surcharge``'s first-match semantics."""
+    table: list[int | None] = []
+    for months in range(max(threshold, 0)):
+        rate = next((scale_rate(e["rate"]) for e in entries if months <= e["max_months"]), None)
+        table.append(rate)
+    return table
+
+
+def _discount_table(entries: list[dict], min_years: int) -> list[int | None]:
+    """Dense year → rate table with ``apply_discount``'s backwards-match semantics."""
+    top = max([e["years"] for e in entries] + [min_years, 0])
+    table: list[int | None] = []
+    for years in range(top + 1):
+        rate = None
+        if years >= min_years:
+            rate = next((scale_rate(e["rate"]) for e in reversed(entries) if years >= e["years"]), None)
+        table.append(rate)
+    return table
+
+
+def _changes(key, horizon: int) -> tuple[int, ...]:
+    """Holding periods ``1..horizon`` (months) at which ``key(months)`` differs from the month before."""
+    breaks, previous = [], key(0)
+    for months in range(1, horizon + 1):
+        current = key(months)
+        if current != previous:
+            breaks.append(months)
+        previous = current
+    return tuple(breaks)
+
+
+def _lookup(table: list[int | None], index: int) -> int | None:
+    if index < 0:
+        return None
+    return table[index] if index < len(table) else table[-1]
+
+
+class MultiplierTable:
+    """Steuerfuss rows keyed by ``(tax_year, commune)``, one integer column per multiplier.
+
+    Columns are ``array('q')`` values scaled by ``RATE_SCALE`` – or
+    zero-copy ``memoryview`` casts of the same layout of a memory-mapped
+    :class:`~grundstueckgewinnsteuer.engine.steuerfuss.SteuerfussStore`.
+    """
+
+    __slots__ = ("keys", "columns", "index")
+
+    def __init__(self, keys: list[tuple[int, str]], columns: dict[str, array]) -> None:
+        self.keys = keys
+        self.columns = columns
+        self.index = {key: row for row, key in enumerate(keys)}
+
+    @classmethod
+    def from_steuerfuesse(cls, raw: dict, columns: tuple[str, ...]) -> MultiplierTable:
+        """Build from a ``steuerfuesse.json`` mapping ``year → [{"Gemeinde": …, <column>: …}]``."""
+        rows = [(int(year), entry) for year, entries in raw.items() for entry in entries]
+        return cls(
+            [(year, entry["Gemeinde"]) for year, entry in rows],
+            {key: array("q", (scale_rate(entry.get(key, "0")) for _, entry in rows)) for key in columns},
+        )
+
+    @classmethod
+    def from_store(cls, store, columns: tuple[str, ...]) -> MultiplierTable:
+        """View the columns of a compiled Steuerfuss store without copying (missing columns are 0)."""
+        if store.scale != RATE_SCALE:
+            raise ValueError(f"Steuerfuss store scale {store.scale} differs from RATE_SCALE")
+        zeros = array("q", bytes(8 * len(store)))
+        return cls(store.keys, {key: store.column(key) if key in store.columns else zeros for key in columns})
+
+
+# ---------------------------------------------------------------------------
+# Per-model compute functions
+# ---------------------------------------------------------------------------
+
+class _Model(ABC):
+    """Base for compiled canton models; ``run`` receives whole-Rappen inputs.
+
+    ``slope`` takes the same arguments and returns the marginal rate
+    ``d total_tax / d gain`` of the formula in effect just above *gain*
+    (before rounding) as an exact ``(num, den)`` pair.  ``holding_key``
+    collects every holding-dependent parameter; it is constant from
+    ``holding_horizon()`` months on.
+    """
+
+    @abstractmethod
+    def run(
+        self, gain: int, months: int, cost: int, commune: str, tax_year: int, confessions: dict[str, int],
+    ) -> FixedResult:
+        """Compute one transaction."""
+
+    @abstractmethod
+    def slope(
+        self, gain: int, months: int, cost: int, commune: str, tax_year: int, confessions: dict[str, int],
+    ) -> tuple[int, int]:
+        """Marginal rate just above *gain* as ``(num, den)``."""
+
+    @abstractmethod
+    def holding_key(self, months: int) -> object:
+        """Every holding-dependent parameter in effect after *months*."""
+
+    @abstractmethod
+    def holding_horizon(self) -> int:
+        """Months from which ``holding_key`` no longer changes."""
+
+    def holding_breaks(self) -> tuple[int, ...]:
+        """Holding periods (months) at which a holding-dependent parameter changes."""
+        return _changes(self.holding_key, self.holding_horizon())
+
+
+class _Progressive(_Model):
+    """Brackets → multiplicative surcharge → discount → to_fixed_2 (SH, ZH, LU, GR, SO, …)."""
+
+    def __init__(self, tariff: dict, *, min_inclusive: bool = False, allocation: str = "canton") -> None:
+        self.min_gain = to_rappen(Decimal(str(tariff.get("minimum_taxable_gain", 0))))
+        self.min_inclusive = min_inclusive
+        self.brackets = _Brackets(tariff["brackets"], tariff["top_rate"])
+        surcharges = tariff.get("surcharges_by_months", tariff.get("surcharges", []))
+        discounts = tariff.get("discounts_by_years", tariff.get("discounts", []))
+        self.surcharges = _surcharge_table(surcharges, tariff.get("surcharge_threshold_months", 0))
+        self.discounts = _discount_table(discounts, tariff.get("discount_min_years", 0))
+        self.min_tax = to_rappen(Decimal(str(tariff.get("minimum_tax", 0))))
+        self.allocation = allocation
+        self.multiplier = scale_rate(tariff.get("canton_multiplier", 1))
+
+    def factors(self, months: int) -> tuple[int, int]:
+        """``(RATE_SCALE + surcharge, RATE_SCALE - discount)``; ``RATE_SCALE`` where none applies."""
+        surcharge = self.surcharges[max(months, 0)] if months < len(self.surcharges) else None
+        discount = _lookup(self.discounts, months // 12)
+        return RATE_SCALE + (surcharge or 0), RATE_SCALE - (discount or 0)
+
+    def simple_tax(self, gain: int, months: int) -> int:
+        surcharge, discount = self.factors(months)
+        return round_half_even(self.brackets.tax(gain) * surcharge * discount, RATE_SCALE**3)
+
+    def holding_key(self, months):
+        return self.factors(months)
+
+    def holding_horizon(self):
+        return max(len(self.surcharges), 12 * len(self.discounts))
+
+    def run(self, gain, months, cost, commune, tax_year, confessions):
+        if gain <= 0 or gain < self.min_gain or (self.min_inclusive and gain == self.min_gain):
+            return _zero(gain, months)
+        simple = self.simple_tax(gain, months)
+        if simple < self.min_tax:
+            simple = 0
+        if self.allocation == "commune":
+            return FixedResult(gain, simple, 0, simple, months)
+        if self.allocation == "multiplier":
+            canton = round_half_even(simple * self.multiplier, RATE_SCALE)
+            return FixedResult(gain, simple, canton, 0, months)
+        return _canton_only(gain, simple, months)
+
+    def slope(self, gain, months, cost, commune, tax_year, confessions):
+        if gain <= 0 or gain < self.min_gain or (self.min_inclusive and gain == self.min_gain):
+            return 0, 1
+        if self.simple_tax(gain, months) < self.min_tax:
+            return 0, 1
+        surcharge, discount = self.factors(months)
+        num, den = self.brackets.rate(gain) * surcharge * discount, RATE_SCALE**3
+        if self.allocation == "multiplier":
+            num, den = num * self.multiplier, den * RATE_SCALE
+        return num, den
+
+
+class _Schaffhausen(_Progressive):
+    """SH: progressive simple tax, Steuerfuss shares with roundUpTo005 and church tax."""
+
+    STORE = "communes/sh/steuerfuesse.bin"
+    COLUMNS = ("natPers", "evangR", "roemK", "christK")
+
+    @property
+    def steuerfuesse(self) -> MultiplierTable:
+        """Multipliers viewed in the memory-mapped :attr:`STORE` – not part of the compiled state."""
+        return _multipliers(self.STORE, self.COLUMNS)
+
+    @staticmethod
+    def share(simple: int, multiplier: int) -> int:
+        # roundUpTo005(simple * mult / 100) in twentieths of a franc, returned in Rappen
+        return 5 * _ceil_div(simple * multiplier * 20, 100 * 100 * RATE_SCALE)
+
+    def rows(self, commune: str, tax_year: int) -> tuple[int, int]:
+        """Steuerfuss rows of the commune and of the canton itself."""
+        row = self.steuerfuesse.index.get((tax_year, commune))
+        kanton_row = self.steuerfuesse.index.get((tax_year, "Kanton"))
+        if row is None or kanton_row is None:
+            raise ValueError(f"No Steuerfuss data for commune '{commune}' / year {tax_year} in SH")
+        return row, kanton_row
+
+    def run(self, gain, months, cost, commune, tax_year, confessions):
+        if gain <= 0:
+            return _zero(gain, months)
+        simple = self.simple_tax(gain, months)
+        row, kanton_row = self.rows(commune, tax_year)
+        columns = self.steuerfuesse.columns
+        canton = self.share(simple, columns["natPers"][kanton_row])
+        commune_share = self.share(simple, columns["natPers"][row])
+
+        terms = tuple(
+            (key, simple * (columns[key][row] if key in columns else 0), count)
+            for key, count in confessions.items()
+        )
+        return FixedResult(gain, simple, canton, commune_share, months, terms if sum(confessions.values()) else ())
+
+    def slope(self, gain, months, cost, commune, tax_year, confessions):
+        if gain <= 0:
+            return 0, 1
+        row, kanton_row = self.rows(commune, tax_year)
+        columns = self.steuerfuesse.columns
+        people = sum(confessions.values()) or 1
+        # Shares are simple × multiplier / 100, church tax simple × Σ rate × count / 100 / people
+        multipliers = (columns["natPers"][kanton_row] + columns["natPers"][row]) * people + sum(
+            columns[key][row] * count for key, count in confessions.items() if key in columns
+        )
+        surcharge, discount = self.factors(months)
+        return (
+            self.brackets.rate(gain) * surcharge * discount * multipliers,
+            RATE_SCALE**3 * 100 * RATE_SCALE * people,
+        )
+
+
+class _Bern(_Progressive):
+    """BE: the holding-period discount reduces the gain before the brackets."""
+
+    def __init__(self, tariff: dict) -> None:
+        super().__init__(tariff)
+        self.scaled_brackets = _Brackets(tariff["brackets"], tariff["top_rate"], scale=RATE_SCALE)
+
+    def run(self, gain, months, cost, commune, tax_year, confessions):
+        if gain <= 0 or gain < self.min_gain:
+            return _zero(gain, months)
+        discount = _lookup(self.discounts, months // 12) or 0
+        num = self.scaled_brackets.tax(gain * (RATE_SCALE - discount))
+        den = RATE_SCALE * RATE_SCALE
+        surcharge = self.surcharges[max(months, 0)] if months < len(self.surcharges) else None
+        if surcharge is not None:
+            num, den = num * (RATE_SCALE + surcharge), den * RATE_SCALE
+        return _canton_only(gain, round_half_even(num, den), months)
+
+    def slope(self, gain, months, cost, commune, tax_year, confessions):
+        if gain <= 0 or gain < self.min_gain:
+            return 0, 1
+        surcharge, discount = self.factors(months)
+        return self.scaled_brackets.rate(gain * discount) * discount * surcharge, RATE_SCALE**3
+
+
+class _StGallen(_Model):
+    """SG: brackets or flat rate, additive surcharge by year, gain-tiered discount."""
+
+    def __init__(self, tariff: dict) -> None:
+        self.min_gain = to_rappen(Decimal(str(tariff.get("minimum_taxable_gain", 0))))
+        self.brackets = _Brackets(tariff["brackets"] + tariff.get("high_gain_brackets", []), None)
+        self.flat_threshold = to_rappen(Decimal(str(tariff["flat_rate_threshold"])))
+        self.flat_rate = scale_rate(tariff["flat_rate"])
+        self.surcharge_threshold = tariff["surcharge_threshold_months"]
+        self.surcharges = [(e["year"], scale_rate(e["rate"])) for e in tariff.get("surcharges_by_year", [])]
+        self.discount_min_years = tariff["discount_min_years"]
+        self.discount_low = scale_rate(tariff["discount_per_year_low"])
+        self.discount_high = scale_rate(tariff["discount_per_year_high"])
+        self.discount_threshold = to_rappen(Decimal(str(tariff["discount_gain_threshold"])))
+        self.discount_max_low = scale_rate(tariff["discount_max_low"])
+        self.discount_max_high = scale_rate(tariff["discount_max_high"])
+
+    def surcharge(self, months: int) -> int:
+        """Additive surcharge rate for short holding periods (0 where none applies)."""
+        if months >= self.surcharge_threshold:
+            return 0
+        return next((rate for year, rate in self.surcharges if months // 12 < year), 0)
+
+    def discount(self, gain: int, years: int) -> int:
+        """Holding-period discount; the cap per year depends on the gain tier."""
+        if years < self.discount_min_years:
+            return 0
+        discount_years = years - self.discount_min_years + 1
+        if gain >= self.discount_threshold:
+            return min(self.discount_high * discount_years, self.discount_max_high)
+        return min(self.discount_low * discount_years, self.discount_max_low)
+
+    def run(self, gain, months, cost, commune, tax_year, confessions):
+        if gain <= 0 or gain <= self.min_gain:
+            return _zero(gain, months)
+        num = gain * self.flat_rate if gain >= self.flat_threshold else self.brackets.tax(gain)
+        num += gain * self.surcharge(months)
+        discount = self.discount(gain, months // 12)
+        return _canton_only(gain, round_half_even(num * (RATE_SCALE - discount), RATE_SCALE**2), months)
+
+    def slope(self, gain, months, cost, commune, tax_year, confessions):
+        if gain <= 0 or gain <= self.min_gain:
+            return 0, 1
+        rate = self.flat_rate if gain >= self.flat_threshold else self.brackets.rate(gain)
+        discount = self.discount(gain, months // 12)
+        return (rate + self.surcharge(months)) * (RATE_SCALE - discount), RATE_SCALE**2
+
+    def holding_key(self, months):
+        years = months // 12
+        return self.surcharge(months), self.discount(0, years), self.discount(self.discount_threshold, years)
+
+    def holding_horizon(self):
+        capped = max(
+            _ceil_div(self.discount_max_low, self.discount_low or 1),
+            _ceil_div(self.discount_max_high, self.discount_high or 1),
+        )
+        return max(self.surcharge_threshold, 12 * (self.discount_min_years + capped))
+
+
+class _Proportional(_Model):
+    """Flat base rate with surcharge/discount (TG, AR) or × canton Steuerfuss (OW)."""
+
+    def __init__(self, tariff: dict) -> None:
+        self.base_rate = scale_rate(tariff["base_rate"])
+        self.min_gain = to_rappen(Decimal(str(tariff.get("minimum_taxable_gain", 0))))
+        self.gain_rounding = int(tariff["gain_rounding"]) * _RAPPEN if "gain_rounding" in tariff else 1
+        self.surcharges = _surcharge_table(tariff.get("surcharges", []), tariff["surcharge_threshold_months"])
+        self.discounts = _discount_table(tariff.get("discounts", []), tariff.get("discount_min_years", 0))
+        steuerfuss = tariff.get("default_canton_steuerfuss")
+        self.steuerfuss = scale_rate(steuerfuss) if steuerfuss is not None else None
+
+    def run(self, gain, months, cost, commune, tax_year, confessions):
+        if gain <= 0 or gain < self.min_gain:
+            return _zero(gain, months)
+        taxable = gain // self.gain_rounding * self.gain_rounding
+        if taxable < self.min_gain:
+            return _zero(gain, months)
+        surcharge, factor = self.factors(months)
+        simple = round_half_even(taxable * self.base_rate * surcharge * factor, RATE_SCALE**3)
+        return _canton_only(taxable, simple, months)
+
+    def factors(self, months: int) -> tuple[int, int]:
+        """``(RATE_SCALE + surcharge, Steuerfuss or RATE_SCALE - discount)``."""
+        surcharge = self.surcharges[max(months, 0)] if months < len(self.surcharges) else None
+        if self.steuerfuss is not None:
+            return RATE_SCALE + (surcharge or 0), self.steuerfuss
+        return RATE_SCALE + (surcharge or 0), RATE_SCALE - (_lookup(self.discounts, months // 12) or 0)
+
+    def slope(self, gain, months, cost, commune, tax_year, confessions):
+        # The gain_rounding staircase is smoothed to its average slope
+        if gain <= 0 or gain < self.min_gain:
+            return 0, 1
+        surcharge, factor = self.factors(months)
+        return self.base_rate * surcharge * factor, RATE_SCALE**3
+
+    def holding_key(self, months):
+        return self.factors(months)
+
+    def holding_horizon(self):
+        return max(len(self.surcharges), 12 * len(self.discounts))
+
+
+class _Degressive(_Model):
+    """Flat rate by completed holding years: AG, NW, GE, TI, VD, FR (+ commune), UR."""
+
+    def __init__(self, tariff: dict, *, canton: str) -> None:
+        from grundstueckgewinnsteuer.engine.pipeline import holding_rate_tables
+
+        self.canton = canton
+        self.min_gain = to_rappen(Decimal(str(tariff.get("minimum_taxable_gain", 0))))
+        # Same dense year → rate table as the pipeline's holding_rate stage
+        self.table = [scale_rate(rate) for rate in holding_rate_tables(tariff)[False].rates]
+        self.freibetrag = to_rappen(Decimal(str(tariff.get("freibetrag", 0))))
+        self.gain_rounding = int(tariff["gain_rounding"]) * _RAPPEN if "gain_rounding" in tariff else 1
+        self.commune_surcharge = scale_rate(tariff.get("commune_surcharge_rate", 0))
+
+    def rate(self, months: int) -> int:
+        return self.table[min(max(months // 12, 0), len(self.table) - 1)]
+
+    def run(self, gain, months, cost, commune, tax_year, confessions):
+        if gain <= 0 or gain < self.min_gain:
+            return _zero(gain, months)
+        rate = self.rate(months)
+        taxable = gain
+        if self.canton == "UR":
+            taxable = max(gain - self.freibetrag, 0) // self.gain_rounding * self.gain_rounding
+            if taxable <= 0:
+                return _zero(gain, months)
+        simple = round_half_even(taxable * rate, RATE_SCALE)
+        if self.commune_surcharge:
+            commune_tax = round_half_even(simple * self.commune_surcharge, RATE_SCALE)
+            return FixedResult(taxable, simple, simple, commune_tax, months)
+        return _canton_only(taxable, simple, months)
+
+    def slope(self, gain, months, cost, commune, tax_year, confessions):
+        if gain <= 0 or gain < self.min_gain or (self.canton == "UR" and gain < self.freibetrag + self.gain_rounding):
+            return 0, 1
+        return self.rate(months) * (RATE_SCALE + self.commune_surcharge), RATE_SCALE**2
+
+    def holding_key(self, months):
+        return self.rate(months)
+
+    def holding_horizon(self):
+        return 12 * len(self.table)
+
+
+class _BaselStadt(_Model):
+    """BS: gain reduction by holding years, then the (not self-used) rate schedule."""
+
+    def __init__(self, tariff: dict) -> None:
+        self.min_gain = to_rappen(Decimal(str(tariff.get("minimum_taxable_gain", 0))))
+        self.min_rate = scale_rate(tariff["min_rate"])
+        self.schedules = {
+            self_used: {int(k): scale_rate(v) for k, v in tariff[key].items()}
+            for self_used, key in ((False, "rates_not_self_used"), (True, "rates_self_used"))
+        }
+        self.reduction_start = tariff["gain_reduction_start_year"]
+        self.reduction_per_year = scale_rate(tariff["gain_reduction_per_year"])
+        self.reduction_max = scale_rate(tariff["gain_reduction_max"])
+
+    def rate(self, years: int, self_used: bool) -> int:
+        rates = self.schedules[self_used]
+        if years <= 0:
+            return rates.get(1, scale_rate("0.60"))
+        if years >= 25:
+            return self.min_rate
+        return rates.get(years, self.min_rate)
+
+    def reduction(self, years: int) -> int:
+        if years < self.reduction_start:
+            return 0
+        return min(self.reduction_per_year * (years - self.reduction_start + 1), self.reduction_max)
+
+    def run(self, gain, months, cost, commune, tax_year, confessions, self_used: bool = False):
+        if gain <= 0 or gain < self.min_gain:
+            return _zero(gain, months)
+        years = months // 12
+        num = gain * (RATE_SCALE - self.reduction(years)) * self.rate(years, self_used)
+        return _canton_only(gain, round_half_even(num, RATE_SCALE * RATE_SCALE), months)
+
+    def slope(self, gain, months, cost, commune, tax_year, confessions, self_used: bool = False):
+        if gain <= 0 or gain < self.min_gain:
+            return 0, 1
+        years = months // 12
+        return (RATE_SCALE - self.reduction(years)) * self.rate(years, self_used), RATE_SCALE * RATE_SCALE
+
+    def holding_key(self, months):
+        years = months // 12
+        return self.rate(years, False), self.rate(years, True), self.reduction(years)
+
+    def holding_horizon(self):
+        capped = _ceil_div(self.reduction_max, self.reduction_per_year or 1)
+        return 12 * max(25, self.reduction_start + capped)
+
+
+class _BaselLand(_Model):
+    """BL: formula rate on the whole gain plus a per-month short-holding surcharge."""
+
+    def __init__(self, tariff: dict) -> None:
+        self.tiers = [
+            (to_rappen(Decimal(str(t["up_to"]))), scale_rate(t["base_rate"]), scale_rate(t["increment_per_100"]))
+            for t in tariff["rate_tiers"]
+        ]
+        self.max_rate = scale_rate(tariff["max_rate"])
+        # The ``formula_rate`` stage switches to the max rate above this gain
+        self.max_rate_above = to_rappen(Decimal(str(tariff["max_rate_above"])))
+        self.surcharge_threshold = tariff["surcharge_threshold_months"]
+        self.surcharge_per_month = scale_rate(tariff["surcharge_per_month"])
+
+    def rate(self, gain: int) -> int:
+        """Rate scaled by ``RATE_SCALE × 10_000`` (the per-CHF-100 increment adds four places)."""
+        rate, prev = 0, 0
+        for limit, base, increment in self.tiers:
+            if gain <= prev:
+                break
+            if gain <= limit:
+                rate = base * 10_000 + increment * (gain - prev)
+                break
+            prev = limit
+        max_rate = self.max_rate * 10_000
+        if gain > self.max_rate_above:
+            rate = max_rate
+        return min(rate, max_rate)
+
+    def factor(self, months: int) -> int:
+        """``RATE_SCALE`` plus the short-holding surcharge."""
+        return RATE_SCALE + self.surcharge_per_month * max(self.surcharge_threshold - months, 0)
+
+    def run(self, gain, months, cost, commune, tax_year, confessions):
+        if gain <= 0:
+            return _zero(gain, months)
+        num = gain * self.rate(gain) * self.factor(months)
+        return _canton_only(gain, round_half_even(num, RATE_SCALE * 10_000 * RATE_SCALE), months)
+
+    def slope(self, gain, months, cost, commune, tax_year, confessions):
+        if gain <= 0:
+            return 0, 1
+        # d(gain × rate(gain)) / d gain: the rate itself grows linearly inside a tier
+        max_rate = self.max_rate * 10_000
+        rate = self.rate(gain + 1)
+        if rate >= max_rate or gain + 1 > self.max_rate_above:
+            rate = max_rate
+        else:
+            prev = 0
+            for limit, base, increment in self.tiers:
+                if gain + 1 <= limit:
+                    rate = base * 10_000 + increment * (2 * gain - prev)
+                    break
+                prev = limit
+        return rate * self.factor(months), RATE_SCALE * 10_000 * RATE_SCALE
+
+    def holding_key(self, months):
+        return self.factor(months)
+
+    def holding_horizon(self):
+        return self.surcharge_threshold
+
+
+class _Zug(_Model):
+    """ZG: yield-based rate in percent, kept as an exact ``(num, den)`` pair."""
+
+    def __init__(self, tariff: dict) -> None:
+        self.min_gain = to_rappen(Decimal(str(tariff.get("minimum_taxable_gain", 0))))
+        self.min_rate = scale_rate(tariff["min_rate"])
+        self.max_rate = scale_rate(tariff["max_rate"])
+        self.reduction_start = tariff["max_rate_reduction_start_year"]
+        self.reduction_per_year = scale_rate(tariff["max_rate_reduction_per_year"])
+        self.reduction_max = scale_rate(tariff["max_rate_reduction_max"])
+
+    def max_rate_after(self, years: int) -> int:
+        if years < self.reduction_start:
+            return self.max_rate
+        return self.max_rate - min(self.reduction_per_year * (years - self.reduction_start + 1), self.reduction_max)
+
+    @staticmethod
+    def yield_percent(gain: int, cost: int, months: int) -> tuple[int, int]:
+        """Unclamped annual yield in percent (monthly basis up to five years)."""
+        years = months // 12
+        return (gain * 1200, cost * months) if years <= 5 else (gain * 100, cost * years)
+
+    def rate_percent(self, gain: int, cost: int, months: int) -> tuple[int, int]:
+        if cost <= 0 or months <= 0:
+            return self.max_rate, RATE_SCALE
+        num, den = self.yield_percent(gain, cost, months)
+        max_rate = self.max_rate_after(months // 12)
+        if num * RATE_SCALE > max_rate * den:
+            num, den = max_rate, RATE_SCALE
+        if num * RATE_SCALE < self.min_rate * den:
+            num, den = self.min_rate, RATE_SCALE
+        return num, den
+
+    def run(self, gain, months, cost, commune, tax_year, confessions):
+        if gain <= 0 or gain < self.min_gain:
+            return _zero(gain, months)
+        num, den = self.rate_percent(gain, cost, months)
+        simple = round_half_even(gain * num, den * 100)
+        return FixedResult(gain, simple, 0, simple, months)
+
+    def slope(self, gain, months, cost, commune, tax_year, confessions):
+        if gain <= 0 or gain < self.min_gain:
+            return 0, 1
+        num, den = self.rate_percent(gain, cost, months)
+        if cost > 0 and months > 0 and (num, den) == self.yield_percent(gain, cost, months):
+            num *= 2  # gain × rate with the rate itself proportional to the gain
+        return num, den * 100
+
+    def holding_key(self, months):
+        years = months // 12
+        return months if years <= 5 else years, self.max_rate_after(years)
+
+    def holding_horizon(self):
+        return 1200
+
+
+# ---------------------------------------------------------------------------
+# Compiled state
+# ---------------------------------------------------------------------------
+
+KERNEL_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "kernel.bin")
+
+_MARSHAL_VERSION = 4
+_CLASS = "__class__"
+_STATE_CLASSES = {
+    cls.__name__: cls
+    for cls in (
+        _Brackets, _Progressive, _Schaffhausen, _Bern, _StGallen, _Proportional, _Degressive, _BaselStadt,
+        _BaselLand, _Zug,
+    )
+}
+
+_MULTIPLIERS: dict[str, MultiplierTable] = {}
+
+
+def _multipliers(store: str, columns: tuple[str, ...]) -> MultiplierTable:
+    """Columns of the compiled Steuerfuss *store* below ``data/``, mapped once per process."""
+    table = _MULTIPLIERS.get(store)
+    if table is None:
+        # mmap + struct only; imported on first use so the tariff-only cantons never load it
+        from grundstueckgewinnsteuer.engine.steuerfuss import load_steuerfuss_store
+
+        table = _MULTIPLIERS[store] = MultiplierTable.from_store(load_steuerfuss_store(store), columns)
+    return table
+
+
+def _dump_value(value):
+    if type(value) in _STATE_CLASSES.values():
+        names = vars(value) if hasattr(value, "__dict__") else value.__slots__
+        return {_CLASS: type(value).__name__, **{name: _dump_value(getattr(value, name)) for name in names}}
+    if isinstance(value, dict):
+        return {key: _dump_value(item) for key, item in value.items()}
+    if isinstance(value, list | tuple):
+        return type(value)(_dump_value(item) for item in value)
+    return value
+
+
+def _load_value(value):
+    if isinstance(value, dict):
+        name = value.get(_CLASS)
+        if name is not None:
+            obj = object.__new__(_STATE_CLASSES[name])
+            for key, item in value.items():
+                if key != _CLASS:
+                    setattr(obj, key, _load_value(item))
+            return obj
+        return {key: _load_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_load_value(item) for item in value]
+    return value
+
+
+def dump_models(models: dict[str, _Model]) -> bytes:
+    """Serialize compiled models as a ``marshal`` payload of plain ints, strings, lists and dicts."""
+    return marshal.dumps({code: _dump_value(model) for code, model in sorted(models.items())}, _MARSHAL_VERSION)
+
+
+def load_models(data: bytes) -> dict[str, _Model]:
+    """Inverse of :func:`dump_models`."""
+    return {code: _load_value(state) for code, state in marshal.loads(data).items()}
+
+
+_BREAKS: dict[str, tuple[int, ...]] = {}
+"""Holding breaks of the packaged models, filled by :func:`marginal_transaction`."""
+
+_LOADED: dict[str, _Model] = {}
+
+
+def model(canton_code: str) -> _Model:
+    """The compiled model of a canton from ``data/kernel.bin`` (read once per process)."""
+    if not _LOADED:
+        with open(KERNEL_FILE, "rb") as f:
+            _LOADED.update(load_models(f.read()))
+    try:
+        return _LOADED[canton_code.upper()]
+    except KeyError:
+        raise KeyError(f"No compiled model for canton '{canton_code.upper()}'. Available: {sorted(_LOADED)}") from None
+
+
+# ---------------------------------------------------------------------------
+# Compute
+# ---------------------------------------------------------------------------
+
+Transaction = namedtuple(
+    "Transaction",
+    "canton commune tax_year purchase_date sale_date purchase_price sale_price "
+    "acquisition_costs selling_costs investments confessions self_used",
+    defaults=(0, 0, 0, None, False),
+)
+Transaction.__doc__ = """One sale with every amount in integer Rappen and dates as ``datetime.date``.
+
+``investments`` is the total of value-adding investments; ``confessions``
+maps confession → people (SH church tax); ``self_used`` selects BS's
+owner-occupier rates.
+"""
+
+
+def transaction(inputs) -> Transaction:
+    """Convert ``TaxInputs`` (or anything with its attributes) to a :class:`Transaction`."""
+    extra = getattr(inputs, "extra", None)
+    return Transaction(
+        canton=inputs.canton.upper(),
+        commune=inputs.commune,
+        tax_year=inputs.tax_year,
+        purchase_date=inputs.purchase_date,
+        sale_date=inputs.sale_date,
+        purchase_price=to_rappen(inputs.purchase_price),
+        sale_price=to_rappen(inputs.sale_price),
+        acquisition_costs=to_rappen(inputs.acquisition_costs),
+        selling_costs=to_rappen(inputs.selling_costs),
+        investments=to_rappen(sum((i.amount for i in inputs.investments), Decimal("0"))),
+        confessions=dict(inputs.confessions),
+        self_used=isinstance(extra, dict) and extra.get("self_used", False),
+    )
+
+
+def _arguments(model: _Model, t: Transaction, months: int | None = None) -> tuple:
+    """Positional ``run``/``slope`` arguments of *model* for *t* (optionally at another holding period)."""
+    gain = t.sale_price - t.purchase_price - t.acquisition_costs - t.selling_costs - t.investments
+    if months is None:
+        months = months_between(t.purchase_date, t.sale_date)
+    if isinstance(model, _BaselStadt):
+        return gain, months, 0, t.commune, t.tax_year, {}, t.self_used
+    cost = t.purchase_price + t.acquisition_costs + t.investments if isinstance(model, _Zug) else 0
+    return gain, months, cost, t.commune, t.tax_year, t.confessions or {}
+
+
+def run(model: _Model, t: Transaction) -> FixedResult:
+    """Evaluate *model* for transaction *t*."""
+    return model.run(*_arguments(model, t))
+
+
+class Marginal(namedtuple("Marginal", "rate next_holding_months result next_result")):
+    """Marginal view of one transaction.
+
+    ``rate`` is the exact ``(num, den)`` derivative of the total tax with
+    respect to the gain (CHF of tax per CHF of gain, before rounding);
+    ``next_result`` is the same sale held until ``next_holding_months``,
+    the next holding period at which a holding-dependent parameter changes
+    (both ``None`` once none is left).
+    """
+
+    __slots__ = ()
+
+    @property
+    def holding_delta(self):
+        """Change of the total tax, in ``Fraction`` Rappen, from waiting until the next break."""
+        return 0 if self.next_result is None else self.next_result.total_tax - self.result.total_tax
+
+
+def marginal(model: _Model, t: Transaction, breaks: tuple[int, ...] | None = None) -> Marginal:
+    """Marginal rate of *t* under *model* and the effect of holding it until the next break.
+
+    *breaks* are ``model.holding_breaks()``, passed in by callers that cache them.
+    """
+    arguments = _arguments(model, t)
+    breaks = model.holding_breaks() if breaks is None else breaks
+    i = bisect_right(breaks, arguments[1])
+    if i == len(breaks):
+        return Marginal(model.slope(*arguments), None, model.run(*arguments), None)
+    later = _arguments(model, t, breaks[i])
+    return Marginal(model.slope(*arguments), breaks[i], model.run(*arguments), model.run(*later))
+
+
+def compute(
+    canton: str,
+    gain: int,
+    holding_months: int,
+    *,
+    cost: int = 0,
+    commune: str = "",
+    tax_year: int = 0,
+    confessions: dict[str, int] | None = None,
+) -> FixedResult:
+    """Compute from integer Rappen inputs (``cost`` is only used by ZG)."""
+    return model(canton).run(gain, holding_months, cost, commune, tax_year, confessions or {})
+
+
+def compute_transaction(t: Transaction) -> FixedResult:
+    """Compute one :class:`Transaction` with the packaged compiled models."""
+    return run(model(t.canton), t)
+
+
+def marginal_transaction(t: Transaction) -> Marginal:
+    """:func:`marginal` of one :class:`Transaction` with the packaged compiled models."""
+    code = t.canton.upper()
+    breaks = _BREAKS.get(code)
+    if breaks is None:
+        breaks = _BREAKS[code] = model(code).holding_breaks()
+    return marginal(model(code), t, breaks)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Recompile ``data/kernel.bin`` from the canton tariffs (needs the full package)."""
+    from grundstueckgewinnsteuer.engine.fixedpoint import write_kernel_data
+
+    print(write_kernel_data(*(argv or sys.argv[1:])[:1]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1144 @@
+"""Declarative tariff pipeline shared by all canton engines.
+
+Every ``data/cantons/<code>/tariff.yaml`` declares its computation as an
+ordered ``pipeline:`` list.  Each entry names a stage from the catalogue
+below, either bare (``- finalize``) or with parameters
+(``- surcharge: {mode: additive}``).  :func:`compiled_tariff` validates the
+tariff (:func:`validate_tariff`) and compiles it once per canton into an
+immutable :class:`CompiledTariff` – a flat tuple of stage callables with
+every constant pre-parsed; ``PipelineEngine.compute`` then walks that tuple
+over a :class:`PipelineState` and never reads the YAML.  A stage returning
+``True`` stops the pipeline with a zero result.
+
+Stage catalogue
+---------------
+Gain:        ``min_gain``, ``gain_reduction``, ``freibetrag``, ``round_gain``
+Base tax:    ``brackets``, ``flat_rate``, ``holding_rate``, ``formula_rate``, ``yield_rate``
+Adjustments: ``surcharge``, ``discount``, ``multiply``
+Simple tax:  ``finalize``, ``minimum_tax``
+Allocation:  ``allocate``, ``canton_multiplier``, ``commune_surcharge``,
+             ``steuerfuss_shares``, ``church_tax``
+Reporting:   ``effective_rate``
+
+Stage parameters default to the tariff's own top-level keys (e.g. ``surcharge``
+reads ``surcharges_by_months``/``surcharges`` and ``surcharge_threshold_months``),
+so most pipelines are just a list of names.
+
+``compute(inputs, checkpoint=True)`` attaches a checkpoint to the result –
+copies of the state in front of the first stage reading ``commune``/``tax_year``
+or ``confessions`` – from which ``PipelineEngine.recompute`` re-runs only the
+stages an edit invalidates.  Plain ``compute`` saves no states.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from decimal import Decimal
+from functools import cache, lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, ClassVar, NamedTuple
+
+import yaml
+
+from grundstueckgewinnsteuer.communes import load_commune_index
+from grundstueckgewinnsteuer.engine.base import CantonEngine
+from grundstueckgewinnsteuer.engine.kernel import months_between
+from grundstueckgewinnsteuer.engine.rounding import to_fixed_2
+from grundstueckgewinnsteuer.engine.steuerfuss import load_steuerfuss_store
+from grundstueckgewinnsteuer.engine.tariff import (
+    Bracket,
+    DiscountEntry,
+    RateTable,
+    SurchargeEntry,
+    apply_discount,
+    apply_surcharge,
+    compute_church_tax,
+    compute_share,
+    evaluate_brackets,
+    finalize_simple_tax,
+)
+from grundstueckgewinnsteuer.models import BracketStep, ResultMetadata, TaxInputs, TaxResult
+
+_DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+ENGINE_VERSION = "0.1.0"
+
+
+# ---------------------------------------------------------------------------
+# Shared helpers (formerly copied into every canton module)
+# ---------------------------------------------------------------------------
+
+def load_tariff(canton_code: str) -> dict:
+    """Load ``data/cantons/<code>/tariff.yaml``."""
+    with open(_DATA_DIR / "cantons" / canton_code.lower() / "tariff.yaml", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+@cache
+def load_data_json(relative_path: str) -> dict:
+    """Load (and cache) a JSON data file below ``data/``, e.g. ``communes/sh/steuerfuesse.json``."""
+    with open(_DATA_DIR / relative_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _dec(value: object) -> Decimal:
+    return Decimal(str(value))
+
+
+# ---------------------------------------------------------------------------
+# Pipeline state
+# ---------------------------------------------------------------------------
+
+class PipelineState:
+    """Mutable scratchpad threaded through the stages of one computation.
+
+    ``raw_gain`` is the gain from the inputs, ``gain`` the base the rate
+    stages work on (after reductions/rounding) and ``reported_gain`` the value
+    returned as ``TaxResult.taxable_gain``.
+    """
+
+    __slots__ = (
+        "inputs", "raw_gain", "gain", "reported_gain", "months", "years",
+        "tax", "rate", "steps", "flat_amount", "flat_tax", "surcharge_rate", "discount_rate",
+        "before_adjustments", "simple_tax", "canton_share", "commune_share",
+        "church_total", "church_breakdown", "total_tax",
+        "canton_multiplier", "commune_multiplier", "effective_rate", "extra",
+    )
+
+    def __init__(self, inputs: TaxInputs) -> None:
+        self.inputs = inputs
+        self.raw_gain = self.gain = self.reported_gain = inputs.taxable_gain
+        self.months = months_between(inputs.purchase_date, inputs.sale_date)
+        self.years = self.months // 12
+        self.tax = Decimal("0")
+        self.rate: Decimal | None = None
+        self.steps: list[BracketStep] = []
+        self.flat_amount = Decimal("0")
+        self.flat_tax = Decimal("0")
+        self.surcharge_rate: Decimal | None = None
+        self.discount_rate: Decimal | None = None
+        self.before_adjustments = Decimal("0")
+        self.simple_tax = Decimal("0")
+        self.canton_share = Decimal("0")
+        self.commune_share = Decimal("0")
+        self.church_total = Decimal("0")
+        self.church_breakdown: dict[str, Decimal] = {}
+        self.total_tax = Decimal("0")
+        self.canton_multiplier = Decimal("0")
+        self.commune_multiplier = Decimal("0")
+        self.effective_rate = Decimal("0")
+        self.extra: dict[str, object] = {}
+
+    def copy(self) -> PipelineState:
+        """Independent copy (stages replace values, but ``extra`` and ``church_breakdown`` are mutable)."""
+        clone = PipelineState.__new__(PipelineState)
+        for name in PipelineState.__slots__:
+            setattr(clone, name, getattr(self, name))
+        clone.extra = dict(self.extra)
+        clone.church_breakdown = dict(self.church_breakdown)
+        return clone
+
+
+Stage = Callable[[PipelineState], "bool | None"]
+StageFactory = Callable[..., Stage]
+
+STAGES: dict[str, StageFactory] = {}
+
+STAGE_READS: dict[str, frozenset[str]] = {}
+"""Stage name → ``TaxInputs`` fields it reads besides the transaction (prices, costs, dates)."""
+
+LATE_FIELDS = frozenset({"commune", "tax_year", "confessions"})
+"""Input fields that only stages declaring them in ``reads`` depend on; any other field feeds the whole pipeline."""
+
+
+def stage(name: str, reads: tuple[str, ...] = ()) -> Callable[[StageFactory], StageFactory]:
+    """Register a stage factory ``factory(tariff, **params) -> Stage`` under *name*.
+
+    *reads* lists the :data:`LATE_FIELDS` the stage depends on, so
+    :meth:`PipelineEngine.recompute` knows where an edit invalidates the pipeline.
+    """
+
+    def decorator(factory: StageFactory) -> StageFactory:
+        STAGES[name] = factory
+        STAGE_READS[name] = frozenset(reads)
+        return factory
+
+    return decorator
+
+
+class CommuneStage:
+    """Stage whose constants depend on ``(tax_year, commune)``.
+
+    ``bind(tax_year, commune)`` returns a plain stage with those constants
+    looked up and pre-bound; calling the unbound stage binds on every call.
+    """
+
+    __slots__ = ("bind",)
+
+    def __init__(self, bind: Callable[[int, str], Stage]) -> None:
+        self.bind = bind
+
+    def __call__(self, s: PipelineState) -> bool | None:
+        return self.bind(s.inputs.tax_year, s.inputs.commune)(s)
+
+
+def bind_stages(stages: tuple[Stage, ...], tax_year: int, commune: str) -> tuple[Stage, ...]:
+    """Partially evaluate a compiled pipeline for one ``(tax_year, commune)``."""
+    return tuple(st.bind(tax_year, commune) if isinstance(st, CommuneStage) else st for st in stages)
+
+
+# ---------------------------------------------------------------------------
+# Gain stages
+# ---------------------------------------------------------------------------
+
+@stage("min_gain")
+def _min_gain(tariff: dict, inclusive: bool = False) -> Stage:
+    """Zero result for non-positive gains and gains below (or at, if *inclusive*) the minimum."""
+    min_gain = _dec(tariff.get("minimum_taxable_gain", 0))
+
+    if inclusive:
+        return lambda s: s.gain <= 0 or s.gain <= min_gain
+    return lambda s: s.gain <= 0 or s.gain < min_gain
+
+
+@stage("gain_reduction")
+def _gain_reduction(tariff: dict, mode: str = "table") -> Stage:
+    """Holding-period reduction of the *gain* (BE: discount table, BS: linear per year)."""
+    if mode == "table":
+        discounts = _discount_entries(tariff)
+        min_years = tariff["discount_min_years"]
+
+        def reduce_by_table(s: PipelineState) -> None:
+            if s.years >= min_years:
+                for entry in reversed(discounts):
+                    if s.years >= entry.years:
+                        s.discount_rate = entry.rate
+                        s.gain = s.raw_gain * (1 - entry.rate)
+                        break
+            s.extra["discount_mode"] = "gain_reduction"
+            s.extra["adjusted_gain"] = str(s.gain)
+
+        return reduce_by_table
+
+    start = tariff["gain_reduction_start_year"]
+    per_year = _dec(tariff["gain_reduction_per_year"])
+    maximum = _dec(tariff["gain_reduction_max"])
+
+    def reduce_linearly(s: PipelineState) -> None:
+        reduction = Decimal("0")
+        if s.years >= start:
+            reduction = min(per_year * (s.years - start + 1), maximum)
+        s.gain = s.raw_gain * (1 - reduction)
+        s.discount_rate = reduction if reduction > 0 else None
+        s.extra["adjusted_gain"] = str(s.gain)
+        s.extra["gain_reduction_rate"] = str(reduction)
+
+    return reduce_linearly
+
+
+@stage("freibetrag")
+def _freibetrag(tariff: dict) -> Stage:
+    """Deduct the tax-free allowance; nothing left means zero tax."""
+    allowance = _dec(tariff.get("freibetrag", 0))
+
+    def deduct(s: PipelineState) -> bool:
+        s.gain = max(s.gain - allowance, Decimal("0"))
+        s.extra["freibetrag_applied"] = str(allowance)
+        return s.gain <= 0
+
+    return deduct
+
+
+@stage("round_gain")
+def _round_gain(tariff: dict, recheck_min: bool = False, report_as: str | None = None) -> Stage:
+    """Round the gain down to ``gain_rounding`` francs; the rounded gain is reported."""
+    step = int(tariff.get("gain_rounding", 1))
+    min_gain = _dec(tariff.get("minimum_taxable_gain", 0))
+
+    def round_down(s: PipelineState) -> bool:
+        s.gain = s.reported_gain = (s.gain // step) * step
+        if report_as:
+            s.extra[report_as] = str(s.gain)
+        return s.gain < min_gain if recheck_min else s.gain <= 0
+
+    return round_down
+
+
+# ---------------------------------------------------------------------------
+# Base-tax stages
+# ---------------------------------------------------------------------------
+
+@stage("brackets")
+def _brackets(tariff: dict, tables: tuple[str, ...] = ("brackets",)) -> Stage:
+    """Progressive brackets (+ ``top_rate``); SG's ``flat_rate_threshold`` switches to a flat rate."""
+    brackets = [
+        Bracket(limit=_dec(b["limit"]), rate=_dec(b["rate"]))
+        for table in tables
+        for b in tariff.get(table, [])
+    ]
+    top_rate = _dec(tariff["top_rate"]) if tariff.get("top_rate") is not None else None
+    flat_threshold = _dec(tariff["flat_rate_threshold"]) if "flat_rate_threshold" in tariff else None
+    flat_rate = _dec(tariff.get("flat_rate", 0))
+
+    def evaluate(s: PipelineState) -> None:
+        if flat_threshold is not None and s.gain >= flat_threshold:
+            s.tax = s.flat_tax = s.gain * flat_rate
+            s.steps, s.flat_amount = [], s.gain
+        else:
+            s.tax, s.steps, s.flat_amount, s.flat_tax = evaluate_brackets(s.gain, brackets, top_rate)
+        s.before_adjustments = s.tax
+
+    return evaluate
+
+
+@stage("flat_rate")
+def _flat_rate(tariff: dict) -> Stage:
+    """Proportional tax ``gain × base_rate``."""
+    base_rate = _dec(tariff["base_rate"])
+
+    def apply(s: PipelineState) -> None:
+        s.tax = s.before_adjustments = s.gain * base_rate
+        s.extra["base_rate"] = str(base_rate)
+
+    return apply
+
+
+def _rate_tables(
+    tariff: dict,
+    table: str = "rate_schedule",
+    self_used_table: str | None = None,
+    min_rate_after_years: int | None = None,
+    **_: object,
+) -> dict[bool, RateTable]:
+    if table == "rate_schedule":
+        return {False: RateTable.from_schedule(tariff[table], tariff["floor_rate"])}
+    last = min_rate_after_years if min_rate_after_years is not None else 25
+    tables = {False: RateTable.from_years(tariff[table], tariff["min_rate"], last)}
+    if self_used_table:
+        tables[True] = RateTable.from_years(tariff[self_used_table], tariff["min_rate"], last)
+    return tables
+
+
+def holding_rate_tables(tariff: dict) -> dict[bool, RateTable]:
+    """Rate tables of the tariff's ``holding_rate`` stage, keyed by *self-used* (``True`` only for BS)."""
+    for name, params in _entries(tariff):
+        if name == "holding_rate":
+            return _rate_tables(tariff, **params)
+    raise ValueError("Tariff has no holding_rate stage")
+
+
+@cache
+def holding_rate_table(canton_code: str, self_used: bool = False) -> RateTable:
+    """Compiled holding-period rate table of a canton (AG, NW, GE, TI, VD, FR, UR, BS)."""
+    tables = compiled_tariff(canton_code).rate_tables
+    if not tables:
+        raise ValueError(f"Canton {canton_code.upper()} has no holding_rate stage")
+    if self_used not in tables:
+        raise KeyError(f"Canton {canton_code.upper()} has no self-used rate table")
+    return tables[self_used]
+
+
+@stage("holding_rate")
+def _holding_rate(
+    tariff: dict,
+    table: str = "rate_schedule",
+    self_used_table: str | None = None,
+    min_rate_after_years: int | None = None,
+    report_as: str = "applied_rate",
+) -> Stage:
+    """Flat rate chosen by completed holding years from a dense :class:`RateTable`.
+
+    ``rate_schedule`` tables pick the first entry with ``years < max_years``
+    (else ``floor_rate``); year-keyed dicts (AG, BS) use the year-1 rate below
+    one year and ``min_rate`` after ``min_rate_after_years``.
+    """
+    tables = {
+        self_used: rates.rates
+        for self_used, rates in _rate_tables(tariff, table, self_used_table, min_rate_after_years).items()
+    }
+
+    def lookup(s: PipelineState) -> None:
+        self_used = False
+        if self_used_table and isinstance(getattr(s.inputs, "extra", None), dict):
+            self_used = bool(s.inputs.extra.get("self_used", False))  # type: ignore[attr-defined]
+        rates = tables[self_used]
+        s.rate = rates[min(max(s.years, 0), len(rates) - 1)]
+        s.tax = s.gain * s.rate
+        if self_used_table:
+            s.extra["rate_schedule"] = "self_used" if self_used else "not_self_used"
+        s.extra[report_as] = str(s.rate)
+
+    return lookup
+
+
+@stage("formula_rate")
+def _formula_rate(tariff: dict) -> Stage:
+    """BL: rate grows linearly per CHF 100 within tiers, capped at ``max_rate``."""
+    tiers = [
+        (_dec(t["up_to"]), _dec(t["base_rate"]), _dec(t["increment_per_100"]))
+        for t in tariff["rate_tiers"]
+    ]
+    max_rate = _dec(tariff["max_rate"])
+    max_rate_above = _dec(tariff["max_rate_above"])
+
+    def rate_for(gain: Decimal) -> Decimal:
+        rate = Decimal("0")
+        prev_limit = Decimal("0")
+        for limit, base, increment in tiers:
+            if gain <= prev_limit:
+                break
+            if gain <= limit:
+                rate = base + increment * ((gain - prev_limit) / Decimal("100"))
+                break
+            prev_limit = limit
+        if gain > max_rate_above:
+            rate = max_rate
+        return min(rate, max_rate)
+
+    def apply(s: PipelineState) -> None:
+        s.rate = rate_for(s.gain)
+        s.tax = s.before_adjustments = s.gain * s.rate
+        s.extra["formula_rate"] = str(s.rate)
+
+    return apply
+
+
+@stage("yield_rate")
+def _yield_rate(tariff: dict) -> Stage:
+    """ZG: rate (percent) equals the annual yield on cost, clamped to a degressive maximum."""
+    min_rate = _dec(tariff["min_rate"])
+    max_rate = _dec(tariff["max_rate"])
+    reduction_start = tariff["max_rate_reduction_start_year"]
+    reduction_per_year = _dec(tariff["max_rate_reduction_per_year"])
+    reduction_max = _dec(tariff["max_rate_reduction_max"])
+
+    def effective_max(years: int) -> Decimal:
+        if years < reduction_start:
+            return max_rate
+        return max_rate - min(reduction_per_year * (years - reduction_start + 1), reduction_max)
+
+    def apply(s: PipelineState) -> None:
+        inputs = s.inputs
+        cost = inputs.purchase_price + inputs.acquisition_costs + inputs.total_investments
+        if cost <= 0 or s.months <= 0:
+            rate = max_rate
+        else:
+            total_yield = s.gain * Decimal("100") / cost
+            if s.years <= 5:
+                annual_yield = total_yield * Decimal("12") / Decimal(str(s.months))
+            else:
+                annual_yield = total_yield / Decimal(str(s.years))
+            rate = max(min_rate, min(annual_yield, effective_max(s.years)))
+        s.rate = rate
+        s.tax = s.gain * rate / Decimal("100")
+        s.extra["yield_rate_percent"] = str(rate)
+        s.extra["max_rate_percent"] = str(effective_max(s.years))
+
+    return apply
+
+
+# ---------------------------------------------------------------------------
+# Holding-period adjustments
+# ---------------------------------------------------------------------------
+
+def _discount_entries(tariff: dict) -> list[DiscountEntry]:
+    return [
+        DiscountEntry(years=d["years"], rate=_dec(d["rate"]))
+        for d in tariff.get("discounts_by_years", tariff.get("discounts", []))
+    ]
+
+
+@stage("surcharge")
+def _surcharge(tariff: dict, mode: str = "multiplicative") -> Stage:
+    """Short-holding surcharge on the tax.
+
+    ``multiplicative``: ``tax × (1 + rate)`` from a month table;
+    ``additive`` (SG): ``tax + gain × rate`` by completed year;
+    ``per_month`` (BL): ``tax × (1 + per_month × months short)``.
+    """
+    threshold = tariff["surcharge_threshold_months"]
+
+    if mode == "additive":
+        by_year = [(e["year"], _dec(e["rate"])) for e in tariff.get("surcharges_by_year", [])]
+
+        def add(s: PipelineState) -> None:
+            if s.months >= threshold:
+                return
+            for year, rate in by_year:
+                if s.years < year:
+                    s.surcharge_rate = rate
+                    s.tax = s.tax + s.gain * rate
+                    return
+
+        return add
+
+    if mode == "per_month":
+        per_month = _dec(tariff["surcharge_per_month"])
+
+        def per_month_short(s: PipelineState) -> None:
+            if s.months < threshold:
+                s.surcharge_rate = per_month * (threshold - s.months)
+                s.tax = s.tax * (1 + s.surcharge_rate)
+
+        return per_month_short
+
+    surcharges = [
+        SurchargeEntry(max_months=e["max_months"], rate=_dec(e["rate"]))
+        for e in tariff.get("surcharges_by_months", tariff.get("surcharges", []))
+    ]
+
+    def multiply(s: PipelineState) -> None:
+        s.tax, s.surcharge_rate = apply_surcharge(s.tax, s.months, surcharges, threshold)
+
+    return multiply
+
+
+@stage("discount")
+def _discount(tariff: dict, mode: str = "table") -> Stage:
+    """Long-holding discount on the tax: year table, or SG's gain-tiered linear discount."""
+    min_years = tariff["discount_min_years"]
+
+    if mode == "gain_tiered":
+        per_year_low = _dec(tariff["discount_per_year_low"])
+        per_year_high = _dec(tariff["discount_per_year_high"])
+        gain_threshold = _dec(tariff["discount_gain_threshold"])
+        max_low = _dec(tariff["discount_max_low"])
+        max_high = _dec(tariff["discount_max_high"])
+
+        def tiered(s: PipelineState) -> None:
+            if s.years < min_years:
+                return
+            discount_years = s.years - min_years + 1
+            if s.gain >= gain_threshold:
+                rate = min(per_year_high * discount_years, max_high)
+            else:
+                rate = min(per_year_low * discount_years, max_low)
+            s.discount_rate = rate
+            s.tax = s.tax * (1 - rate)
+
+        return tiered
+
+    discounts = _discount_entries(tariff)
+
+    def by_table(s: PipelineState) -> None:
+        s.tax, s.discount_rate = apply_discount(s.tax, s.months, discounts, min_years)
+
+    return by_table
+
+
+@stage("multiply")
+def _multiply(tariff: dict, key: str, report_as: str | None = None) -> Stage:
+    """Multiply the tax by a tariff factor (OW: canton Steuerfuss)."""
+    factor = _dec(tariff.get(key, 1))
+
+    def apply(s: PipelineState) -> None:
+        s.tax = s.tax * factor
+        if report_as:
+            s.extra[report_as] = str(factor)
+
+    return apply
+
+
+# ---------------------------------------------------------------------------
+# Simple tax
+# ---------------------------------------------------------------------------
+
+@stage("finalize")
+def _finalize(tariff: dict, record_before: bool = False) -> Stage:
+    """Round the tax to the simple tax (``toFixed(2)``)."""
+
+    def apply(s: PipelineState) -> None:
+        s.simple_tax = finalize_simple_tax(s.tax)
+        if record_before:
+            s.before_adjustments = s.simple_tax
+
+    return apply
+
+
+@stage("minimum_tax")
+def _minimum_tax(tariff: dict) -> Stage:
+    """Simple taxes below ``minimum_tax`` are not levied."""
+    minimum = _dec(tariff.get("minimum_tax", 0))
+
+    def apply(s: PipelineState) -> None:
+        if s.simple_tax < minimum:
+            s.simple_tax = Decimal("0")
+
+    return apply
+
+
+# ---------------------------------------------------------------------------
+# Allocation
+# ---------------------------------------------------------------------------
+
+@stage("allocate")
+def _allocate(tariff: dict, to: str = "canton") -> Stage:
+    """The simple tax is the total tax and goes entirely to the canton or the commune."""
+    if to == "commune":
+
+        def to_commune(s: PipelineState) -> None:
+            s.commune_share = s.total_tax = s.simple_tax
+
+        return to_commune
+
+    def to_canton(s: PipelineState) -> None:
+        s.canton_share = s.total_tax = s.simple_tax
+
+    return to_canton
+
+
+@stage("canton_multiplier")
+def _canton_multiplier(tariff: dict) -> Stage:
+    """LU: total = simple tax × canton-wide Steuereinheiten."""
+    multiplier = _dec(tariff.get("canton_multiplier", "4.2"))
+
+    def apply(s: PipelineState) -> None:
+        s.canton_share = s.total_tax = to_fixed_2(s.simple_tax * multiplier)
+        s.canton_multiplier = multiplier
+
+    return apply
+
+
+@stage("commune_surcharge")
+def _commune_surcharge(tariff: dict) -> Stage:
+    """FR: the commune levies a surcharge on the cantonal tax."""
+    rate = _dec(tariff.get("commune_surcharge_rate", 0))
+
+    def apply(s: PipelineState) -> None:
+        s.canton_share = s.simple_tax
+        s.commune_share = to_fixed_2(s.simple_tax * rate)
+        s.total_tax = s.canton_share + s.commune_share
+        s.extra["commune_surcharge"] = str(rate)
+
+    return apply
+
+
+def _steuerfuss_index(table: str) -> dict[tuple[int, str], dict[str, Decimal]]:
+    """``(year, Gemeinde) → {natPers, evangR, roemK, christK}`` as Decimals from a compiled store."""
+    store = load_steuerfuss_store(table)
+    return {
+        key: {column: store.value(*key, column) for column in ("natPers", "evangR", "roemK", "christK")}
+        for key in store.keys
+    }
+
+
+@stage("steuerfuss_shares", reads=("commune", "tax_year"))
+def _steuerfuss_shares(tariff: dict, table: str, canton: str) -> Stage:
+    """Canton and commune shares via ``roundUpTo005(simple × Steuerfuss / 100)``."""
+    index = _steuerfuss_index(table)
+
+    def bind(tax_year: int, commune: str) -> Stage:
+        commune_data = index.get((tax_year, commune))
+        kanton_data = index.get((tax_year, "Kanton"))
+        if commune_data is None or kanton_data is None:
+
+            def missing(s: PipelineState) -> None:
+                raise ValueError(f"No Steuerfuss data for commune '{commune}' / year {tax_year} in {canton}")
+
+            return missing
+
+        kanton_mult = kanton_data["natPers"]
+        commune_mult = commune_data["natPers"]
+
+        def apply(s: PipelineState) -> None:
+            s.canton_multiplier = kanton_mult
+            s.commune_multiplier = commune_mult
+            s.canton_share = compute_share(s.simple_tax, kanton_mult)
+            s.commune_share = compute_share(s.simple_tax, commune_mult)
+            s.total_tax = s.canton_share + s.commune_share
+
+        return apply
+
+    return CommuneStage(bind)
+
+
+@stage("church_tax", reads=("commune", "tax_year", "confessions"))
+def _church_tax(tariff: dict, table: str) -> Stage:
+    """Church tax per confession from the commune's rates, split by people."""
+    rates_by_commune = {
+        key: {"evangR": v["evangR"], "roemK": v["roemK"], "christK": v["christK"], "Andere": Decimal("0")}
+        for key, v in _steuerfuss_index(table).items()
+    }
+
+    def bind(tax_year: int, commune: str) -> Stage:
+        rates = rates_by_commune.get((tax_year, commune), {})
+
+        def apply(s: PipelineState) -> None:
+            s.church_total, s.church_breakdown = compute_church_tax(s.simple_tax, rates, s.inputs.confessions)
+            s.total_tax = s.total_tax + s.church_total
+
+        return apply
+
+    return CommuneStage(bind)
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+@stage("effective_rate")
+def _effective_rate(tariff: dict, of: str = "simple_tax", base: str = "taxable_gain") -> Stage:
+    """Effective rate in percent of ``simple_tax``/``total_tax`` over the reported or raw gain.
+
+    ``of: rate`` reports ``100 × rate`` for flat-rate cantons.
+    """
+    if of == "rate":
+
+        def of_rate(s: PipelineState) -> None:
+            s.effective_rate = Decimal("100") * s.rate
+
+        return of_rate
+
+    def ratio(s: PipelineState) -> None:
+        amount = s.total_tax if of == "total_tax" else s.simple_tax
+        gain = s.raw_gain if base == "raw_gain" else s.reported_gain
+        s.effective_rate = (Decimal("100") * amount / gain) if gain > 0 else Decimal("0")
+
+    return ratio
+
+
+# ---------------------------------------------------------------------------
+# Compilation
+# ---------------------------------------------------------------------------
+
+def _entries(tariff: dict) -> list[tuple[str, dict]]:
+    entries = []
+    for entry in tariff["pipeline"]:
+        if isinstance(entry, str):
+            entries.append((entry, {}))
+        else:
+            ((name, params),) = entry.items()
+            entries.append((name, params or {}))
+    return entries
+
+
+def compile_stages(tariff: dict) -> tuple[Stage, ...]:
+    """Compile a tariff's ``pipeline:`` declaration into a flat tuple of stage callables."""
+    stages = []
+    for name, params in _entries(tariff):
+        if name not in STAGES:
+            raise ValueError(f"Unknown pipeline stage '{name}'. Available: {sorted(STAGES)}")
+        if isinstance(params.get("tables"), list):
+            params = {**params, "tables": tuple(params["tables"])}
+        stages.append(STAGES[name](tariff, **params))
+    return tuple(stages)
+
+
+def first_readers(tariff: dict) -> dict[str, int]:
+    """Index of the first stage reading each of the :data:`LATE_FIELDS` (pipeline length if none does)."""
+    entries = _entries(tariff)
+    return {
+        field: next((i for i, (name, _) in enumerate(entries) if field in STAGE_READS.get(name, ())), len(entries))
+        for field in LATE_FIELDS
+    }
+
+
+# Tables whose entries must be strictly ascending in the given key (brackets,
+# non-overlapping holding buckets, tiers)
+_ORDERED_TABLES = {
+    "brackets": "limit",
+    "high_gain_brackets": "limit",
+    "surcharges": "max_months",
+    "surcharges_by_months": "max_months",
+    "surcharges_by_year": "year",
+    "discounts": "years",
+    "discounts_by_years": "years",
+    "rate_schedule": "max_years",
+    "rate_tiers": "up_to",
+}
+_YEAR_RATE_TABLES = ("rates_by_holding_years", "rates_not_self_used", "rates_self_used")
+_FRACTIONS = ("top_rate", "flat_rate", "base_rate", "floor_rate", "commune_surcharge_rate")
+_NON_NEGATIVE = ("minimum_taxable_gain", "minimum_tax", "freibetrag", "surcharge_threshold_months")
+
+
+def validate_tariff(tariff: dict) -> None:
+    """Check a raw tariff before compilation; ``ValueError`` lists every problem found.
+
+    Ordered tables (bracket limits, holding-period buckets, BL tiers) must be
+    strictly ascending, table and flat rates must lie in ``[0, 1]`` and
+    thresholds must not be negative.
+    """
+    problems: list[str] = []
+
+    def fraction(where: str, value: object) -> None:
+        try:
+            rate = _dec(value)
+        except ArithmeticError:
+            problems.append(f"{where}: {value!r} is not a number")
+            return
+        if not 0 <= rate <= 1:
+            problems.append(f"{where}: rate {value} outside [0, 1]")
+
+    if not isinstance(tariff.get("pipeline"), list) or not tariff["pipeline"]:
+        problems.append("pipeline: missing or empty")
+    else:
+        for name, params in _entries(tariff):
+            if name == "brackets" and len(tables := params.get("tables", ("brackets",))) > 1:
+                limits = [_dec(b["limit"]) for table in tables for b in tariff.get(table, [])]
+                if any(b <= a for a, b in zip(limits, limits[1:], strict=False)):
+                    problems.append(f"brackets stage: tables {list(tables)} overlap")
+    for table, key in _ORDERED_TABLES.items():
+        entries = tariff.get(table)
+        if entries is None:
+            continue
+        bounds = [_dec(entry[key]) for entry in entries]
+        if any(b <= a for a, b in zip(bounds, bounds[1:], strict=False)):
+            problems.append(f"{table}: '{key}' values must be strictly ascending, got {[str(b) for b in bounds]}")
+        for i, entry in enumerate(entries):
+            if "rate" in entry:
+                fraction(f"{table}[{i}]", entry["rate"])
+    for table in _YEAR_RATE_TABLES:
+        for year, rate in (tariff.get(table) or {}).items():
+            if int(year) < 1:
+                problems.append(f"{table}: holding year {year} must be at least 1")
+            fraction(f"{table}[{year}]", rate)
+    for key in _FRACTIONS:
+        if tariff.get(key) is not None:
+            fraction(key, tariff[key])
+    for key in _NON_NEGATIVE:
+        if tariff.get(key) is not None and _dec(tariff[key]) < 0:
+            problems.append(f"{key}: {tariff[key]} must not be negative")
+    if problems:
+        raise ValueError("Invalid tariff:\n  - " + "\n  - ".join(problems))
+
+
+@dataclass(frozen=True)
+class CompiledTariff:
+    """A validated tariff compiled into everything the engines run on.
+
+    Immutable and cached per canton by :func:`compiled_tariff`; ``compute``
+    only ever sees :attr:`stages` and the pre-parsed constants bound into
+    them.  :attr:`source` is a read-only view of the raw YAML for tooling
+    (fixed-point compilation, parity boundaries).
+    """
+
+    canton: str
+    stages: tuple[Stage, ...] = field(repr=False)
+    stage_names: tuple[str, ...]
+    first_readers: Mapping[str, int]
+    """Index of the first stage reading each of the :data:`LATE_FIELDS`."""
+    confessions: tuple[str, ...]
+    rate_tables: Mapping[bool, RateTable] = field(repr=False)
+    """Holding-period rate tables by *self-used*; empty without a ``holding_rate`` stage."""
+    source: Mapping[str, Any] = field(repr=False)
+
+
+def compile_tariff(tariff: dict, canton: str = "") -> CompiledTariff:
+    """Validate and compile a raw tariff (``ValueError`` naming *canton* if it is invalid)."""
+    try:
+        validate_tariff(tariff)
+        stages = compile_stages(tariff)
+    except ValueError as exc:
+        raise ValueError(f"{canton or 'Tariff'}: {exc}") from None
+    names = tuple(name for name, _ in _entries(tariff))
+    return CompiledTariff(
+        canton=canton,
+        stages=stages,
+        stage_names=names,
+        first_readers=MappingProxyType(first_readers(tariff)),
+        confessions=tuple(tariff.get("confessions", ())),
+        rate_tables=MappingProxyType(holding_rate_tables(tariff) if "holding_rate" in names else {}),
+        source=MappingProxyType(tariff),
+    )
+
+
+def compiled_tariff(canton_code: str) -> CompiledTariff:
+    """Load, validate and compile a canton's ``tariff.yaml`` once per process."""
+    return _compiled_tariff(canton_code.upper())
+
+
+@cache
+def _compiled_tariff(code: str) -> CompiledTariff:
+    return compile_tariff(load_tariff(code), code)
+
+
+@cache
+def compile_pipeline(canton_code: str) -> tuple[Mapping[str, Any], tuple[Stage, ...]]:
+    """``(tariff, stages)`` of a canton, from :func:`compiled_tariff`."""
+    compiled = compiled_tariff(canton_code)
+    return compiled.source, compiled.stages
+
+
+class Checkpoint:
+    """Pipeline states saved by a computation, attached to its result for :meth:`PipelineEngine.recompute`.
+
+    ``states[i]`` is the state in front of stage ``i`` (``i`` = pipeline
+    length: the final state); ``stopped`` is the stage that ended the
+    pipeline with a zero result.  A checkpoint is a cache, not part of the
+    result's value: it compares equal to any other (or none) and is dropped
+    when the result is pickled.
+    """
+
+    __slots__ = ("engine_cls", "inputs", "states", "stopped")
+
+    def __init__(
+        self, engine_cls: type, inputs: TaxInputs, states: dict[int, PipelineState], stopped: int | None,
+    ) -> None:
+        self.engine_cls = engine_cls
+        self.inputs = inputs
+        self.states = states
+        self.stopped = stopped
+
+    def __eq__(self, other: object) -> bool:
+        return other is None or isinstance(other, Checkpoint)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __reduce__(self):
+        return type(None), ()
+
+
+# ---------------------------------------------------------------------------
+# Engine base
+# ---------------------------------------------------------------------------
+
+class CommuneTax(NamedTuple):
+    """One row of :meth:`PipelineEngine.compute_all_communes`."""
+
+    commune: str
+    total_tax: Decimal
+    canton_share: Decimal
+    commune_share: Decimal
+    church_tax_total: Decimal
+    commune_multiplier_percent: Decimal
+
+
+class MarginalRate(NamedTuple):
+    """Result of :meth:`PipelineEngine.marginal`."""
+
+    marginal_rate_percent: Decimal
+    holding_months: int
+    next_holding_months: int | None
+    holding_delta: Decimal
+
+
+@cache
+def _fixed_point_engine(canton_code: str):
+    from grundstueckgewinnsteuer.engine.fixedpoint import FixedPointEngine  # imports this module
+
+    return FixedPointEngine(canton_code)
+
+
+class PipelineEngine(CantonEngine):
+    """Canton engine that runs the compiled ``pipeline:`` of its ``tariff.yaml``.
+
+    Subclasses provide ``canton_code``, ``canton_name``, the year list and
+    ``source_links``; communes come from the packaged commune index unless
+    overridden.
+    """
+
+    source_links: ClassVar[list[str]] = []
+
+    def __init__(self) -> None:
+        self._compiled = compiled_tariff(self.canton_code)
+        self._stages = self._compiled.stages
+        self._first_readers = self._compiled.first_readers
+
+    def get_communes(self, tax_year: int) -> list[str]:
+        return load_commune_index().communes(self.canton_code, tax_year)
+
+    def get_confessions(self) -> list[str]:
+        return list(self._compiled.confessions)
+
+    def compute(self, inputs: TaxInputs, *, checkpoint: bool = False) -> TaxResult:
+        """Compute the tax; with *checkpoint*, attach the states :meth:`recompute` resumes from."""
+        if checkpoint:
+            return _runner(type(self), inputs.tax_year, inputs.commune)(PipelineState(inputs), 0, {})
+        return self.specialize(inputs.tax_year, inputs.commune)(inputs)
+
+    def specialize(self, tax_year: int, commune: str) -> Callable[[TaxInputs], TaxResult]:
+        """Return a compute function for one ``(tax_year, commune)`` with all constants pre-bound.
+
+        Multipliers and confession rates are looked up once; the returned
+        function only runs the transaction-dependent arithmetic.  Functions
+        are cached per ``(engine class, tax_year, commune)`` across instances.
+        """
+        return _specialize(type(self), tax_year, commune)
+
+    def compute_all_communes(self, inputs: TaxInputs) -> list[CommuneTax]:
+        """The transaction's tax in every commune of ``inputs.tax_year``, cheapest first.
+
+        Stages before the first commune-dependent one (gain, rate, simple tax)
+        run once; only the Steuerfuss shares and church tax run per commune,
+        with that commune's pre-bound multipliers.  Every row equals the
+        corresponding fields of ``compute`` with ``commune`` replaced; ties
+        are ordered by name.
+        """
+        start = min(self._first_readers["commune"], self._first_readers["tax_year"])
+        s = PipelineState(inputs)
+        stopped = any(run_stage(s) for run_stage in self._stages[:start])
+        rows = []
+        for commune in self.get_communes(inputs.tax_year):
+            if stopped:
+                rows.append(CommuneTax(commune, *(Decimal("0"),) * 5))
+                continue
+            t = s.copy()
+            if any(run_stage(t) for run_stage in _bound_stages(type(self), inputs.tax_year, commune)[start:]):
+                rows.append(CommuneTax(commune, *(Decimal("0"),) * 5))
+                continue
+            rows.append(CommuneTax(
+                commune, t.total_tax, t.canton_share, t.commune_share, t.church_total, t.commune_multiplier,
+            ))
+        rows.sort(key=lambda row: (row.total_tax, row.commune))
+        return rows
+
+    def marginal(self, inputs: TaxInputs) -> MarginalRate:
+        """Marginal tax rate on the gain and the effect of holding until the next holding-period break.
+
+        ``marginal_rate_percent`` is the exact derivative of the total tax
+        with respect to the gain (e.g. via the sale price) just above the
+        current gain, before rounding – the top bracket rate times every
+        surcharge, discount and multiplier in effect.  It comes from the
+        structure of the canton's fixed-point model, not from differencing
+        repeated ``compute`` calls.  ``holding_delta`` is the change of
+        ``total_tax`` if the same sale happened at ``next_holding_months``,
+        the next holding period at which a surcharge, discount or rate
+        changes (``None`` and 0 when none is left).  All amounts must be
+        whole Rappen.
+        """
+        m = _fixed_point_engine(self.canton_code).marginal(inputs)
+        num, den = m.rate
+        total = m.result.to_decimals()["total_tax"]
+        delta = m.next_result.to_decimals()["total_tax"] - total if m.next_result is not None else Decimal("0")
+        return MarginalRate(Decimal(num * 100) / Decimal(den), m.result.holding_months, m.next_holding_months, delta)
+
+    def recompute(self, previous: TaxResult, changed_inputs: TaxInputs | Mapping[str, Any]) -> TaxResult:
+        """Result for edited inputs, re-running only the stages the edit invalidates.
+
+        *changed_inputs* is either the complete new ``TaxInputs`` or a mapping
+        of changed fields (``{"confessions": {"roemK": 2}}``).  Unchanged
+        stages are taken from *previous*'s checkpoint (see ``compute(...,
+        checkpoint=True)``): an edit of ``confessions`` re-runs church tax
+        only, one of ``commune`` or ``tax_year`` the Steuerfuss shares and
+        church tax; any other field – or a *previous* without checkpoint –
+        re-runs the pipeline.  The result is identical to ``compute`` on the
+        new inputs and carries a checkpoint itself, so edits can be chained.
+        """
+        checkpoint = previous._checkpoint
+        if isinstance(changed_inputs, Mapping):
+            if checkpoint is None:
+                raise ValueError(
+                    "The previous result carries no checkpoint; compute it with checkpoint=True "
+                    "or pass the complete new TaxInputs",
+                )
+            inputs = TaxInputs.model_validate({**checkpoint.inputs.model_dump(), **changed_inputs})
+        else:
+            inputs = changed_inputs
+        if checkpoint is None or checkpoint.engine_cls is not type(self):
+            return self.compute(inputs, checkpoint=True)
+
+        old = checkpoint.inputs
+        changed = [field for field in TaxInputs.model_fields if getattr(inputs, field) != getattr(old, field)]
+        if any(field not in LATE_FIELDS for field in changed):
+            return self.compute(inputs, checkpoint=True)
+        start = min((self._first_readers[field] for field in changed), default=len(self._stages))
+
+        if checkpoint.stopped is not None and checkpoint.stopped < start:
+            # The pipeline stopped before the edit matters: still a zero result
+            s = PipelineState(inputs)
+            result = zero_result(inputs, self.canton_code, self.canton_name, s.raw_gain, s.months)
+            result._checkpoint = Checkpoint(type(self), inputs, checkpoint.states, checkpoint.stopped)
+            return result
+        s = checkpoint.states[start].copy()
+        s.inputs = inputs
+        kept = {i: state for i, state in checkpoint.states.items() if i < start}
+        return _runner(type(self), inputs.tax_year, inputs.commune)(s, start, kept)
+
+
+SPECIALIZATION_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=SPECIALIZATION_CACHE_SIZE)
+def _specialize(engine_cls: type[PipelineEngine], tax_year: int, commune: str) -> Callable[[TaxInputs], TaxResult]:
+    run = _runner(engine_cls, tax_year, commune)
+
+    def compute(inputs: TaxInputs) -> TaxResult:
+        return run(PipelineState(inputs), 0, None)
+
+    return compute
+
+
+@lru_cache(maxsize=SPECIALIZATION_CACHE_SIZE)
+def _bound_stages(engine_cls: type[PipelineEngine], tax_year: int, commune: str) -> tuple[Stage, ...]:
+    return bind_stages(engine_cls()._stages, tax_year, commune)
+
+
+@lru_cache(maxsize=SPECIALIZATION_CACHE_SIZE)
+def _runner(engine_cls: type[PipelineEngine], tax_year: int, commune: str) -> Callable[..., TaxResult]:
+    """``run(state, start, states)``: the bound stages from *start* on.
+
+    With a *states* dict (``None``: no checkpoint), copies of the states in
+    front of the first readers are saved into it and attached to the result.
+    """
+    engine = engine_cls()
+    stages = _bound_stages(engine_cls, tax_year, commune)
+    saved = frozenset(engine._first_readers.values()) - {0, len(stages)}
+    code, name, links = engine.canton_code, engine.canton_name, tuple(engine.source_links)
+
+    def run(s: PipelineState, start: int, states: dict[int, PipelineState] | None) -> TaxResult:
+        inputs = s.inputs
+        for i, run_stage in enumerate(stages[start:], start):
+            if states is not None and i in saved:
+                states[i] = s.copy()
+            if run_stage(s):
+                result = zero_result(inputs, code, name, s.raw_gain, s.months)
+                if states is not None:
+                    result._checkpoint = Checkpoint(engine_cls, inputs, states, i)
+                return result
+        if states is not None:
+            states[len(stages)] = s.copy()
+
+        result = TaxResult(
+            taxable_gain=s.reported_gain,
+            simple_tax=s.simple_tax,
+            canton_share=s.canton_share,
+            commune_share=s.commune_share,
+            church_tax_total=s.church_total,
+            church_tax_breakdown=s.church_breakdown,
+            total_tax=s.total_tax,
+            holding_months=s.months,
+            holding_years=s.years,
+            brackets_applied=s.steps,
+            flat_rate_amount=s.flat_amount,
+            flat_rate_tax=s.flat_tax,
+            surcharge_rate=s.surcharge_rate,
+            discount_rate=s.discount_rate,
+            simple_tax_before_adjustments=s.before_adjustments,
+            effective_tax_rate_percent=s.effective_rate,
+            canton_multiplier_percent=s.canton_multiplier,
+            commune_multiplier_percent=s.commune_multiplier,
+            metadata=ResultMetadata(
+                canton=code,
+                canton_name=name,
+                commune=inputs.commune,
+                tax_year=inputs.tax_year,
+                engine_version=ENGINE_VERSION,
+                source_links=list(links),
+            ),
+            extra=s.extra,
+        )
+        if states is not None:
+            result._checkpoint = Checkpoint(engine_cls, inputs, states, None)
+        return result
+
+    return run
+
+
+def zero_result(inputs: TaxInputs, canton: str, canton_name: str, gain: Decimal, months: int) -> TaxResult:
+    """Result for a gain that is not taxed (non-positive, below a minimum, or fully exempt)."""
+    return TaxResult(
+        taxable_gain=gain,
+        simple_tax=Decimal("0"),
+        canton_share=Decimal("0"),
+        commune_share=Decimal("0"),
+        church_tax_total=Decimal("0"),
+        total_tax=Decimal("0"),
+        holding_months=months,
+        holding_years=months // 12,
+        metadata=ResultMetadata(
+            canton=canton, canton_name=canton_name, commune=inputs.commune, tax_year=inputs.tax_year,
+        ),
+    )
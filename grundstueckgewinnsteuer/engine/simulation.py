@@ -0,0 +1,221 @@
+"""Monte Carlo simulation of sale outcomes (requires the optional ``batch`` extra).
+
+:func:`simulate` draws sale prices and holding periods for one property and
+evaluates every draw with the vectorized canton kernels of
+:mod:`grundstueckgewinnsteuer.engine.batch` – the same integer-Rappen
+models as the engines, so each draw's tax equals ``compute`` on that sale.
+Draws are generated and evaluated in chunks of ``chunk_size``, so the
+kernels' intermediate arrays stay bounded; only the two ``int64`` result
+columns (16 bytes per draw) are kept.
+
+Sale price and holding months are each given as
+
+- a scalar (the same value in every draw),
+- an array of samples, used in order (its length is the number of draws), or
+- a distribution: a callable ``(rng, size) → array`` drawing from the
+  ``numpy.random.Generator`` it is passed, e.g.
+  ``lambda rng, n: rng.normal(1_000_000, 50_000, n)``.
+
+Prices are rounded to the Rappen and months to whole months.  With the
+same ``seed`` and ``chunk_size`` the draws – and therefore every result –
+are identical.
+
+Usage::
+
+    sim = simulate(
+        inputs,
+        sale_price=lambda rng, n: rng.lognormal(np.log(1_000_000), 0.1, n),
+        holding_months=lambda rng, n: rng.integers(60, 121, n),
+        seed=42,
+    )
+    sim.quantiles()["total_tax"][0.95]      # Decimal CHF
+    counts, edges = sim.histogram("net_proceeds", bins=40)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from decimal import Decimal
+
+import numpy as np
+
+from grundstueckgewinnsteuer.engine.batch import _KERNELS, _model, _mul, _round_half_even, _Rows
+from grundstueckgewinnsteuer.engine.fixedpoint import _RAPPEN, RATE_SCALE, _Schaffhausen, rappen_to_decimal, to_rappen
+from grundstueckgewinnsteuer.engine.kernel import months_between
+from grundstueckgewinnsteuer.models import TaxInputs
+
+DRAWS = 10_000
+CHUNK_SIZE = 65_536
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+COLUMNS = ("total_tax", "net_proceeds")
+
+Distribution = Callable[[np.random.Generator, int], np.ndarray]
+
+
+# ---------------------------------------------------------------------------
+# Result
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Simulation:
+    """Per-draw outcomes of :func:`simulate` as ``int64`` Rappen arrays.
+
+    ``net_proceeds`` is the sale price minus selling costs and total tax.
+    """
+
+    total_tax: np.ndarray
+    net_proceeds: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.total_tax)
+
+    def _column(self, column: str) -> np.ndarray:
+        if column not in COLUMNS:
+            raise KeyError(f"Unknown column '{column}'. Available: {list(COLUMNS)}")
+        return getattr(self, column)
+
+    def quantiles(self, q: tuple[float, ...] = QUANTILES) -> dict[str, dict[float, Decimal]]:
+        """``column → {q → CHF}``; every quantile is one of the drawn values (inverted CDF)."""
+        return {
+            column: dict(zip(q, map(rappen_to_decimal, values.tolist()), strict=True))
+            for column in COLUMNS
+            for values in [np.quantile(self._column(column), q, method="inverted_cdf").astype(np.int64)]
+        }
+
+    def mean(self, column: str = "total_tax") -> Decimal:
+        """Mean of *column* in CHF."""
+        values = self._column(column)
+        return rappen_to_decimal(int(values.sum(dtype=object))) / len(values)
+
+    def histogram(self, column: str = "total_tax", bins: int = 50) -> tuple[np.ndarray, np.ndarray]:
+        """``(counts, edges)`` of *column* with *bins* equal-width bins; edges in CHF (``float64``)."""
+        counts, edges = np.histogram(self._column(column), bins=bins)
+        return counts, edges / _RAPPEN
+
+
+# ---------------------------------------------------------------------------
+# Sampling
+# ---------------------------------------------------------------------------
+
+def _sampler(spec, name: str) -> tuple[Callable[[np.random.Generator, int, int], np.ndarray], int | None]:
+    """``draw(rng, start, stop)`` for a scalar, sample array or distribution, and the sample count."""
+    if callable(spec):
+        return lambda rng, start, stop: np.asarray(spec(rng, stop - start)), None
+    samples = np.asarray(spec)
+    if samples.ndim == 0:
+        return lambda rng, start, stop: np.full(stop - start, samples), None
+    if samples.ndim != 1 or not len(samples):
+        raise ValueError(f"{name} samples must be a non-empty one-dimensional array")
+    return lambda rng, start, stop: samples[start:stop], len(samples)
+
+
+def _draw_count(draws: int | None, counts: list[int]) -> int:
+    if len(set(counts)) > 1:
+        raise ValueError(f"Sample arrays differ in length: {counts}")
+    if counts and draws is not None and draws != counts[0]:
+        raise ValueError(f"draws={draws} does not match the {counts[0]} samples given")
+    n = counts[0] if counts else DRAWS if draws is None else draws
+    if n <= 0:
+        raise ValueError("draws must be positive")
+    return n
+
+
+# ---------------------------------------------------------------------------
+# Simulation
+# ---------------------------------------------------------------------------
+
+def simulate(
+    inputs: TaxInputs,
+    sale_price: float | np.ndarray | Distribution,
+    holding_months: int | np.ndarray | Distribution | None = None,
+    *,
+    draws: int | None = None,
+    seed: int | np.random.SeedSequence | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Simulation:
+    """Simulate the tax and net proceeds of one property over random sale outcomes.
+
+    Parameters
+    ----------
+    inputs:
+        The property; everything except the sale price and sale date is
+        taken from it (confessions included).
+    sale_price:
+        CHF scalar, sample array or distribution (see the module docstring).
+    holding_months:
+        Scalar, sample array or distribution; defaults to the holding
+        period of *inputs*.
+    draws:
+        Number of draws; defaults to the sample array length, else
+        :data:`DRAWS`.
+    seed:
+        Seed of the ``numpy.random.Generator`` passed to distributions.
+    chunk_size:
+        Draws evaluated per kernel call.
+
+    Returns
+    -------
+    Simulation
+        One ``int64`` Rappen entry per draw.  Church tax (SH) is rounded
+        half-even to the Rappen per draw, as in
+        :func:`~grundstueckgewinnsteuer.engine.batch.share_grid`; BS is
+        evaluated with the not-self-used rates, as in
+        :func:`~grundstueckgewinnsteuer.engine.batch.compute_table`.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    if holding_months is None:
+        holding_months = months_between(inputs.purchase_date, inputs.sale_date)
+    draw_price, price_count = _sampler(sale_price, "sale_price")
+    draw_months, months_count = _sampler(holding_months, "holding_months")
+    n = _draw_count(draws, [count for count in (price_count, months_count) if count is not None])
+
+    canton = inputs.canton.upper()
+    model = _model(canton)
+    kernel = _KERNELS[type(model)]
+    purchase = to_rappen(inputs.purchase_price)
+    acquisition, selling = to_rappen(inputs.acquisition_costs), to_rappen(inputs.selling_costs)
+    investments = to_rappen(inputs.total_investments)
+    cost = purchase + acquisition + investments
+    church_weight, people = _church_weight(model, inputs)
+
+    rng = np.random.default_rng(seed)
+    total_tax = np.empty(n, dtype=np.int64)
+    net_proceeds = np.empty(n, dtype=np.int64)
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        price = _to_rappen(draw_price(rng, start, stop))
+        months = np.rint(draw_months(rng, start, stop)).astype(np.int64)
+        size = stop - start
+        rows = _Rows(
+            price - cost - selling,
+            months,
+            np.full(size, cost, dtype=np.int64),
+            np.full(size, inputs.commune, dtype=object),
+            np.full(size, inputs.tax_year, dtype=np.int64),
+        )
+        kernel(model, rows)
+        tax = rows.canton_share + rows.commune_share
+        if people:
+            tax = tax + _round_half_even(_mul(rows.simple_tax, church_weight), RATE_SCALE * 100 * people)
+        total_tax[start:stop] = tax
+        net_proceeds[start:stop] = price - selling - tax
+    return Simulation(total_tax, net_proceeds)
+
+
+def _to_rappen(chf: np.ndarray) -> np.ndarray:
+    chf = np.asarray(chf)
+    if chf.dtype.kind in "iu":
+        return chf.astype(np.int64) * _RAPPEN
+    return np.rint(chf.astype(np.float64) * _RAPPEN).astype(np.int64)
+
+
+def _church_weight(model, inputs: TaxInputs) -> tuple[int, int]:
+    """``Σ church rate × people`` of the commune (scaled percent) and the number of people."""
+    people = sum(inputs.confessions.values())
+    if not people or not isinstance(model, _Schaffhausen):
+        return 0, 0
+    row, _ = model.rows(inputs.commune, inputs.tax_year)
+    columns = model.steuerfuesse.columns
+    return sum(columns[key][row] * count for key, count in inputs.confessions.items() if key in columns), people
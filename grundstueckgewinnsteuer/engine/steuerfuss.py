@@ -0,0 +1,206 @@
+"""Compiled, memory-mapped Steuerfuss store.
+
+The source of truth per canton is ``data/communes/<code>/steuerfuesse.json``
+(or ``.yaml``): ``year → [{"Gemeinde": …, "natPers": …, <confession>: …}]``
+with the canton's own row named ``"Kanton"``.  It is compiled into a
+compact binary file next to it (``steuerfuesse.bin``) that is opened with
+``mmap`` – the multipliers are never parsed, and every process mapping the
+file shares the same pages.
+
+Layout (little-endian, sections 8-byte aligned)::
+
+    header   magic "GGSF", version u32, scale u64, rows u32, columns u32, names u32, strings u32
+    strings  column names then commune names, UTF-8, NUL-separated
+    years    int64[rows]
+    names    int64[rows]                   index into the commune names
+    values   int64[rows] per column        multiplier × scale; missing → 0
+
+Recompile after editing a source::
+
+    python -m grundstueckgewinnsteuer.engine.steuerfuss            # every canton
+    python -m grundstueckgewinnsteuer.engine.steuerfuss path/to/steuerfuesse.json
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import sys
+from decimal import Decimal
+from functools import cache, cached_property
+from pathlib import Path
+
+_DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+MAGIC = b"GGSF"
+VERSION = 1
+SCALE = 10**6
+"""Multipliers are stored as integers scaled by this factor (same as ``fixedpoint.RATE_SCALE``)."""
+
+_HEADER = struct.Struct("<4sIQIIII")
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+# ---------------------------------------------------------------------------
+# Compilation
+# ---------------------------------------------------------------------------
+
+def read_source(path: str | Path) -> dict:
+    """Load a ``steuerfuesse`` source file (``.json``, ``.yaml`` or ``.yml``)."""
+    path = Path(path)
+    with open(path, encoding="utf-8") as f:
+        if path.suffix in (".yaml", ".yml"):
+            import yaml  # compile time only: the kernel opens stores without yaml
+
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def _scaled(value: object) -> int:
+    scaled = Decimal(str(value)) * SCALE
+    if scaled != scaled.to_integral_value():
+        raise ValueError(f"Steuerfuss {value} has more than six decimal places")
+    return int(scaled)
+
+
+def compile_steuerfuesse(source: dict) -> bytes:
+    """Compile a ``year → [entry]`` mapping into the binary store format."""
+    rows = [(int(year), entry) for year, entries in source.items() for entry in entries]
+    columns = list(dict.fromkeys(key for _, entry in rows for key in entry if key != "Gemeinde"))
+    names = list(dict.fromkeys(entry["Gemeinde"] for _, entry in rows))
+    name_ids = {name: i for i, name in enumerate(names)}
+    if len({(year, entry["Gemeinde"]) for year, entry in rows}) != len(rows):
+        raise ValueError("Duplicate (year, Gemeinde) row in Steuerfuss source")
+
+    strings = "\0".join(columns + names).encode("utf-8")
+    int64 = struct.Struct(f"<{len(rows)}q")
+    sections = [
+        int64.pack(*(year for year, _ in rows)),
+        int64.pack(*(name_ids[entry["Gemeinde"]] for _, entry in rows)),
+        *(int64.pack(*(_scaled(entry.get(column, 0)) for _, entry in rows)) for column in columns),
+    ]
+    out = bytearray(_HEADER.pack(MAGIC, VERSION, SCALE, len(rows), len(columns), len(names), len(strings)))
+    out += strings
+    out += bytes(_align(len(out)) - len(out))
+    for section in sections:
+        out += section
+    return bytes(out)
+
+
+def compile_file(source: str | Path, target: str | Path | None = None) -> Path:
+    """Compile *source* into *target* (default: ``.bin`` next to the source); returns the target."""
+    source = Path(source)
+    target = Path(target) if target is not None else source.with_suffix(".bin")
+    target.write_bytes(compile_steuerfuesse(read_source(source)))
+    return target
+
+
+def source_files() -> list[Path]:
+    """Every packaged Steuerfuss source below ``data/communes/``."""
+    return sorted(
+        path for path in (_DATA_DIR / "communes").glob("*/steuerfuesse.*") if path.suffix in (".json", ".yaml", ".yml")
+    )
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+class SteuerfussStore:
+    """Read-only view of a compiled Steuerfuss file.
+
+    Rows are ``(tax_year, commune)`` in source order; :meth:`column` returns
+    the multipliers of one column as a zero-copy ``memoryview`` of
+    ``int64`` scaled by :attr:`scale`.  Names and the row index are decoded
+    on first use.
+    """
+
+    def __init__(self, buffer) -> None:
+        view = memoryview(buffer)
+        magic, version, self.scale, self._rows, n_columns, self._n_names, strings = _HEADER.unpack_from(view)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a compiled Steuerfuss store (or an incompatible version)")
+        self._strings = view[_HEADER.size:_HEADER.size + strings]
+        self._n_columns = n_columns
+        offset = _align(_HEADER.size + strings)
+        size = 8 * self._rows
+        sections = [view[offset + i * size:offset + (i + 1) * size].cast("q") for i in range(2 + n_columns)]
+        self._years, self._name_ids, *self._values = sections
+
+    @classmethod
+    def open(cls, path: str | Path) -> SteuerfussStore:
+        """Map the compiled file at *path* for the lifetime of the store."""
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @cached_property
+    def _decoded(self) -> tuple[tuple[str, ...], tuple[str, ...]]:
+        strings = bytes(self._strings).decode("utf-8").split("\0")
+        return tuple(strings[:self._n_columns]), tuple(strings[self._n_columns:])
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return self._decoded[0]
+
+    @cached_property
+    def keys(self) -> list[tuple[int, str]]:
+        """``(tax_year, commune)`` of every row."""
+        names = self._decoded[1]
+        return [(year, names[i]) for year, i in zip(self._years, self._name_ids, strict=True)]
+
+    @cached_property
+    def index(self) -> dict[tuple[int, str], int]:
+        """``(tax_year, commune) → row``."""
+        return {key: row for row, key in enumerate(self.keys)}
+
+    @cached_property
+    def years(self) -> list[int]:
+        return sorted(set(self._years))
+
+    def communes(self, tax_year: int) -> list[str]:
+        """Names with a row in *tax_year*, in source order (including ``"Kanton"``)."""
+        return [name for year, name in self.keys if year == tax_year]
+
+    def column(self, name: str) -> memoryview:
+        """Scaled ``int64`` multipliers of column *name*, one per row."""
+        try:
+            return self._values[self.columns.index(name)]
+        except ValueError:
+            raise KeyError(f"No Steuerfuss column '{name}'") from None
+
+    def value(self, tax_year: int, commune: str, column: str) -> Decimal:
+        """One multiplier as the shortest exact ``Decimal`` (``"12.5"``, ``"102"``); missing columns are 0."""
+        row = self.index[(tax_year, commune)]
+        if column not in self.columns:
+            return Decimal(0)
+        return to_decimal(self.column(column)[row], self.scale)
+
+    def __len__(self) -> int:
+        return self._rows
+
+
+def to_decimal(scaled: int, scale: int = SCALE) -> Decimal:
+    """Scaled integer → shortest exact ``Decimal`` (``102000000`` → ``102``, ``12500000`` → ``12.5``)."""
+    whole, rest = divmod(scaled, scale)
+    if not rest:
+        return Decimal(whole)
+    return (Decimal(scaled) / scale).normalize()
+
+
+@cache
+def load_steuerfuss_store(relative_path: str) -> SteuerfussStore:
+    """Open (once per process) a compiled store below ``data/``, e.g. ``communes/sh/steuerfuesse.bin``."""
+    return SteuerfussStore.open(_DATA_DIR / relative_path)
+
+
+def main(argv: list[str] | None = None) -> None:
+    for source in (argv if argv else source_files()):
+        print(compile_file(source))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -38,6 +38,38 @@ class DiscountEntry:
     rate: Decimal
 
 
+@dataclass(frozen=True)
+class RateTable:
+    """Flat rate by completed holding years, dense and pre-parsed.
+
+    ``rates[y]`` applies after ``y`` completed years; negative holdings use
+    ``rates[0]`` and longer ones the last entry, so a lookup is one clamped
+    index.
+    """
+
+    rates: tuple[Decimal, ...]
+
+    def rate(self, years: int) -> Decimal:
+        return self.rates[min(max(years, 0), len(self.rates) - 1)]
+
+    @classmethod
+    def from_schedule(cls, schedule: list[dict], floor_rate: object) -> RateTable:
+        """``rate_schedule`` entries: the first with ``years < max_years``, else *floor_rate*."""
+        entries = [(e["max_years"], Decimal(str(e["rate"]))) for e in schedule]
+        floor = Decimal(str(floor_rate))
+        top = max((max_years for max_years, _ in entries), default=0)
+        return cls(tuple(next((r for m, r in entries if y < m), floor) for y in range(top + 1)))
+
+    @classmethod
+    def from_years(
+        cls, rates: dict, min_rate: object, last: int = 25, below_one: Decimal = Decimal("0.40"),
+    ) -> RateTable:
+        """Year-keyed rates (AG, BS): the year-1 rate below one year, *min_rate* for gaps and after *last*."""
+        by_year = {int(k): Decimal(str(v)) for k, v in rates.items()}
+        floor = Decimal(str(min_rate))
+        return cls((by_year.get(1, below_one), *(by_year.get(y, floor) for y in range(1, last + 1)), floor))
+
+
 # ---------------------------------------------------------------------------
 # Progressive bracket evaluator
 # ---------------------------------------------------------------------------
@@ -0,0 +1,155 @@
+"""Streaming Parquet / Arrow IPC writer for computation results.
+
+Requires the optional ``arrow`` extra (``pip install grundstueckgewinnsteuer-ch[arrow]``).
+
+Results are buffered only up to ``row_group_size`` rows and then written
+as one row group (Parquet) or record batch (Arrow IPC stream), so memory
+stays flat however many results are written.  Money columns are
+``decimal128(18, 2)`` CHF; ``canton`` and ``commune`` are dictionary
+encoded.
+
+Usage::
+
+    with ResultWriter("results.parquet") as writer:
+        for inputs in stream:
+            writer.write(engine.compute(inputs))      # TaxResult
+        writer.write_batch(compute_table(df))         # BatchResult
+"""
+
+from __future__ import annotations
+
+from decimal import ROUND_HALF_EVEN, Decimal
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from grundstueckgewinnsteuer.engine.batch import MONEY_COLUMNS, RESULT_COLUMNS, BatchResult, rappen_to_decimal128
+from grundstueckgewinnsteuer.models import TaxResult
+
+MONEY_TYPE = pa.decimal128(18, 2)
+
+RESULT_SCHEMA = pa.schema([
+    ("canton", pa.dictionary(pa.int8(), pa.string())),
+    ("commune", pa.dictionary(pa.int32(), pa.string())),
+    ("tax_year", pa.int16()),
+    *[(name, MONEY_TYPE) for name in MONEY_COLUMNS],
+    ("holding_months", pa.int32()),
+    ("holding_years", pa.int16()),
+])
+"""Schema of every written file; column order is :data:`~grundstueckgewinnsteuer.engine.batch.RESULT_COLUMNS`."""
+
+DEFAULT_ROW_GROUP_SIZE = 64 * 1024
+
+
+def _dictionary(values: np.ndarray, index_type: pa.DataType) -> pa.DictionaryArray:
+    uniques, indices = np.unique(np.asarray(values).astype(str), return_inverse=True)
+    return pa.DictionaryArray.from_arrays(
+        pa.array(indices.reshape(-1), type=index_type), pa.array(uniques.tolist(), type=pa.string()),
+    )
+
+
+def to_record_batch(columns: dict[str, np.ndarray]) -> pa.RecordBatch:
+    """Build a :data:`RESULT_SCHEMA` record batch from columns with ``int64`` Rappen money."""
+    arrays = []
+    for field in RESULT_SCHEMA:
+        values = columns[field.name]
+        if pa.types.is_dictionary(field.type):
+            arrays.append(_dictionary(values, field.type.index_type))
+        elif field.name in MONEY_COLUMNS:
+            arrays.append(rappen_to_decimal128(values, MONEY_TYPE.precision))
+        else:
+            arrays.append(pa.array(np.asarray(values), type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=RESULT_SCHEMA)
+
+
+def _rappen(amount: Decimal) -> int:
+    """CHF → Rappen; church-tax splits with more places are rounded half-even."""
+    return int((amount * 100).to_integral_value(ROUND_HALF_EVEN))
+
+
+class ResultWriter:
+    """Incremental writer of results to a Parquet file or an Arrow IPC stream.
+
+    Parameters
+    ----------
+    sink:
+        Path or writable binary file object.
+    format:
+        ``"parquet"`` (default) or ``"arrow"`` (IPC stream format).
+    row_group_size:
+        Rows per row group / record batch; also the maximum number of
+        buffered ``TaxResult`` rows.
+    compression:
+        Parquet compression codec.
+    """
+
+    def __init__(
+        self,
+        sink,
+        *,
+        format: str = "parquet",
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: str = "zstd",
+    ) -> None:
+        if format == "parquet":
+            self._writer = pq.ParquetWriter(sink, RESULT_SCHEMA, compression=compression)
+        elif format == "arrow":
+            self._writer = pa.ipc.new_stream(sink, RESULT_SCHEMA)
+        else:
+            raise ValueError(f"Unknown format '{format}' (expected 'parquet' or 'arrow')")
+        if row_group_size < 1:
+            raise ValueError("row_group_size must be positive")
+        self.row_group_size = row_group_size
+        self.rows_written = 0
+        self._buffer: dict[str, list] = {name: [] for name in RESULT_COLUMNS}
+
+    # -- writing -------------------------------------------------------------
+
+    def write(self, result: TaxResult) -> None:
+        """Buffer one ``TaxResult``; a row group is written once the buffer is full."""
+        buffer = self._buffer
+        buffer["canton"].append(result.metadata.canton)
+        buffer["commune"].append(result.metadata.commune)
+        buffer["tax_year"].append(result.metadata.tax_year)
+        for name in MONEY_COLUMNS:
+            buffer[name].append(_rappen(getattr(result, name)))
+        buffer["holding_months"].append(result.holding_months)
+        buffer["holding_years"].append(result.holding_years)
+        if len(buffer["canton"]) >= self.row_group_size:
+            self.flush()
+
+    def write_batch(self, batch: BatchResult) -> None:
+        """Write a columnar :class:`~grundstueckgewinnsteuer.engine.batch.BatchResult` in row-group slices."""
+        self.flush()
+        for start in range(0, len(batch), self.row_group_size):
+            end = start + self.row_group_size
+            self._write({name: values[start:end] for name, values in batch.columns.items()})
+
+    def flush(self) -> None:
+        """Write buffered ``TaxResult`` rows (if any) as one row group."""
+        if not self._buffer["canton"]:
+            return
+        columns = {
+            name: np.array(values, dtype=object if name in ("canton", "commune") else np.int64)
+            for name, values in self._buffer.items()
+        }
+        self._buffer = {name: [] for name in RESULT_COLUMNS}
+        self._write(columns)
+
+    def _write(self, columns: dict[str, np.ndarray]) -> None:
+        record_batch = to_record_batch(columns)
+        self._writer.write_batch(record_batch)
+        self.rows_written += record_batch.num_rows
+
+    # -- lifecycle -----------------------------------------------------------
+
+    def close(self) -> None:
+        self.flush()
+        self._writer.close()
+
+    def __enter__(self) -> ResultWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
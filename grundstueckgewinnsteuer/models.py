@@ -8,7 +8,7 @@ from decimal import Decimal
 from enum import Enum
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 # ---------------------------------------------------------------------------
@@ -138,3 +138,6 @@ class TaxResult(BaseModel):
 
     # Arbitrary extra info from canton engines
     extra: dict[str, Any] = Field(default_factory=dict)
+
+    # Pipeline checkpoint for incremental recomputation (not part of the value, never serialized)
+    _checkpoint: Any = PrivateAttr(default=None)
@@ -0,0 +1,330 @@
+"""Randomized parity corpora for the TypeScript engine (requires the ``batch`` extra).
+
+Generates stratified random transactions for every canton, computes the
+expected results through the vectorized batch path
+(:func:`~grundstueckgewinnsteuer.engine.batch.compute_table`) and writes
+them as sharded, gzip-compressed JSON Lines – one fixture per line, in the
+``ParityFixture`` shape of ``grundstueckgewinnsteuer-web/tests/fixtures/parity.json`` –
+plus a ``manifest.json`` listing the shards.
+``grundstueckgewinnsteuer-web/scripts/parity.ts`` streams such a directory.
+
+Inputs are concentrated where engines tend to disagree:
+
+* taxable gains at and a few Rappen around every gain threshold of the
+  canton's ``tariff.yaml`` (bracket limits, minimum gain, flat-rate and
+  discount thresholds, Freibetrag),
+* holding periods at and one month around every month / year boundary of
+  its surcharge and discount schedules,
+* losses, zero gains and log-uniform gains up to CHF 30 million.
+
+In cantons that levy church tax (SH) about half of the cases carry
+confessions; their church tax is rounded half-even to the Rappen, as in
+:func:`~grundstueckgewinnsteuer.engine.batch.share_grid`.
+``scripts/parity.ts`` computes every fixture with the web engine and
+compares all expected fields.
+
+Usage::
+
+    python -m grundstueckgewinnsteuer.parity out/ --cases 1000000 --seed 7
+    npx tsx scripts/parity.ts out/
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+from collections.abc import Iterator
+from decimal import Decimal
+from functools import cache, partial
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+
+from grundstueckgewinnsteuer.cantons.registry import available_cantons, get_engine
+from grundstueckgewinnsteuer.engine.batch import compute_table, multiplier_matrix
+from grundstueckgewinnsteuer.engine.fixedpoint import RATE_SCALE
+from grundstueckgewinnsteuer.engine.kernel import round_half_even
+from grundstueckgewinnsteuer.engine.pipeline import ENGINE_VERSION, load_tariff
+
+DEFAULT_SHARD_SIZE = 100_000
+
+_GAIN_KEYS = frozenset({
+    "limit", "up_to", "minimum_taxable_gain", "max_rate_above", "flat_rate_threshold",
+    "discount_gain_threshold", "freibetrag",
+})
+_MONTH_KEYS = frozenset({"max_months", "surcharge_threshold_months"})
+_YEAR_KEYS = frozenset({
+    "years", "year", "max_years", "discount_min_years", "min_rate_after_years", "gain_reduction_start_year",
+    "max_rate_reduction_start_year", "self_use_discount_start_year",
+})
+
+# Offsets (Rappen) sampled around each gain threshold
+_GAIN_OFFSETS = np.array([-100, -5, -1, 0, 1, 5, 100], dtype=np.int64)
+
+
+# ---------------------------------------------------------------------------
+# Boundaries
+# ---------------------------------------------------------------------------
+
+def tariff_boundaries(code: str) -> tuple[list[int], list[int]]:
+    """Gain thresholds (Rappen) and holding-period boundaries (months) of a canton's tariff."""
+    gains: set[int] = set()
+    months: set[int] = {0, 12}
+
+    def walk(node) -> None:
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if isinstance(value, int | float) and not isinstance(value, bool):
+                    if key in _GAIN_KEYS:
+                        gains.add(int(Decimal(str(value)) * 100))
+                    elif key in _MONTH_KEYS:
+                        months.add(int(value))
+                    elif key in _YEAR_KEYS:
+                        months.add(12 * int(value))
+                walk(value)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+
+    walk(load_tariff(code))
+    return sorted(g for g in gains if g > 0), sorted(months)
+
+
+@cache
+def _church_confessions(code: str) -> list[str]:
+    """Confessions of canton *code* if it levies church tax, else ``[]``."""
+    try:
+        matrix = multiplier_matrix(code)
+    except ValueError:
+        return []
+    if not any(rates.any() for rates in matrix.church.values()):
+        return []
+    return get_engine(code).get_confessions()
+
+
+# ---------------------------------------------------------------------------
+# Generation
+# ---------------------------------------------------------------------------
+
+def generate_cases(code: str, n: int, rng: np.random.Generator) -> dict[str, np.ndarray]:
+    """*n* stratified random transactions of canton *code* as :func:`compute_table` input columns."""
+    engine = get_engine(code)
+    gain_edges, month_edges = tariff_boundaries(code)
+
+    stratum = rng.random(n)
+    gain = np.rint(10 ** rng.uniform(0, 7.5, n) * 100).astype(np.int64)
+    whole = rng.random(n) < 0.5
+    gain[whole] -= gain[whole] % 100
+    losses = (stratum >= 0.4) & (stratum < 0.45)
+    gain[losses] = rng.integers(-5_000_000, 1, losses.sum())
+    if gain_edges:
+        at_edge = stratum < 0.4
+        gain[at_edge] = (
+            np.array(gain_edges, dtype=np.int64)[rng.integers(0, len(gain_edges), at_edge.sum())]
+            + rng.choice(_GAIN_OFFSETS, at_edge.sum())
+        )
+
+    months = rng.integers(0, 481, n)
+    at_month_edge = rng.random(n) < 0.5
+    months[at_month_edge] = np.maximum(
+        np.array(month_edges)[rng.integers(0, len(month_edges), at_month_edge.sum())]
+        + rng.integers(-1, 2, at_month_edge.sum()),
+        0,
+    )
+
+    purchase_month = rng.integers(0, 45 * 12, n).astype("datetime64[M]")
+    day = rng.integers(0, 28, n).astype("timedelta64[D]")
+    purchase_date = purchase_month.astype("datetime64[D]") + day
+    sale_date = (purchase_month + months.astype("timedelta64[M]")).astype("datetime64[D]") + day
+
+    purchase = rng.integers(50_000, 2_000_000, n) * 100
+    acquisition = rng.integers(0, 2_000_000, n)
+    selling = np.where(rng.random(n) < 0.3, rng.integers(0, 5_000_000, n), 0)
+    investments = np.where(rng.random(n) < 0.3, rng.integers(1, 300_000, n) * 100, 0)
+    sale = purchase + acquisition + selling + investments + gain
+
+    years = engine.get_available_years()
+    tax_year = np.array(years)[rng.integers(0, len(years), n)]
+    commune = np.empty(n, dtype=object)
+    for year in years:
+        rows = tax_year == year
+        names = np.array(engine.get_communes(year), dtype=object)
+        commune[rows] = names[rng.integers(0, len(names), rows.sum())]
+
+    confessions = np.empty(n, dtype=object)
+    confessions[:] = [{}] * n
+    keys = _church_confessions(code)
+    if keys:
+        counts = rng.integers(0, 3, (n, len(keys)))
+        counts[rng.random(n) < 0.5] = 0
+        confessions[:] = [
+            {key: count for key, count in zip(keys, row, strict=True) if count} for row in counts.tolist()
+        ]
+
+    def chf(rappen: np.ndarray) -> np.ndarray:
+        return rappen / 100
+
+    return {
+        "canton": np.full(n, code, dtype=object),
+        "commune": commune,
+        "tax_year": tax_year,
+        "purchase_date": purchase_date,
+        "sale_date": sale_date,
+        "purchase_price": chf(purchase),
+        "sale_price": chf(sale),
+        "acquisition_costs": chf(acquisition),
+        "selling_costs": chf(selling),
+        "investments_total": chf(investments),
+        "confessions": confessions,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+def _chf(rappen: list[int]) -> list[str]:
+    return [f"{'-' if r < 0 else ''}{abs(r) // 100}.{abs(r) % 100:02d}" for r in rappen]
+
+
+def _church_tax(cases: dict[str, np.ndarray], simple_tax: np.ndarray) -> np.ndarray:
+    """Church tax in Rappen of every case with confessions (``share_grid`` rounding)."""
+    church = np.zeros(len(simple_tax), dtype=np.int64)
+    if "confessions" not in cases:
+        return church
+    for i, confessions in enumerate(cases["confessions"].tolist()):
+        people = sum(confessions.values())
+        if not people:
+            continue
+        matrix = multiplier_matrix(cases["canton"][i])
+        row, column = matrix.cell(cases["commune"][i], int(cases["tax_year"][i]))
+        weight = sum(
+            int(matrix.church[key][row, column]) * count for key, count in confessions.items() if key in matrix.church
+        )
+        church[i] = round_half_even(int(simple_tax[i]) * weight, RATE_SCALE * 100 * people)
+    return church
+
+
+def fixture_lines(cases: dict[str, np.ndarray], first_label: int = 0) -> list[str]:
+    """Compute *cases* in one batch and render one ``ParityFixture`` JSON line per row."""
+    result = dict(compute_table(cases).columns)
+    result["church_tax_total"] = _church_tax(cases, result["simple_tax"])
+    result["total_tax"] = result["total_tax"] + result["church_tax_total"]
+    confessions = cases["confessions"].tolist() if "confessions" in cases else [{}] * len(result["total_tax"])
+    text = {
+        "purchase_date": cases["purchase_date"].astype(str).tolist(),
+        "sale_date": cases["sale_date"].astype(str).tolist(),
+        **{
+            name: _chf(np.rint(cases[name] * 100).astype(np.int64).tolist())
+            for name in ("purchase_price", "sale_price", "acquisition_costs", "selling_costs", "investments_total")
+        },
+        **{
+            name: _chf(result[name].tolist())
+            for name in ("taxable_gain", "simple_tax", "canton_share", "commune_share", "church_tax_total", "total_tax")
+        },
+    }
+    lines = []
+    for i, (code, commune, year) in enumerate(zip(
+        cases["canton"].tolist(), cases["commune"].tolist(), cases["tax_year"].tolist(), strict=True,
+    )):
+        investments = (
+            [{"description": "Investitionen", "amount": text["investments_total"][i]}]
+            if text["investments_total"][i] != "0.00" else []
+        )
+        lines.append(json.dumps({
+            "label": f"{code}-{first_label + i}",
+            "inputs": {
+                "canton": code,
+                "commune": commune,
+                "taxYear": year,
+                "purchaseDate": text["purchase_date"][i],
+                "saleDate": text["sale_date"][i],
+                "purchasePrice": text["purchase_price"][i],
+                "salePrice": text["sale_price"][i],
+                "acquisitionCosts": text["acquisition_costs"][i],
+                "sellingCosts": text["selling_costs"][i],
+                "investments": investments,
+                "taxpayerType": "natural",
+                "confessions": confessions[i],
+            },
+            "expected": {
+                "taxableGain": text["taxable_gain"][i],
+                "simpleTax": text["simple_tax"][i],
+                "totalTax": text["total_tax"][i],
+                "cantonShare": text["canton_share"][i],
+                "communeShare": text["commune_share"][i],
+                "churchTaxTotal": text["church_tax_total"][i],
+            },
+        }, ensure_ascii=False, separators=(",", ":")))
+    return lines
+
+
+def _corpus_lines(per_canton: dict[str, int], seed: int, chunk: int) -> Iterator[str]:
+    for i, (code, n_cases) in enumerate(per_canton.items()):
+        rng = np.random.default_rng([seed, i])
+        for start in range(0, n_cases, chunk):
+            yield from fixture_lines(generate_cases(code, min(chunk, n_cases - start), rng), first_label=start)
+
+
+def write_corpus(
+    out_dir: str | Path,
+    *,
+    cases: int = 1_000_000,
+    seed: int = 0,
+    cantons: list[str] | None = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    compress: bool = True,
+) -> Path:
+    """Generate *cases* fixtures spread evenly over *cantons* (default: all) and return the manifest path.
+
+    The corpus is fully determined by *seed*, *cantons*, *cases* and
+    *shard_size*; cases are generated, computed and written one shard-sized
+    chunk at a time, so memory stays flat.
+    """
+    if shard_size < 1:
+        raise ValueError("shard_size must be positive")
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    codes = [c.upper() for c in (cantons or available_cantons())]
+    per_canton = {code: cases // len(codes) + (i < cases % len(codes)) for i, code in enumerate(codes)}
+
+    opener = partial(gzip.open, compresslevel=1) if compress else open
+    lines = _corpus_lines(per_canton, seed, shard_size)
+    shards: list[dict] = []
+    while shard := list(islice(lines, shard_size)):
+        name = f"parity-{len(shards):05d}.jsonl" + (".gz" if compress else "")
+        with opener(out_dir / name, "wt", encoding="utf-8") as f:
+            f.writelines(line + "\n" for line in shard)
+        shards.append({"file": name, "cases": len(shard)})
+
+    manifest = out_dir / "manifest.json"
+    manifest.write_text(json.dumps({
+        "engineVersion": ENGINE_VERSION,
+        "seed": seed,
+        "cases": cases,
+        "cantons": per_canton,
+        "shards": shards,
+    }, indent=2) + "\n", encoding="utf-8")
+    return manifest
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Write a sharded parity corpus for scripts/parity.ts.")
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("--cases", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cantons", nargs="*", help="canton codes (default: all)")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE)
+    parser.add_argument("--no-gzip", dest="compress", action="store_false")
+    args = parser.parse_args(argv)
+    manifest = write_corpus(
+        args.out_dir, cases=args.cases, seed=args.seed, cantons=args.cantons,
+        shard_size=args.shard_size, compress=args.compress,
+    )
+    print(manifest)
+
+
+if __name__ == "__main__":
+    main()
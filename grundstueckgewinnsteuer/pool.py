@@ -0,0 +1,219 @@
+"""Pre-warmed worker pool for parallel computations.
+
+``EnginePool`` owns a process (default) or thread pool whose workers have
+constructed every registered canton engine and run one synthetic
+computation per canton before the first real task arrives, so there is no
+first-task latency spike from YAML parsing, pipeline compilation or cold
+caches.
+
+Usage::
+
+    with EnginePool(workers=8, max_tasks_per_worker=10_000) as pool:
+        future = pool.submit(inputs)                 # Future[TaxResult]
+        results = list(pool.map(many_inputs))        # ordered
+        for result in pool.imap_unordered(many_inputs):
+            ...                                      # completion order
+
+Applications using the ``forkserver`` start method can call
+:func:`preload_forkserver` once at start-up, before the first pool.
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import CancelledError, Future
+from datetime import date
+from decimal import Decimal
+from functools import partial
+from multiprocessing.pool import Pool, ThreadPool
+
+from grundstueckgewinnsteuer.cantons.registry import available_cantons, get_engine
+from grundstueckgewinnsteuer.engine.base import CantonEngine
+from grundstueckgewinnsteuer.models import TaxInputs, TaxResult
+
+PRELOAD_MODULES = ["grundstueckgewinnsteuer.pool"]
+"""Modules :func:`preload_forkserver` has the forkserver import once."""
+
+# Engines of the current process, filled by warm_up()
+_ENGINES: dict[str, CantonEngine] = {}
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+def warm_up() -> list[str]:
+    """Construct every registered engine and run one synthetic computation per canton.
+
+    Returns the warmed canton codes.
+    """
+    for code in available_cantons():
+        engine = _ENGINES.setdefault(code, get_engine(code))
+        year = engine.get_available_years()[-1]
+        engine.compute(TaxInputs(
+            canton=code,
+            commune=engine.get_communes(year)[0],
+            tax_year=year,
+            purchase_date=date(year - 10, 1, 1),
+            sale_date=date(year, 1, 1),
+            purchase_price=Decimal("500000"),
+            sale_price=Decimal("600000"),
+        ))
+    return sorted(_ENGINES)
+
+
+def preload_forkserver() -> None:
+    """Have the forkserver import :data:`PRELOAD_MODULES` so forked workers skip the package import.
+
+    The forkserver and its preload list are global to the process, so this
+    is an application start-up call, not something :class:`EnginePool` does
+    itself: it only takes effect if no forkserver is running yet (before the
+    first ``forkserver`` pool or process), and it replaces any preload list
+    set elsewhere.
+    """
+    mp.set_forkserver_preload(PRELOAD_MODULES)
+
+
+def _init_worker(warm: bool) -> None:
+    if warm:
+        warm_up()
+
+
+def compute(inputs: TaxInputs) -> TaxResult:
+    """Compute with this process's cached engine for ``inputs.canton``."""
+    code = inputs.canton.upper()
+    engine = _ENGINES.get(code)
+    if engine is None:
+        engine = _ENGINES[code] = get_engine(code)
+    return engine.compute(inputs)
+
+
+# ---------------------------------------------------------------------------
+# Pool
+# ---------------------------------------------------------------------------
+
+class EnginePool:
+    """Process or thread pool of pre-warmed calculation workers.
+
+    Built on :mod:`multiprocessing.pool` (``concurrent.futures``'
+    ``max_tasks_per_child`` can deadlock on Python 3.11).  :meth:`submit`
+    keeps at most one task per worker in the pool and queues the rest in
+    this process, so their futures can still be cancelled.
+
+    Parameters
+    ----------
+    workers:
+        Number of workers (default ``os.cpu_count()``).
+    kind:
+        ``"process"`` (default) or ``"thread"``.
+    max_tasks_per_worker:
+        Replace a worker process after this many tasks – a ``map`` chunk
+        counts as one task (processes only).
+    start_method:
+        Multiprocessing start method; defaults to ``forkserver`` where
+        available, else ``spawn``.  See :func:`preload_forkserver`.
+    warm:
+        Pre-warm each worker (see :func:`warm_up`).
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        *,
+        kind: str = "process",
+        max_tasks_per_worker: int | None = None,
+        start_method: str | None = None,
+        warm: bool = True,
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.kind = kind
+        self._lock = threading.Lock()
+        self._queued: deque[tuple[Future[TaxResult], TaxInputs]] = deque()
+        self._active: set[Future[TaxResult]] = set()  # handed to the pool, not yet settled
+        self._pool: Pool
+        if kind == "thread":
+            if max_tasks_per_worker is not None:
+                raise ValueError("max_tasks_per_worker requires kind='process'")
+            _init_worker(warm)
+            self._pool = ThreadPool(self.workers)
+        elif kind == "process":
+            if start_method is None:
+                start_method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+            context = mp.get_context(start_method)
+            self._pool = context.Pool(
+                self.workers, initializer=_init_worker, initargs=(warm,), maxtasksperchild=max_tasks_per_worker,
+            )
+        else:
+            raise ValueError(f"Unknown pool kind '{kind}' (expected 'process' or 'thread')")
+
+    # -- task API ------------------------------------------------------------
+
+    def submit(self, inputs: TaxInputs) -> Future[TaxResult]:
+        """Queue *inputs*; the future stays pending – and cancellable – until a worker is free for it."""
+        future: Future[TaxResult] = Future()
+        with self._lock:
+            self._queued.append((future, inputs))
+        self._dispatch()
+        return future
+
+    def _dispatch(self, *, flush: bool = False) -> None:
+        """Hand queued tasks to the pool while a worker is free (all of them with *flush*)."""
+        with self._lock:
+            while self._queued and (flush or len(self._active) < self.workers):
+                future, inputs = self._queued.popleft()
+                if not future.set_running_or_notify_cancel():
+                    continue  # cancelled while queued
+                self._active.add(future)
+                self._pool.apply_async(
+                    compute, (inputs,),
+                    callback=partial(self._settle, future, future.set_result),
+                    error_callback=partial(self._settle, future, future.set_exception),
+                )
+
+    def _settle(self, future: Future[TaxResult], settle: Callable[[object], None], value: object) -> None:
+        with self._lock:
+            self._active.discard(future)
+        settle(value)
+        self._dispatch()
+
+    def map(self, inputs: Iterable[TaxInputs], *, chunksize: int = 1) -> Iterator[TaxResult]:
+        """Results in input order; ``chunksize`` sends tasks to workers in batches."""
+        return self._pool.imap(compute, inputs, chunksize)
+
+    def imap_unordered(self, inputs: Iterable[TaxInputs], *, chunksize: int = 1) -> Iterator[TaxResult]:
+        """Results in completion order."""
+        return self._pool.imap_unordered(compute, inputs, chunksize)
+
+    # -- lifecycle -----------------------------------------------------------
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """Stop the workers; ``cancel_futures`` cancels queued tasks and terminates the workers.
+
+        Futures of tasks the terminated workers were running raise
+        ``CancelledError``.
+        """
+        if cancel_futures:
+            with self._lock:
+                queued, self._queued = self._queued, deque()
+            for future, _ in queued:
+                future.cancel()
+            self._pool.terminate()  # returns once no result callback can run any more
+            with self._lock:
+                active, self._active = self._active, set()
+            for future in active:  # _settle drops a future before settling it
+                future.set_exception(CancelledError())
+        else:
+            self._dispatch(flush=True)  # the closed pool accepts no more tasks
+            self._pool.close()
+        if wait:
+            self._pool.join()
+
+    def __enter__(self) -> EnginePool:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
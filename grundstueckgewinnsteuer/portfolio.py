@@ -0,0 +1,188 @@
+"""Portfolios of properties with incrementally maintained aggregates.
+
+A :class:`Portfolio` keeps one :class:`~grundstueckgewinnsteuer.models.TaxInputs`
+and its :class:`~grundstueckgewinnsteuer.models.TaxResult` per property and
+running totals per canton, commune and tax year.  Adding, editing or
+removing a property computes that property only and adjusts the totals by
+its old and new result – O(1) regardless of the portfolio size.  All sums
+are ``Decimal`` and therefore exact: the totals after any sequence of edits
+equal a fresh summation.
+
+Usage::
+
+    portfolio = Portfolio({"A-12": inputs_a, "B-7": inputs_b})
+    portfolio.update("A-12", sale_price=Decimal("950000"))
+    portfolio.by_canton["SH"].total_tax
+    portfolio.total.effective_rate_percent
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Any
+
+from grundstueckgewinnsteuer.models import TaxInputs, TaxResult
+from grundstueckgewinnsteuer.pool import EnginePool, compute
+
+_ZERO = Decimal("0")
+
+
+@dataclass(frozen=True, slots=True)
+class Totals:
+    """Aggregate over a group of properties.
+
+    ``taxable_gain`` sums positive gains only, so losses do not dilute
+    the effective rate.
+    """
+
+    count: int = 0
+    taxable_gain: Decimal = _ZERO
+    simple_tax: Decimal = _ZERO
+    canton_share: Decimal = _ZERO
+    commune_share: Decimal = _ZERO
+    church_tax_total: Decimal = _ZERO
+    total_tax: Decimal = _ZERO
+
+    @property
+    def effective_rate_percent(self) -> Decimal:
+        """Total tax as a percentage of the taxable gain (0 without gains)."""
+        return Decimal("100") * self.total_tax / self.taxable_gain if self.taxable_gain > 0 else _ZERO
+
+    def adjust(self, result: TaxResult, sign: int) -> Totals:
+        """These totals with *result* added (``sign=1``) or removed (``sign=-1``)."""
+        return Totals(
+            count=self.count + sign,
+            taxable_gain=self.taxable_gain + sign * max(result.taxable_gain, _ZERO),
+            simple_tax=self.simple_tax + sign * result.simple_tax,
+            canton_share=self.canton_share + sign * result.canton_share,
+            commune_share=self.commune_share + sign * result.commune_share,
+            church_tax_total=self.church_tax_total + sign * result.church_tax_total,
+            total_tax=self.total_tax + sign * result.total_tax,
+        )
+
+
+_EMPTY = Totals()
+
+
+class Portfolio:
+    """Properties keyed by any hashable id, with totals per canton, commune and year.
+
+    Parameters
+    ----------
+    properties : Mapping, optional
+        Initial ``key → TaxInputs``.
+    compute : callable, optional
+        ``TaxInputs → TaxResult``; defaults to the process-wide cached
+        engines of :func:`grundstueckgewinnsteuer.pool.compute`.
+    """
+
+    def __init__(
+        self,
+        properties: Mapping[Hashable, TaxInputs] | None = None,
+        *,
+        compute: Callable[[TaxInputs], TaxResult] = compute,
+    ) -> None:
+        self._compute = compute
+        self._inputs: dict[Hashable, TaxInputs] = {}
+        self._results: dict[Hashable, TaxResult] = {}
+        self._total = _EMPTY
+        self._by_canton: dict[str, Totals] = {}
+        self._by_commune: dict[tuple[str, str], Totals] = {}
+        self._by_year: dict[int, Totals] = {}
+        if properties:
+            self.extend(properties.items())
+
+    # -- editing -----------------------------------------------------------
+
+    def set(self, key: Hashable, inputs: TaxInputs) -> TaxResult:
+        """Add or replace property *key*; only it is computed.
+
+        If the computation raises, the portfolio is left unchanged.
+        """
+        return self._store(key, inputs, self._compute(inputs))
+
+    def update(self, key: Hashable, **changes: Any) -> TaxResult:
+        """Replace fields of property *key* (``update(key, sale_price=...)``), validated like new inputs."""
+        inputs = TaxInputs.model_validate({**self._inputs[key].model_dump(), **changes})
+        return self.set(key, inputs)
+
+    def extend(
+        self,
+        properties: Iterable[tuple[Hashable, TaxInputs]],
+        *,
+        pool: EnginePool | None = None,
+        chunksize: int = 64,
+    ) -> None:
+        """Add or replace many properties, computing them in *pool* if given."""
+        items = list(properties)
+        if pool is None:
+            results: Iterable[TaxResult] = map(self._compute, (inputs for _, inputs in items))
+        else:
+            results = pool.map((inputs for _, inputs in items), chunksize=chunksize)
+        for (key, inputs), result in zip(items, results, strict=True):
+            self._store(key, inputs, result)
+
+    def remove(self, key: Hashable) -> None:
+        """Drop property *key* from the portfolio and its totals."""
+        self._account(self._inputs.pop(key), self._results.pop(key), -1)
+
+    def _store(self, key: Hashable, inputs: TaxInputs, result: TaxResult) -> TaxResult:
+        if key in self._inputs:
+            self._account(self._inputs[key], self._results[key], -1)
+        self._inputs[key] = inputs
+        self._results[key] = result
+        self._account(inputs, result, 1)
+        return result
+
+    def _account(self, inputs: TaxInputs, result: TaxResult, sign: int) -> None:
+        self._total = self._total.adjust(result, sign)
+        canton = inputs.canton.upper()
+        for groups, group in (
+            (self._by_canton, canton),
+            (self._by_commune, (canton, inputs.commune)),
+            (self._by_year, inputs.tax_year),
+        ):
+            totals = groups.get(group, _EMPTY).adjust(result, sign)
+            if totals.count:
+                groups[group] = totals
+            else:
+                del groups[group]
+
+    # -- access ------------------------------------------------------------
+
+    def inputs(self, key: Hashable) -> TaxInputs:
+        return self._inputs[key]
+
+    def result(self, key: Hashable) -> TaxResult:
+        return self._results[key]
+
+    @property
+    def total(self) -> Totals:
+        return self._total
+
+    @property
+    def by_canton(self) -> Mapping[str, Totals]:
+        """Read-only ``canton code → Totals``."""
+        return MappingProxyType(self._by_canton)
+
+    @property
+    def by_commune(self) -> Mapping[tuple[str, str], Totals]:
+        """Read-only ``(canton code, commune) → Totals``."""
+        return MappingProxyType(self._by_commune)
+
+    @property
+    def by_year(self) -> Mapping[int, Totals]:
+        """Read-only ``tax year → Totals``."""
+        return MappingProxyType(self._by_year)
+
+    def __len__(self) -> int:
+        return len(self._inputs)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._inputs)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._inputs
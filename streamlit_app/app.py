@@ -6,14 +6,19 @@ Run with:
 
 from __future__ import annotations
 
+import io
 import json
-from datetime import date
+from datetime import date, timedelta
 from decimal import Decimal
 
 import streamlit as st
 
 from grundstueckgewinnsteuer.cantons.registry import available_cantons, get_engine
-from grundstueckgewinnsteuer.models import TaxInputs
+from grundstueckgewinnsteuer.communes import load_commune_index
+from grundstueckgewinnsteuer.engine.curve import MAX_GAIN, TaxCurve, tax_curve
+from grundstueckgewinnsteuer.engine.pipeline import months_between
+from grundstueckgewinnsteuer.engine.writer import ResultWriter
+from grundstueckgewinnsteuer.models import Investment, TaxInputs
 
 # ---------------------------------------------------------------------------
 # Config
@@ -64,6 +69,65 @@ class DecimalEncoder(json.JSONEncoder):
         return super().default(o)
 
 
+# ---------------------------------------------------------------------------
+# Cached engines and scenario chart
+# ---------------------------------------------------------------------------
+@st.cache_resource
+def load_engine(canton_code: str):
+    """Instantiate each canton engine once per server process, not on every rerun."""
+    return get_engine(canton_code)
+
+
+def scenario_price_grid(sale_price: int) -> tuple[int, int, int]:
+    """Slider range and step for the sale-price scenario (same as the web ``ScenarioSlider``)."""
+    lo = max(0, round(sale_price * 0.7))
+    hi = max(lo + 1000, round(sale_price * 1.5))
+    step = max(1000, round((hi - lo) / 200))
+    return lo, lo + (hi - lo) // step * step, step
+
+
+def grid_index(price: int, price_grid: tuple[int, int, int]) -> int:
+    lo, hi, step = price_grid
+    return (min(max(price, lo), hi) - lo) // step
+
+
+def scenario_curve(
+    canton_code: str,
+    commune: str,
+    tax_year: int,
+    holding_months: int,
+    cost: int,
+    confessions: dict[str, int],
+    max_gain: int,
+) -> TaxCurve:
+    """Total tax over gains ``0 … max_gain`` (CHF) for the scenario, as a :class:`TaxCurve` in Rappen.
+
+    Served from :func:`~grundstueckgewinnsteuer.engine.curve.tax_curve`, which
+    samples each canton's tax adaptively and caches one curve per holding
+    bucket – moving either slider within a bucket costs no tax computation.
+    *cost* is purchase price plus acquisition costs and investments.
+    """
+    limit = MAX_GAIN
+    while limit < max_gain * 100:
+        limit *= 2
+    return tax_curve(
+        canton_code, holding_months, commune=commune, tax_year=tax_year, confessions=confessions,
+        cost=cost * 100, max_gain=limit,
+    )
+
+
+def curve_tax(curve: TaxCurve, offset: int, sale_price: int) -> float:
+    """Total tax in CHF at *sale_price*; *offset* is the sale price of a zero gain."""
+    return curve.at(max(sale_price - offset, 0) * 100) / 100
+
+
+def curve_points(curve: TaxCurve, offset: int, price_range: tuple[int, int]) -> tuple[list[float], list[float]]:
+    """``(sale prices, total taxes)`` in CHF over *price_range* for the chart."""
+    lo, hi = price_range
+    prices = [lo, *(offset + g / 100 for g in curve.gains if lo < offset + g / 100 < hi), hi]
+    return prices, [curve.at(max(round((price - offset) * 100), 0)) / 100 for price in prices]
+
+
 # ---------------------------------------------------------------------------
 # Sidebar
 # ---------------------------------------------------------------------------
@@ -76,12 +140,23 @@ canton_labels = [f"{c} – {CANTON_NAMES.get(c, c)}" for c in cantons]
 selected_label = st.sidebar.selectbox("Kanton", canton_labels, index=0)
 selected_canton = selected_label.split(" –")[0]
 
-engine = get_engine(selected_canton)
+engine = load_engine(selected_canton)
 
 years = engine.get_available_years()
 tax_year = st.sidebar.selectbox("Steuerjahr", sorted(years, reverse=True))
 
 communes = engine.get_communes(tax_year)
+commune_query = st.sidebar.text_input("Gemeinde suchen", placeholder="z.B. Zuerich, Winterthr")
+if commune_query:
+    offered = set(communes)
+    matches = [
+        c.name for c in load_commune_index().search(commune_query, canton=selected_canton, year=tax_year, limit=20)
+        if c.name in offered
+    ]
+    if matches:
+        communes = matches
+    else:
+        st.sidebar.caption(f"Keine Gemeinde gefunden für «{commune_query}».")
 commune = st.sidebar.selectbox("Gemeinde", communes)
 
 st.sidebar.markdown("---")
@@ -132,32 +207,33 @@ with col2:
     else:
         st.info("Keine Kirchensteuer bei der Grundstückgewinnsteuer in diesem Kanton.")
 
+
+def make_inputs(sale_price_chf: int, sale_day: date) -> TaxInputs:
+    """``TaxInputs`` of the form, with the given sale price and date."""
+    inv_list = []
+    if investments > 0:
+        inv_list = [Investment(description="Wertvermehrende Investitionen", amount=Decimal(str(investments)))]
+    return TaxInputs(
+        canton=selected_canton,
+        commune=commune,
+        tax_year=tax_year,
+        purchase_date=purchase_date,
+        sale_date=sale_day,
+        purchase_price=Decimal(str(purchase_price)),
+        sale_price=Decimal(str(sale_price_chf)),
+        acquisition_costs=Decimal(str(acquisition_costs)),
+        selling_costs=Decimal(str(selling_costs)),
+        investments=inv_list,
+        confessions=confession_counts,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Compute
 # ---------------------------------------------------------------------------
 if st.button("🧮 Berechnen", type="primary", use_container_width=True):
     try:
-        from grundstueckgewinnsteuer.models import Investment as InvModel
-
-        inv_list = []
-        if investments > 0:
-            inv_list = [InvModel(description="Wertvermehrende Investitionen", amount=Decimal(str(investments)))]
-
-        inputs = TaxInputs(
-            canton=selected_canton,
-            commune=commune,
-            tax_year=tax_year,
-            purchase_date=purchase_date,
-            sale_date=sale_date,
-            purchase_price=Decimal(str(purchase_price)),
-            sale_price=Decimal(str(sale_price)),
-            acquisition_costs=Decimal(str(acquisition_costs)),
-            selling_costs=Decimal(str(selling_costs)),
-            investments=inv_list,
-            confessions=confession_counts,
-        )
-
-        result = engine.compute(inputs)
+        result = engine.compute(make_inputs(sale_price, sale_date))
 
         # --- Results ---
         st.markdown("---")
@@ -245,5 +321,66 @@ if st.button("🧮 Berechnen", type="primary", use_container_width=True):
             mime="application/json",
         )
 
+        # Download Parquet (exact decimal amounts, same schema as batch outputs)
+        parquet_buffer = io.BytesIO()
+        with ResultWriter(parquet_buffer) as writer:
+            writer.write(result)
+        st.download_button(
+            label="📥 Ergebnis als Parquet herunterladen",
+            data=parquet_buffer.getvalue(),
+            file_name=f"ggst_{selected_canton}_{commune}_{tax_year}.parquet",
+            mime="application/vnd.apache.parquet",
+        )
+
     except Exception as e:
         st.error(f"Fehler bei der Berechnung: {e}")
+
+# ---------------------------------------------------------------------------
+# Scenario analysis (on demand; chart served from cached adaptive tax curves)
+# ---------------------------------------------------------------------------
+st.markdown("---")
+st.header("🎚️ Was-wäre-wenn Szenario")
+
+if st.toggle("Szenario-Analyse anzeigen"):
+    price_grid = scenario_price_grid(int(sale_price))
+    lo, hi, step = price_grid
+    scol1, scol2 = st.columns(2)
+    scenario_price = scol1.slider(
+        "Hypothetischer Verkaufspreis (CHF)", min_value=lo, max_value=hi,
+        value=lo + grid_index(int(sale_price), price_grid) * step, step=step,
+    )
+    scenario_date = scol2.slider(
+        "Hypothetisches Verkaufsdatum", min_value=purchase_date,
+        max_value=max(sale_date, purchase_date) + timedelta(days=365 * 30),
+        value=max(sale_date, purchase_date), format="DD.MM.YYYY",
+    )
+
+    try:
+        cost = int(purchase_price) + int(acquisition_costs) + int(investments)
+        offset = cost + int(selling_costs)  # sale price of a zero gain
+        base_months = months_between(purchase_date, sale_date)
+        scenario_months = months_between(purchase_date, scenario_date)
+        curves = {
+            months: scenario_curve(
+                selected_canton, commune, tax_year, months, cost, confession_counts,
+                max(hi, int(sale_price)) - offset,
+            )
+            for months in {base_months, scenario_months}
+        }
+        base_tax = curve_tax(curves[base_months], offset, int(sale_price))
+        scenario_tax = curve_tax(curves[scenario_months], offset, scenario_price)
+
+        m1, m2 = st.columns(2)
+        m1.metric(
+            "💰 Total Steuer (Szenario)", f"CHF {scenario_tax:,.2f}",
+            delta=f"{scenario_tax - base_tax:+,.2f} CHF", delta_color="inverse",
+        )
+        m2.metric("Besitzdauer (Szenario)", f"{scenario_months} Monate ({scenario_months // 12} Jahre)")
+        prices, taxes = curve_points(curves[scenario_months], offset, (lo, hi))
+        st.line_chart(
+            {"Verkaufspreis (CHF)": prices, "Total Steuer (CHF)": taxes},
+            x="Verkaufspreis (CHF)", y="Total Steuer (CHF)",
+        )
+        st.caption("Szenario-Werte aus der vorberechneten Steuerkurve (auf ±1 CHF genau).")
+    except Exception as e:
+        st.error(f"Fehler bei der Szenario-Berechnung: {e}")
@@ -0,0 +1,149 @@
+"""Tests for the asyncio facade."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+
+import pytest
+
+from grundstueckgewinnsteuer import pool as pool_module
+from grundstueckgewinnsteuer.aio import acompute, acompute_many
+from grundstueckgewinnsteuer.cantons.registry import get_engine
+from grundstueckgewinnsteuer.pool import EnginePool, compute
+from tests.test_pool import _inputs
+
+
+@pytest.fixture(scope="module")
+def cases():
+    inputs = [_inputs(i) for i in range(40)]
+    return inputs, [get_engine(c.canton).compute(c).total_tax for c in inputs]
+
+
+async def _source(items, pulled: list):
+    for item in items:
+        pulled.append(item)
+        await asyncio.sleep(0)
+        yield item
+
+
+class TestAcompute:
+    def test_default_executor(self, cases):
+        inputs, expected = cases
+        assert asyncio.run(acompute(inputs[0])).total_tax == expected[0]
+
+    def test_engine_pool(self, cases):
+        inputs, expected = cases
+
+        async def main():
+            with EnginePool(2, kind="thread") as pool:
+                return await asyncio.gather(*(acompute(i, executor=pool) for i in inputs[:5]))
+
+        assert [r.total_tax for r in asyncio.run(main())] == expected[:5]
+
+
+class TestAcomputeMany:
+    def test_ordered_results(self, cases):
+        inputs, expected = cases
+
+        async def main():
+            with ThreadPoolExecutor(4) as executor:
+                return [r.total_tax async for r in acompute_many(_source(inputs, []), concurrency=5, executor=executor)]
+
+        assert asyncio.run(main()) == expected
+
+    def test_backpressure(self, cases):
+        """The source is never more than ``concurrency`` items ahead of the consumer."""
+        inputs, _ = cases
+        pulled: list = []
+
+        async def main():
+            consumed = 0
+            async for _ in acompute_many(_source(inputs, pulled), concurrency=3):
+                consumed += 1
+                await asyncio.sleep(0.001)
+                assert len(pulled) - consumed <= 3
+            return consumed
+
+        assert asyncio.run(main()) == len(inputs)
+
+    def test_error_is_raised_in_order(self, cases):
+        inputs, expected = cases
+        broken = [*inputs[:3], inputs[3].model_copy(update={"canton": "XX"}), *inputs[4:]]
+
+        async def main():
+            seen = []
+            with pytest.raises(KeyError):
+                async for result in acompute_many(broken, concurrency=4):
+                    seen.append(result.total_tax)
+            return seen
+
+        assert asyncio.run(main()) == expected[:3]
+
+    def test_cancellation_stops_source_and_pending_work(self, cases):
+        inputs, _ = cases
+        pulled: list = []
+        gate = threading.Event()
+
+        def slow(fn, *args):
+            gate.wait(5)
+            return fn(*args)
+
+        class GatedExecutor(ThreadPoolExecutor):
+            def submit(self, fn, /, *args, **kwargs):
+                return super().submit(slow, fn, *args)
+
+        async def main():
+            with GatedExecutor(2) as executor:
+                async def consume():
+                    async with aclosing(acompute_many(_source(inputs, pulled), concurrency=4, executor=executor)) as it:
+                        async for _ in it:
+                            pass
+
+                task = asyncio.create_task(consume())
+                await asyncio.sleep(0.05)
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+                gate.set()
+
+        asyncio.run(main())
+        assert len(pulled) == 4
+
+    def test_cancellation_stops_queued_pool_tasks(self, cases, monkeypatch):
+        """Cancelling mid-batch leaves every task an EnginePool worker has not taken undone."""
+        inputs, _ = cases
+        started, gate = [], threading.Event()
+
+        def gated(item):
+            started.append(item)
+            gate.wait(5)
+            return compute(item)
+
+        monkeypatch.setattr(pool_module, "compute", gated)
+
+        async def main():
+            with EnginePool(1, kind="thread", warm=False) as pool:
+                async def consume():
+                    async for _ in acompute_many(inputs, concurrency=8, executor=pool):
+                        pass
+
+                task = asyncio.create_task(consume())
+                while not started:
+                    await asyncio.sleep(0.01)
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+                gate.set()
+            await asyncio.sleep(0.05)
+
+        asyncio.run(main())
+        assert started == inputs[:1]
+
+    def test_invalid_concurrency(self):
+        async def main():
+            async for _ in acompute_many([], concurrency=0):
+                pass
+
+        with pytest.raises(ValueError, match="concurrency"):
+            asyncio.run(main())
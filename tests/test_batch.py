@@ -0,0 +1,252 @@
+"""Tests for the vectorized batch helpers."""
+
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from grundstueckgewinnsteuer.cantons.registry import available_cantons, get_engine  # noqa: E402
+from grundstueckgewinnsteuer.engine.batch import (  # noqa: E402
+    MONEY_COLUMNS,
+    compute_shares,
+    compute_table,
+    holding_breaks,
+    holding_periods,
+    holding_rates,
+    marginal_table,
+    money_to_rappen,
+    multiplier_matrix,
+    share_grid,
+    tax_grid,
+    to_month_index,
+)
+from grundstueckgewinnsteuer.engine.fixedpoint import RATE_SCALE, FixedPointEngine  # noqa: E402
+from grundstueckgewinnsteuer.engine.pipeline import holding_rate_table, months_between  # noqa: E402
+from grundstueckgewinnsteuer.engine.rounding import round_up_to_005  # noqa: E402
+from grundstueckgewinnsteuer.engine.tariff import compute_share  # noqa: E402
+from grundstueckgewinnsteuer.models import TaxInputs  # noqa: E402
+from tests.test_fixedpoint import _corpus  # noqa: E402
+
+ROWS_PER_CANTON = 400
+
+
+def _random_pairs(n: int, seed: int = 7) -> list[tuple[date, date]]:
+    rng = random.Random(seed)
+    start = date(1950, 1, 1)
+    pairs = []
+    for _ in range(n):
+        purchase = start + timedelta(days=rng.randrange(365 * 80))
+        sale = purchase + timedelta(days=rng.randrange(-400, 365 * 40))
+        pairs.append((purchase, sale))
+    # Month-end / leap-day edges
+    pairs += [
+        (date(2020, 3, 31), date(2021, 3, 1)),
+        (date(2020, 2, 29), date(2021, 2, 28)),
+        (date(1969, 12, 31), date(1970, 1, 1)),
+        (date(2024, 1, 1), date(2024, 1, 31)),
+    ]
+    return pairs
+
+
+class TestHoldingPeriods:
+    def test_matches_months_between(self):
+        pairs = _random_pairs(5000)
+        periods = holding_periods([p for p, _ in pairs], [s for _, s in pairs])
+        assert periods.months.tolist() == [months_between(p, s) for p, s in pairs]
+        assert periods.years.tolist() == [months_between(p, s) // 12 for p, s in pairs]
+
+    def test_datetime64_units(self):
+        """Day, second and nanosecond arrays give the same months."""
+        purchase = np.array(["1960-05-31", "2019-12-31"], dtype="datetime64[D]")
+        sale = np.array(["1961-05-01", "2020-01-01"], dtype="datetime64[D]")
+        for unit in ("D", "s", "ns"):
+            periods = holding_periods(purchase.astype(f"datetime64[{unit}]"), sale.astype(f"datetime64[{unit}]"))
+            assert periods.months.tolist() == [12, 1]
+            assert periods.years.tolist() == [1, 0]
+
+    def test_month_index(self):
+        assert to_month_index(["1970-01-15", "1969-12-31"]).tolist() == [0, -1]
+
+
+def _table(cases) -> dict[str, list]:
+    return {
+        "canton": [c.canton for c in cases],
+        "commune": [c.commune for c in cases],
+        "tax_year": [c.tax_year for c in cases],
+        "purchase_date": [c.purchase_date for c in cases],
+        "sale_date": [c.sale_date for c in cases],
+        "purchase_price": [c.purchase_price for c in cases],
+        "sale_price": [c.sale_price for c in cases],
+        "acquisition_costs": [c.acquisition_costs for c in cases],
+        "selling_costs": [c.selling_costs for c in cases],
+        "investments_total": [c.total_investments for c in cases],
+    }
+
+
+@pytest.fixture(scope="module")
+def mixed_cases():
+    """Corpus rows of every canton interleaved, without confessions (the columnar input has none)."""
+    cases = []
+    for code in available_cantons():
+        cases += [c.model_copy(update={"confessions": {}}) for c in _corpus(code, 11)[:ROWS_PER_CANTON]]
+    random.Random(3).shuffle(cases)
+    return cases
+
+
+class TestComputeTable:
+    def test_matches_canton_engines(self, mixed_cases):
+        records = compute_table(_table(mixed_cases)).to_records()
+        for inputs, record in zip(mixed_cases, records, strict=True):
+            expected = get_engine(inputs.canton).compute(inputs)
+            for field in (*MONEY_COLUMNS, "holding_months", "holding_years"):
+                assert record[field] == getattr(expected, field), (inputs.canton, field, inputs.taxable_gain)
+            assert record["canton"] == inputs.canton
+
+    def test_pandas_and_arrow_inputs(self, mixed_cases):
+        pd = pytest.importorskip("pandas")
+        pa = pytest.importorskip("pyarrow")
+        rows = mixed_cases[:200]
+        expected = compute_table(_table(rows)).columns["total_tax"]
+        frame = pd.DataFrame(_table(rows))
+        for money in ("purchase_price", "sale_price", "acquisition_costs", "selling_costs", "investments_total"):
+            frame[money] = frame[money].astype(float)
+        assert compute_table(frame).columns["total_tax"].tolist() == expected.tolist()
+        arrow = pa.table({k: pa.array(v) for k, v in _table(rows).items()})
+        assert compute_table(arrow).columns["total_tax"].tolist() == expected.tolist()
+
+    def test_arrow_output_is_decimal(self, mixed_cases):
+        pa = pytest.importorskip("pyarrow")
+        rows = mixed_cases[:50]
+        table = compute_table(_table(rows)).to_arrow()
+        assert table.schema.field("total_tax").type == pa.decimal128(18, 2)
+        assert table.column("total_tax").to_pylist() == [get_engine(c.canton).compute(c).total_tax for c in rows]
+
+    def test_missing_column(self):
+        with pytest.raises(KeyError, match="sale_price"):
+            compute_table({"canton": ["ZH"]})
+
+    def test_unknown_sh_commune(self, mixed_cases):
+        table = _table([c for c in mixed_cases if c.canton == "SH" and c.taxable_gain > 0][:3])
+        table["commune"] = ["Nowhere"] * 3
+        with pytest.raises(ValueError, match="No Steuerfuss data"):
+            compute_table(table)
+
+
+class TestMarginalTable:
+    def test_matches_scalar_marginal(self, mixed_cases):
+        columns = marginal_table(_table(mixed_cases))
+        for i, inputs in enumerate(mixed_cases):
+            expected = get_engine(inputs.canton).marginal(inputs)
+            assert columns.marginal_rate_percent[i] == pytest.approx(float(expected.marginal_rate_percent), rel=1e-12)
+            assert columns.holding_months[i] == expected.holding_months
+            assert columns.next_holding_months[i] == (expected.next_holding_months or -1)
+            assert Decimal(int(columns.holding_delta[i])).scaleb(-2) == expected.holding_delta, inputs
+
+    def test_breaks(self):
+        breaks = holding_breaks("zh")
+        assert breaks.tolist() == list(FixedPointEngine("ZH")._model.holding_breaks())
+        assert not breaks.flags.writeable
+
+
+class TestMultiplierMatrix:
+    def test_matches_engine_lists(self):
+        matrix = multiplier_matrix("SH")
+        engine = get_engine("SH")
+        assert matrix.years == engine.get_available_years()
+        for j, year in enumerate(matrix.years):
+            present = [c for i, c in enumerate(matrix.communes) if matrix.present[i, j]]
+            assert sorted(present) == sorted(engine.get_communes(year))
+
+    def test_values_are_scaled_percent(self):
+        matrix = multiplier_matrix("SH")
+        i, j = matrix.cell("Bargen", 2025)
+        assert matrix.commune[i, j] == 102 * RATE_SCALE
+        assert matrix.church["christK"][i, j] == 12_500_000
+        assert not matrix.commune.flags.writeable
+        with pytest.raises(KeyError):
+            matrix.cell("Bargen", 1999)
+
+    def test_canton_without_steuerfuss(self):
+        with pytest.raises(ValueError, match="no Steuerfuss"):
+            multiplier_matrix("ZH")
+
+    def test_compute_shares(self):
+        rng = random.Random(5)
+        simple = [rng.randrange(0, 10**9) for _ in range(500)]
+        mult = [rng.randrange(0, 150) * RATE_SCALE // 2 for _ in simple]
+        expected = [
+            int(round_up_to_005(compute_share(Decimal(s) / 100, Decimal(m) / RATE_SCALE)) * 100)
+            for s, m in zip(simple, mult, strict=True)
+        ]
+        assert compute_shares(np.array(simple), np.array(mult)).tolist() == expected
+
+
+class TestTaxGrid:
+    CONFESSIONS = {"evangR": 2, "roemK": 1, "Andere": 1}
+
+    def _engine_cell(self, gain: Decimal, months: int, commune: str, year: int):
+        result = get_engine("SH").compute(TaxInputs(
+            canton="SH", commune=commune, tax_year=year,
+            purchase_date=date(1990, 1, 1), sale_date=date(1990 + months // 12, 1 + months % 12, 1),
+            purchase_price=Decimal("1000000"), sale_price=Decimal("1000000") + gain,
+            confessions=self.CONFESSIONS,
+        ))
+        church = int((result.church_tax_total * 100).quantize(Decimal(1), rounding="ROUND_HALF_EVEN"))
+        canton, commune_share = int(result.canton_share * 100), int(result.commune_share * 100)
+        return canton, commune_share, church, canton + commune_share + church
+
+    def test_matches_engine(self):
+        rng = random.Random(9)
+        gains = [Decimal(rng.randrange(-10**5, 3 * 10**8)) / 100 for _ in range(6)] + [Decimal(0)]
+        months = [rng.randrange(0, 400) for _ in gains]
+        matrix = multiplier_matrix("SH")
+        grid = tax_grid(gains, months, confessions=self.CONFESSIONS)
+        assert grid.total_tax.shape == (len(gains), len(matrix.communes), len(matrix.years))
+        for k, (gain, held) in enumerate(zip(gains, months, strict=True)):
+            for i, commune in enumerate(matrix.communes):
+                for j, year in enumerate(matrix.years):
+                    if matrix.present[i, j]:
+                        got = tuple(int(values[k, i, j]) for values in grid)
+                        assert got == self._engine_cell(gain, held, commune, year), (gain, commune, year)
+
+    def test_scalar_and_missing_cells(self):
+        matrix = multiplier_matrix("SH")
+        grid = tax_grid(500_000, 120)
+        assert grid.total_tax.shape == matrix.commune.shape
+        assert (grid.total_tax[~matrix.present] == 0).all()
+        assert (grid.church_tax_total == 0).all()
+
+    def test_share_grid_broadcasts(self):
+        matrix = multiplier_matrix("SH")
+        simple = np.array([[100_00], [2_000_00]])
+        assert share_grid(simple, matrix).total_tax.shape == (2, 1, *matrix.commune.shape)
+
+
+class TestMoney:
+    def test_conversions(self):
+        assert money_to_rappen([1, 2]).tolist() == [100, 200]
+        assert money_to_rappen(np.array([0.1, 1234.56])).tolist() == [10, 123456]
+        assert money_to_rappen([Decimal("0.05"), "7"]).tolist() == [5, 700]
+
+    def test_sub_rappen_rejected(self):
+        with pytest.raises(ValueError):
+            money_to_rappen(np.array([0.001]))
+        with pytest.raises(ValueError):
+            money_to_rappen([Decimal("0.005")])
+
+
+class TestHoldingRates:
+    @pytest.mark.parametrize("code", ["AG", "NW", "GE", "TI", "VD", "FR", "UR"])
+    def test_matches_rate_table(self, code):
+        table = holding_rates(code)
+        years = np.arange(-2, 60)
+        rates = table[np.clip(years, 0, len(table) - 1)]
+        assert rates.tolist() == [int(holding_rate_table(code).rate(y) * RATE_SCALE) for y in years.tolist()]
+        assert not table.flags.writeable
+
+    def test_other_cantons(self):
+        with pytest.raises(ValueError, match="no holding-period"):
+            holding_rates("SH")
@@ -0,0 +1,193 @@
+"""Tests for the ggst command line and its Unix-socket daemon."""
+
+import json
+import marshal
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from grundstueckgewinnsteuer import cli
+from grundstueckgewinnsteuer.models import TaxInputs
+from grundstueckgewinnsteuer.pool import compute
+
+FLAGS = [
+    "--canton", "SH", "--commune", "Schaffhausen", "--year", "2025",
+    "--purchase-date", "2015-04-01", "--sale-date", "2025-04-01",
+    "--purchase-price", "800000", "--sale-price", "1000000",
+]
+INPUTS = TaxInputs(
+    canton="SH",
+    commune="Schaffhausen",
+    tax_year=2025,
+    purchase_date=date(2015, 4, 1),
+    sale_date=date(2025, 4, 1),
+    purchase_price=Decimal("800000"),
+    sale_price=Decimal("1000000"),
+)
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    path = str(tmp_path / "ggst.sock")
+    monkeypatch.setenv("GGST_SOCKET", path)
+    monkeypatch.delenv("GGST_NO_DAEMON", raising=False)
+    server = threading.Thread(target=cli.serve, kwargs={"warm": False}, daemon=True)
+    server.start()
+    while not os.path.exists(path):
+        server.join(0.01)
+    yield path
+    if server.is_alive():
+        cli.forward(["stop"], None, path)
+    server.join(5)
+
+
+class TestRun:
+    def test_flags(self):
+        code, out, err = cli.run(FLAGS)
+        assert (code, err) == (0, "")
+        lines = dict(line.split() for line in out.splitlines())
+        assert Decimal(lines["total_tax"]) == compute(INPUTS).total_tax
+
+    def test_stdin_json_with_overrides(self):
+        stdin = INPUTS.model_dump_json()
+        code, out, _ = cli.run(["-", "--json", "--confession", "evangR=2"], stdin)
+        expected = compute(INPUTS.model_copy(update={"confessions": {"evangR": 2}}))
+        assert code == 0
+        assert json.loads(out) == json.loads(expected.model_dump_json())
+
+    def test_bad_arguments(self):
+        code, _, err = cli.run(["--bogus"])
+        assert code == 2 and "unrecognized arguments" in err
+
+    def test_invalid_transaction(self):
+        code, out, err = cli.run([*FLAGS, "--commune", "Nowhere"])
+        assert (code, out) == (1, "")
+        assert err.startswith("ggst: error:") and "Nowhere" in err
+
+    @pytest.mark.parametrize("stdin", ["[1, 2]", "not json", '{"canton": 5}'])
+    def test_malformed_stdin(self, stdin):
+        code, out, err = cli.run(["-"], stdin)
+        assert (code, out) == (1, "")
+        assert err.startswith("ggst: error:")
+
+    @pytest.mark.parametrize(("argv", "expected"), [
+        (["-", "--json"], True),
+        (["--json", "-"], True),
+        (["--commune", "-"], False),
+        (["--commune", "-", "-"], True),
+        (["--", "-"], True),
+        (FLAGS, False),
+    ])
+    def test_reads_stdin(self, argv, expected):
+        assert cli._reads_stdin(argv) is expected
+
+    def test_value_options_match_parser(self):
+        options = {
+            option for action in cli._parser()._actions if action.nargs != 0
+            for option in action.option_strings
+        }
+        assert options == cli._VALUE_OPTIONS
+
+
+class TestDaemon:
+    def test_forwards_to_daemon(self, daemon, capsys, monkeypatch):
+        calls = []
+        monkeypatch.setattr(cli, "run", lambda argv, stdin=None: calls.append(argv) or (3, "out\n", "err\n"))
+        assert cli.main(FLAGS) == 3
+        assert calls == [FLAGS]
+        assert capsys.readouterr() == ("out\n", "err\n")
+
+    def test_daemon_result_matches_local(self, daemon):
+        assert cli.forward(FLAGS, None, daemon) == cli.run(FLAGS)
+
+    def test_stop(self, daemon, capsys):
+        assert cli.main(["stop"]) == 0
+        for _ in range(500):
+            if not os.path.exists(daemon):
+                break
+            time.sleep(0.01)
+        assert not os.path.exists(daemon)
+        assert cli.forward(FLAGS, None, daemon) is None
+
+    def test_falls_back_without_daemon(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.setenv("GGST_SOCKET", str(tmp_path / "missing.sock"))
+        assert cli.main(FLAGS) == 0
+        assert "total_tax" in capsys.readouterr().out
+        assert cli.main(["stop"]) == 1
+
+    def test_survives_bad_requests(self, daemon):
+        code, _, err = cli.forward(["-"], "[1, 2]", daemon)
+        assert code == 1 and err.startswith("ggst: error:")
+        assert cli.forward(FLAGS, None, daemon) == cli.run(FLAGS)
+
+    def test_falls_back_when_daemon_hangs(self, tmp_path, monkeypatch, capsys):
+        path = str(tmp_path / "hung.sock")
+        hung = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        hung.bind(path)
+        hung.listen()  # accepts connections but never replies
+        try:
+            monkeypatch.setenv("GGST_SOCKET", path)
+            monkeypatch.setattr(cli, "TIMEOUT", 0.2)
+            assert cli.forward(FLAGS, None, path, timeout=0.2) is None
+            assert cli.main(FLAGS) == 0
+            assert "total_tax" in capsys.readouterr().out
+        finally:
+            hung.close()
+
+    @pytest.mark.parametrize(
+        "reply", [b"bad", marshal.dumps([0, "out", "err"]), marshal.dumps((0, b"out", ""))],
+        ids=["garbage", "list", "bytes"],
+    )
+    def test_falls_back_on_malformed_reply(self, tmp_path, monkeypatch, capsys, reply):
+        path = str(tmp_path / "fake.sock")
+        fake = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        fake.bind(path)
+        fake.listen()
+
+        def answer():
+            for _ in range(2):  # forward() and main()
+                conn, _ = fake.accept()
+                with conn:
+                    cli._recv(conn)
+                    conn.sendall(len(reply).to_bytes(4, "big") + reply)
+
+        server = threading.Thread(target=answer, daemon=True)
+        server.start()
+        try:
+            assert cli.forward(FLAGS, None, path) is None
+            monkeypatch.setenv("GGST_SOCKET", path)
+            assert cli.main(FLAGS) == 0
+            assert "total_tax" in capsys.readouterr().out
+        finally:
+            server.join(5)
+            fake.close()
+
+    def test_ignores_foreign_socket_paths(self, daemon, tmp_path, monkeypatch):
+        plain = tmp_path / "plain"
+        plain.write_text("")
+        assert cli.forward(FLAGS, None, str(plain)) is None
+        monkeypatch.setattr(cli.os, "getuid", lambda: os.stat(daemon).st_uid + 1)
+        assert cli.forward(FLAGS, None, daemon) is None
+
+    def test_refuses_second_daemon(self, daemon):
+        with pytest.raises(RuntimeError, match="already listening"):
+            cli.serve(daemon, warm=False)
+
+
+class TestClientImports:
+    def test_client_imports_almost_nothing(self):
+        probe = "import sys, grundstueckgewinnsteuer.cli; print(' '.join(sorted(sys.modules)))"
+        out = subprocess.run(
+            [sys.executable, "-c", probe], cwd=Path(__file__).parent.parent,
+            capture_output=True, text=True, check=True,
+        ).stdout.split()
+        for name in ("pydantic", "yaml", "argparse", "json", "socket", "decimal", "grundstueckgewinnsteuer.models"):
+            assert name not in out
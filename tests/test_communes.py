@@ -0,0 +1,175 @@
+"""Tests for the commune index."""
+
+import pytest
+
+from grundstueckgewinnsteuer.cantons.registry import available_cantons, get_engine
+from grundstueckgewinnsteuer.communes import (
+    Commune,
+    CommuneIndex,
+    _prefix_distance,
+    load_commune_index,
+    normalize_name,
+    read_commune_csv,
+    write_commune_index,
+)
+
+
+@pytest.fixture
+def index():
+    return CommuneIndex([
+        Commune(1, "Zürich", "ZH"),
+        Commune(2, "Buchs", "ZH"),
+        Commune(3, "Buchs", "SG"),
+        Commune(4, "Altdorf", "SH", valid_to=2024),
+        Commune(5, "Neudorf", "SH", valid_from=2025),
+        Commune(None, "Yverdon-les-Bains", "VD"),
+    ])
+
+
+class TestNormalize:
+    @pytest.mark.parametrize("name", ["Zürich", "ZURICH", "zurich", " Zürich "])
+    def test_folding(self, name):
+        assert normalize_name(name) == "zurich"
+
+    def test_separators(self):
+        assert normalize_name("Yverdon-les-Bains") == "yverdon les bains"
+        assert normalize_name("St. Gallen") == "st gallen"
+
+
+class TestCommuneIndex:
+    def test_by_bfs(self, index):
+        assert index.by_bfs(3) == Commune(3, "Buchs", "SG")
+        with pytest.raises(KeyError, match="99"):
+            index.by_bfs(99)
+
+    def test_lookup_spellings(self, index):
+        for spelling in ("Zürich", "zuerich", "ZURICH"):
+            assert index.lookup(spelling).bfs == 1
+        assert index.lookup("yverdon les bains").canton == "VD"
+
+    def test_ambiguous_name(self, index):
+        with pytest.raises(ValueError, match=r"Buchs \(SG\), Buchs \(ZH\)"):
+            index.lookup("Buchs")
+        assert index.lookup("Buchs", canton="sg").bfs == 3
+
+    def test_unknown_name(self, index):
+        with pytest.raises(KeyError, match="Nowhere"):
+            index.lookup("Nowhere")
+
+    def test_canton_of(self, index):
+        assert index.canton_of(1) == "ZH"
+        assert index.canton_of("Neudorf") == "SH"
+
+    def test_validity(self, index):
+        assert index.communes("SH", 2024) == ["Altdorf"]
+        assert index.communes("SH", 2025) == ["Neudorf"]
+        assert index.communes("SH") == ["Altdorf", "Neudorf"]
+        with pytest.raises(KeyError):
+            index.lookup("Altdorf", year=2025)
+
+    def test_per_year_list_is_a_copy(self, index):
+        index.communes("ZH", 2025).clear()
+        assert index.communes("ZH", 2025) == ["Zürich", "Buchs"]
+
+    def test_contains(self, index):
+        assert 5 in index
+        assert "zuerich" in index
+        assert "Nowhere" not in index
+
+    def test_duplicate_bfs(self):
+        with pytest.raises(ValueError, match="Duplicate BFS"):
+            CommuneIndex([Commune(1, "A", "ZH"), Commune(1, "B", "ZH")])
+
+
+class TestPackagedIndex:
+    def test_covers_every_canton(self):
+        assert load_commune_index().cantons == sorted(available_cantons())
+
+    def test_bfs_lookup_names_missing_numbers(self):
+        with pytest.raises(KeyError, match="no BFS numbers"):
+            load_commune_index().by_bfs(261)
+
+    def test_engines_use_index(self):
+        index = load_commune_index()
+        for code in available_cantons():
+            engine = get_engine(code)
+            year = engine.get_available_years()[-1]
+            communes = engine.get_communes(year)
+            assert communes, code
+            assert all(index.lookup(name, canton=code, year=year).canton == code for name in communes)
+
+
+class TestCsvImport:
+    def test_round_trip(self, tmp_path):
+        csv_path = tmp_path / "gemeinden.csv"
+        csv_path.write_text(
+            "BFS_NR;GEMEINDENAME;KANTON;GUELTIG_VON;GUELTIG_BIS\n"
+            "261;Zürich;zh;01.01.1934;\n"
+            "2939;Schaffhausen;SH;1960-01-01;2030\n",
+            encoding="utf-8",
+        )
+        communes = read_commune_csv(csv_path, delimiter=";", columns={
+            "bfs": "BFS_NR", "name": "GEMEINDENAME", "canton": "KANTON",
+            "valid_from": "GUELTIG_VON", "valid_to": "GUELTIG_BIS",
+        })
+        assert communes == [
+            Commune(261, "Zürich", "ZH", 1934, None),
+            Commune(2939, "Schaffhausen", "SH", 1960, 2030),
+        ]
+        json_path = tmp_path / "index.json"
+        write_commune_index(communes, json_path, source="test")
+        assert list(load_commune_index(json_path)) == communes
+
+
+class TestSearch:
+    @pytest.fixture
+    def index(self):
+        return CommuneIndex([
+            Commune(1, "Zürich", "ZH"),
+            Commune(2, "Zug", "ZG"),
+            Commune(3, "Zuchwil", "SO"),
+            Commune(4, "Yverdon-les-Bains", "VD"),
+            Commune(5, "Schaffhausen", "SH"),
+            Commune(6, "Schaffhausen (Herblingen)", "SH", valid_to=2024),
+            Commune(7, "Winterthur", "ZH"),
+        ])
+
+    def names(self, index, query, **kwargs):
+        return [c.name for c in index.search(query, **kwargs)]
+
+    def test_prefix_ranking(self, index):
+        """Shorter names first among equal prefix matches."""
+        assert self.names(index, "zu") == ["Zug", "Zürich", "Zuchwil"]
+
+    def test_exact_before_prefix(self, index):
+        assert self.names(index, "schaffhausen") == ["Schaffhausen", "Schaffhausen (Herblingen)"]
+
+    def test_folding(self, index):
+        assert self.names(index, "ZUERICH") == ["Zürich"]
+        assert self.names(index, "zür")[0] == "Zürich"
+
+    def test_word_prefix(self, index):
+        assert self.names(index, "bains") == ["Yverdon-les-Bains"]
+
+    def test_fuzzy(self, index):
+        assert self.names(index, "winterhur") == ["Winterthur"]
+        assert self.names(index, "schafhausen") == ["Schaffhausen", "Schaffhausen (Herblingen)"]
+        assert self.names(index, "zurch") == ["Zürich", "Zuchwil"]
+
+    def test_exact_before_fuzzy(self, index):
+        """Fuzzy matches fill the result up to ``limit``, after the prefix matches."""
+        assert self.names(index, "zug") == ["Zug", "Zürich", "Zuchwil"]
+
+    def test_filters_and_limit(self, index):
+        assert self.names(index, "z", canton="zh") == ["Zürich"]
+        assert self.names(index, "schaff", year=2025) == ["Schaffhausen"]
+        assert self.names(index, "z", limit=1) == ["Zug"]
+
+    def test_no_match(self, index):
+        assert self.names(index, "qqqq") == []
+        assert self.names(index, "  ") == []
+
+    def test_prefix_distance(self):
+        assert _prefix_distance("zurch", "zurich") == 1
+        assert _prefix_distance("winterhur", "winterthur") == 1
+        assert _prefix_distance("abc", "") == 3
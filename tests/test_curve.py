@@ -0,0 +1,95 @@
+"""Tests for the adaptive tax-curve sampler."""
+
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from grundstueckgewinnsteuer.engine import curve, kernel
+from grundstueckgewinnsteuer.engine.fixedpoint import available_cantons
+
+
+def _options(code: str) -> dict:
+    if code == "SH":
+        return {"commune": "Schaffhausen", "tax_year": 2025, "confessions": {"evangR": 1, "roemK": 1}}
+    if code == "ZG":
+        return {"cost": 800_000_00}
+    return {}
+
+
+def _tax(code: str, gain: int, months: int, options: dict):
+    return kernel.compute(code, gain, months, **options).total_tax
+
+
+class TestTaxCurve:
+    @pytest.mark.parametrize("code", available_cantons())
+    def test_within_tolerance(self, code):
+        rng = random.Random(code)
+        options = _options(code)
+        for months in (7, 30, 130):
+            c = curve.tax_curve(code, months, **options)
+            for gain, tax in zip(c.gains[::7], c.taxes[::7], strict=True):
+                assert abs(tax - _tax(code, gain, months, options)) < 1
+            for _ in range(300):
+                gain = rng.randrange(curve.MAX_GAIN)
+                assert abs(c.at(gain) - _tax(code, gain, months, options)) <= curve.TOLERANCE, (months, gain)
+
+    def test_exact_at_bracket_limits_with_few_points(self):
+        c = curve.tax_curve("ZH", 84)
+        m = kernel.model("ZH")
+        assert {limit for limit in m.brackets.limits if limit > m.min_gain} <= set(c.gains)
+        assert len(c.gains) < 40
+        assert c.at(150_000_00) == kernel.compute("ZH", 150_000_00, 84).total_tax
+
+    def test_discontinuity_sampled_on_both_sides(self):
+        m = kernel.model("ZH")  # gains below the minimum are not taxed, from it on in full
+        c = curve.tax_curve("ZH", 84)
+        assert {m.min_gain - 1, m.min_gain} <= set(c.gains)
+        assert c.taxes[c.gains.index(m.min_gain - 1)] == 0 < c.taxes[c.gains.index(m.min_gain)]
+
+    @pytest.mark.parametrize(("code", "threshold"), [
+        ("AR", kernel.model("AR").min_gain),
+        ("UR", kernel.model("UR").freibetrag + kernel.model("UR").gain_rounding),
+        ("ZH", kernel.model("ZH").min_gain),
+        ("VS", None),
+    ])
+    def test_accurate_around_thresholds(self, code, threshold):
+        """Every Rappen around a minimum-gain or Freibetrag jump, against the model itself."""
+        m = kernel.model(code)
+        c = curve.tax_curve(code, 84)
+        if threshold is None:  # the first taxed gain
+            threshold = next(g for g, t in zip(c.gains, c.taxes, strict=True) if t)
+        step = getattr(m, "gain_rounding", 1)
+        assert {threshold - 1, threshold} <= set(c.gains)
+        for gain in range(threshold - 2 * step - 50, threshold + 2 * step + 50):
+            total = m.run(gain, 84, 0, "", 0, {}).total_tax
+            assert abs(c.at(gain) - kernel.round_half_even(total.numerator, total.denominator)) <= curve.TOLERANCE, gain
+
+    def test_cached_per_holding_bucket(self):
+        assert curve.holding_bucket("ZH", 30) == curve.holding_bucket("ZH", 59)
+        assert curve.tax_curve("ZH", 30) is curve.tax_curve("ZH", 59)
+        assert curve.tax_curve("ZH", 30) != curve.tax_curve("ZH", 60)
+
+    def test_cache_ignores_inputs_the_model_does_not_read(self):
+        zh = curve.tax_curve("ZH", 84)
+        assert curve.tax_curve("ZH", 84, cost=500_000_00, commune="Winterthur", tax_year=2024) is zh
+        assert curve.tax_curve("ZH", 84, confessions={"evangR": 2}, self_used=True) is zh
+        assert curve.tax_curve("ZG", 84, cost=500_000_00) is not curve.tax_curve("ZG", 84, cost=600_000_00)
+        sh = {"commune": "Schaffhausen", "tax_year": 2025}
+        assert curve.tax_curve("SH", 84, **sh, cost=1) is curve.tax_curve("SH", 84, **sh, cost=2)
+        assert curve.tax_curve("SH", 84, **sh) is not curve.tax_curve("SH", 84, **sh, confessions={"evangR": 1})
+
+    def test_to_decimals(self):
+        gain, tax = curve.tax_curve("ZH", 84).to_decimals()[-1]
+        assert gain == curve.MAX_GAIN / 100
+        assert tax == kernel.compute("ZH", curve.MAX_GAIN, 84).to_decimals()["total_tax"]
+
+    def test_no_heavy_dependencies(self):
+        probe = "import sys, grundstueckgewinnsteuer.engine.curve; print(' '.join(sorted(sys.modules)))"
+        modules = subprocess.run(
+            [sys.executable, "-c", probe], cwd=Path(__file__).parent.parent,
+            capture_output=True, text=True, check=True,
+        ).stdout.split()
+        assert "pydantic" not in modules and "yaml" not in modules
@@ -0,0 +1,147 @@
+"""Differential tests: integer fixed-point backend vs the Decimal canton engines."""
+
+import random
+from datetime import date
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from grundstueckgewinnsteuer.cantons.registry import get_engine
+from grundstueckgewinnsteuer.engine.fixedpoint import (
+    FixedPointEngine,
+    available_cantons,
+    round_half_even,
+    scale_rate,
+    to_rappen,
+)
+from grundstueckgewinnsteuer.models import Investment, TaxInputs
+
+CASES_PER_CANTON = 2000
+
+_MONEY_FIELDS = (
+    "taxable_gain", "simple_tax", "canton_share", "commune_share", "church_tax_total", "total_tax",
+)
+
+# Gains that sit exactly on (or one Rappen beside) a tariff threshold somewhere
+_EDGE_GAINS = [
+    Decimal(v) for v in (
+        "0.01", "499.99", "500", "2000", "2200", "2200.01", "3000", "4000", "4200", "5000", "5199.99",
+        "5200", "6000", "7000", "10000", "10000.01", "13000", "17000", "30000", "70000", "120000",
+        "120000.01", "456000", "500000", "599999.99", "600000", "1000000",
+    )
+]
+
+
+def _add_months(d: date, months: int) -> date:
+    total = d.year * 12 + d.month - 1 + months
+    return date(total // 12, total % 12 + 1, min(d.day, 28))
+
+
+def _corpus(code: str, seed: int) -> list[TaxInputs]:
+    """Generate stratified random inputs: edge gains, boundary months, odd Rappen."""
+    rng = random.Random(f"{code}-{seed}")
+    engine = get_engine(code)
+    cases = []
+    for i in range(CASES_PER_CANTON):
+        if i < len(_EDGE_GAINS):
+            gain = _EDGE_GAINS[i]
+        elif i % 3 == 0:
+            gain = Decimal(rng.randint(1, 2_000_000_00)) / 100
+        else:
+            gain = Decimal(rng.randint(1, 200_000))
+        months = rng.choice([
+            rng.randint(1, 360),
+            rng.choice([1, 11, 12, 13, 23, 24, 35, 36, 47, 48, 59, 60, 71, 72, 119, 120, 143, 144, 203, 204, 300]),
+        ])
+        purchase_date = date(rng.randint(1980, 2015), rng.randint(1, 12), rng.randint(1, 28))
+        sale_date = _add_months(purchase_date, months)
+        purchase_price = Decimal(rng.randint(50_000, 2_000_000))
+        acquisition_costs = Decimal(rng.randint(0, 2_000_000)) / 100
+        investments = []
+        if rng.random() < 0.3:
+            investments.append(Investment(description="Umbau", amount=Decimal(rng.randint(1, 300_000))))
+        tax_year = rng.choice(engine.get_available_years())
+        communes = engine.get_communes(tax_year)
+        confessions: dict[str, int] = {}
+        if code == "SH":
+            for key in rng.sample(["evangR", "roemK", "christK", "Andere"], rng.randint(0, 3)):
+                confessions[key] = rng.randint(1, 2)
+        sale_price = purchase_price + acquisition_costs + sum(inv.amount for inv in investments) + gain
+        cases.append(TaxInputs(
+            canton=code,
+            commune=rng.choice(communes),
+            tax_year=tax_year,
+            purchase_date=purchase_date,
+            sale_date=sale_date,
+            purchase_price=purchase_price,
+            sale_price=sale_price,
+            acquisition_costs=acquisition_costs,
+            investments=investments,
+            confessions=confessions,
+        ))
+    return cases
+
+
+class TestHelpers:
+    def test_to_rappen(self):
+        assert to_rappen(Decimal("1234.56")) == 123456
+
+    def test_to_rappen_rejects_sub_rappen(self):
+        with pytest.raises(ValueError):
+            to_rappen(Decimal("0.005"))
+
+    def test_scale_rate(self):
+        assert scale_rate(0.0144) == 14400
+        assert scale_rate("4.2") == 4_200_000
+
+    def test_round_half_even(self):
+        """Ties go to the even neighbour, like to_fixed_2."""
+        assert round_half_even(5, 10) == 0
+        assert round_half_even(15, 10) == 2
+        assert round_half_even(16, 10) == 2
+        assert round_half_even(-15, 10) == -2
+
+    def test_unknown_canton(self):
+        with pytest.raises(KeyError):
+            FixedPointEngine("XX")
+
+
+class TestDifferential:
+    """Every canton: fixed-point amounts equal the Decimal engine's, field by field."""
+
+    @pytest.mark.parametrize("code", available_cantons())
+    def test_matches_decimal_engine(self, code):
+        decimal_engine = get_engine(code)
+        fixed_engine = FixedPointEngine(code)
+        for inputs in _corpus(code, seed=27):
+            expected = decimal_engine.compute(inputs)
+            fixed = fixed_engine.compute(inputs)
+            actual = fixed.to_decimals()
+            for field in _MONEY_FIELDS:
+                assert actual[field] == getattr(expected, field), (field, inputs)
+            assert fixed.holding_months == expected.holding_months
+            assert fixed.holding_years == expected.holding_years
+
+    def test_covers_all_registered_cantons(self):
+        from grundstueckgewinnsteuer.cantons.registry import available_cantons as registered_cantons
+
+        assert available_cantons() == sorted(registered_cantons())
+
+
+class TestExactRationals:
+    def test_sh_church_tax_is_exact_fraction(self):
+        """Three people split the church tax without rounding in the integer domain."""
+        engine = FixedPointEngine("SH")
+        result = engine.compute_rappen(
+            10_000_00, 120, commune="Schaffhausen", tax_year=2026,
+            confessions={"evangR": 1, "roemK": 1, "Andere": 1},
+        )
+        assert isinstance(result.church_tax_total, Fraction)
+        assert result.total_tax == result.canton_share + result.commune_share + result.church_tax_total
+
+    def test_zg_rate_uses_exact_division(self):
+        engine = FixedPointEngine("ZG")
+        result = engine.compute_rappen(100_000_00, 7 * 12, cost=300_000_00)
+        # Annual yield 100/3/7 % = 4.76…% → floor at min rate 10 %
+        assert result.simple_tax == 10_000_00
@@ -0,0 +1,110 @@
+"""Tests for the parity corpus generator."""
+
+import gzip
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from grundstueckgewinnsteuer.cantons.registry import get_engine  # noqa: E402
+from grundstueckgewinnsteuer.models import Investment, TaxInputs  # noqa: E402
+from grundstueckgewinnsteuer.parity import generate_cases, tariff_boundaries, write_corpus  # noqa: E402
+
+CANTONS = ["SH", "ZH", "GE", "UR"]
+
+
+def _read(path):
+    manifest = json.loads((path / "manifest.json").read_text(encoding="utf-8"))
+    shards = []
+    for shard in manifest["shards"]:
+        opener = gzip.open if shard["file"].endswith(".gz") else open
+        with opener(path / shard["file"], "rt", encoding="utf-8") as f:
+            shards.append([json.loads(line) for line in f])
+    return manifest, shards
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory):
+    path = tmp_path_factory.mktemp("parity")
+    write_corpus(path, cases=1000, seed=3, cantons=CANTONS, shard_size=300)
+    return _read(path)
+
+
+class TestBoundaries:
+    def test_bracket_limits(self):
+        gains, months = tariff_boundaries("ZH")
+        assert gains == sorted(set(gains)) and all(g > 0 for g in gains)
+        assert 0 in months and 12 in months and len(months) > 2
+
+    def test_gains_hit_edges(self):
+        gains, _ = tariff_boundaries("ZH")
+        cases = generate_cases("ZH", 2000, np.random.default_rng(0))
+        generated = set(np.rint(
+            (cases["sale_price"] - cases["purchase_price"] - cases["acquisition_costs"]
+             - cases["selling_costs"] - cases["investments_total"]) * 100,
+        ).astype(np.int64).tolist())
+        assert len(generated & set(gains)) > len(gains) // 2
+        assert any(g < 0 for g in generated)
+
+
+class TestCorpus:
+    def test_manifest(self, corpus):
+        manifest, shards = corpus
+        assert [s["cases"] for s in manifest["shards"]] == [300, 300, 300, 100]
+        assert [len(lines) for lines in shards] == [300, 300, 300, 100]
+        assert manifest["cantons"] == {"SH": 250, "ZH": 250, "GE": 250, "UR": 250}
+
+    def test_deterministic(self, corpus, tmp_path):
+        write_corpus(tmp_path, cases=1000, seed=3, cantons=CANTONS, shard_size=300, compress=False)
+        assert _read(tmp_path)[1] == corpus[1]
+
+    def test_seed_changes_cases(self, tmp_path):
+        write_corpus(tmp_path, cases=50, seed=4, cantons=["ZH"])
+        other = tmp_path / "other"
+        write_corpus(other, cases=50, seed=5, cantons=["ZH"])
+        assert _read(tmp_path)[1] != _read(other)[1]
+
+    def test_confessions(self, corpus):
+        fixtures = [fixture for lines in corpus[1] for fixture in lines]
+        sh = [f["inputs"]["confessions"] for f in fixtures if f["inputs"]["canton"] == "SH"]
+        assert any(sh) and not all(sh)
+        assert not any(f["inputs"]["confessions"] for f in fixtures if f["inputs"]["canton"] != "SH")
+        assert any(Decimal(f["expected"]["churchTaxTotal"]) > 0 for f in fixtures)
+
+    def test_matches_canton_engines(self, corpus):
+        """Every 10th fixture – and every one with confessions – agrees with the scalar Decimal engine."""
+        fixtures = [fixture for lines in corpus[1] for fixture in lines]
+        for fixture in fixtures[::10] + [f for f in fixtures if f["inputs"]["confessions"]]:
+            inputs = fixture["inputs"]
+            result = get_engine(inputs["canton"]).compute(TaxInputs(
+                canton=inputs["canton"],
+                commune=inputs["commune"],
+                tax_year=inputs["taxYear"],
+                purchase_date=date.fromisoformat(inputs["purchaseDate"]),
+                sale_date=date.fromisoformat(inputs["saleDate"]),
+                purchase_price=Decimal(inputs["purchasePrice"]),
+                sale_price=Decimal(inputs["salePrice"]),
+                acquisition_costs=Decimal(inputs["acquisitionCosts"]),
+                selling_costs=Decimal(inputs["sellingCosts"]),
+                investments=[Investment(description=i["description"], amount=Decimal(i["amount"]))
+                             for i in inputs["investments"]],
+                confessions=inputs["confessions"],
+            ))
+            expected = fixture["expected"]
+            actual = {
+                "taxableGain": result.taxable_gain,
+                "simpleTax": result.simple_tax,
+                "cantonShare": result.canton_share,
+                "communeShare": result.commune_share,
+                "churchTaxTotal": result.church_tax_total,  # unrounded in the Decimal engine
+                "totalTax": result.total_tax,
+            }
+            for field, value in actual.items():
+                assert abs(Decimal(expected[field]) - value) <= Decimal("0.005"), (fixture["label"], field)
+
+    def test_rejects_bad_shard_size(self, tmp_path):
+        with pytest.raises(ValueError, match="shard_size"):
+            write_corpus(tmp_path, cases=1, shard_size=0)
@@ -0,0 +1,323 @@
+"""Tests for the declarative tariff pipeline (stage catalogue + compilation)."""
+
+import pickle
+import random
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from grundstueckgewinnsteuer.cantons.registry import available_cantons, get_engine
+from grundstueckgewinnsteuer.engine.pipeline import (
+    STAGES,
+    CommuneStage,
+    PipelineState,
+    compile_pipeline,
+    compile_stages,
+    compile_tariff,
+    compiled_tariff,
+    first_readers,
+    holding_rate_table,
+    load_tariff,
+    months_between,
+    validate_tariff,
+)
+from grundstueckgewinnsteuer.models import TaxInputs
+
+
+def _make_inputs(gain: Decimal, months: int = 120) -> TaxInputs:
+    purchase = date(2010, 1, 1)
+    total = 2010 * 12 + months
+    sale = date(total // 12, total % 12 + 1, 1)
+    return TaxInputs(
+        canton="ZH",
+        commune="Zürich",
+        tax_year=2025,
+        purchase_date=purchase,
+        sale_date=sale,
+        purchase_price=Decimal("100000"),
+        sale_price=Decimal("100000") + gain,
+    )
+
+
+def _run(tariff: dict, inputs: TaxInputs) -> PipelineState | None:
+    state = PipelineState(inputs)
+    for run_stage in compile_stages(tariff):
+        if run_stage(state):
+            return None
+    return state
+
+
+class TestDeclarations:
+    @pytest.mark.parametrize("code", available_cantons())
+    def test_every_canton_declares_known_stages(self, code):
+        """Each tariff.yaml has a pipeline made only of catalogued stages."""
+        pipeline = load_tariff(code)["pipeline"]
+        names = [entry if isinstance(entry, str) else next(iter(entry)) for entry in pipeline]
+        assert names[0] == "min_gain"
+        assert set(names) <= set(STAGES)
+
+    def test_compiled_once_per_canton(self):
+        """Engines share the compiled stage tuple instead of re-parsing the tariff."""
+        assert get_engine("ZH")._stages is get_engine("ZH")._stages
+        assert compile_pipeline("ZH") is compile_pipeline("ZH")
+
+    def test_unknown_stage(self):
+        with pytest.raises(ValueError, match="Unknown pipeline stage"):
+            compile_stages({"pipeline": ["no_such_stage"]})
+
+
+class TestStages:
+    def test_flat_rate_pipeline_from_plain_dict(self):
+        """A pipeline declared inline runs without any canton module."""
+        tariff = {
+            "base_rate": 0.25,
+            "minimum_taxable_gain": 1000,
+            "pipeline": ["min_gain", "flat_rate", "finalize", "allocate", "effective_rate"],
+        }
+        state = _run(tariff, _make_inputs(Decimal("10000.10")))
+        assert state.simple_tax == Decimal("2500.02")
+        assert state.total_tax == state.canton_share == state.simple_tax
+        assert state.extra["base_rate"] == "0.25"
+
+    def test_min_gain_stops_pipeline(self):
+        tariff = {"base_rate": 0.25, "minimum_taxable_gain": 1000, "pipeline": ["min_gain", "flat_rate"]}
+        assert _run(tariff, _make_inputs(Decimal("999"))) is None
+
+    def test_min_gain_inclusive(self):
+        tariff = {"minimum_taxable_gain": 1000, "pipeline": [{"min_gain": {"inclusive": True}}]}
+        assert _run(tariff, _make_inputs(Decimal("1000"))) is None
+        assert _run(tariff, _make_inputs(Decimal("1000.01"))) is not None
+
+    def test_additive_surcharge(self):
+        """SG-style surcharge adds gain × rate to the tax."""
+        tariff = {
+            "base_rate": 0.10,
+            "surcharge_threshold_months": 24,
+            "surcharges_by_year": [{"year": 1, "rate": 0.05}, {"year": 2, "rate": 0.02}],
+            "pipeline": ["flat_rate", {"surcharge": {"mode": "additive"}}, "finalize"],
+        }
+        state = _run(tariff, _make_inputs(Decimal("10000"), months=18))
+        assert state.surcharge_rate == Decimal("0.02")
+        assert state.simple_tax == Decimal("1200.00")
+
+
+def _sh_inputs(gain: Decimal, commune: str = "Schaffhausen") -> TaxInputs:
+    return _make_inputs(gain).model_copy(update={"canton": "SH", "commune": commune, "confessions": {"evangR": 1}})
+
+
+class TestSpecialization:
+    def test_cached_per_year_and_commune(self):
+        engine = get_engine("SH")
+        assert engine.specialize(2025, "Schaffhausen") is get_engine("SH").specialize(2025, "Schaffhausen")
+        assert engine.specialize(2025, "Schaffhausen") is not engine.specialize(2025, "Thayngen")
+
+    def test_commune_stages_are_bound(self):
+        _, stages = compile_pipeline("SH")
+        assert any(isinstance(st, CommuneStage) for st in stages)
+
+    def test_specialized_matches_unbound_run(self):
+        """Pre-bound multipliers give the same shares as binding on every call."""
+        inputs = _sh_inputs(Decimal("250000"))
+        result = get_engine("SH").specialize(2025, "Schaffhausen")(inputs)
+        state = _run(load_tariff("SH"), inputs)
+        assert result.total_tax == state.total_tax
+        assert result.commune_multiplier_percent == state.commune_multiplier
+        assert result.church_tax_total == state.church_total > 0
+
+    def test_unknown_commune_raises_only_when_taxed(self):
+        engine = get_engine("SH")
+        assert engine.compute(_sh_inputs(Decimal("-5000"), commune="Nowhere")).total_tax == 0
+        with pytest.raises(ValueError, match="No Steuerfuss data"):
+            engine.compute(_sh_inputs(Decimal("250000"), commune="Nowhere"))
+
+
+class TestRecompute:
+    EDITS = [
+        {"confessions": {"roemK": 2}},
+        {"confessions": {}},
+        {"commune": "Thayngen"},
+        {"commune": "Thayngen", "confessions": {"christK": 1}},
+        {"tax_year": 2024},
+        {"selling_costs": Decimal("12000")},
+        {"sale_date": date(2012, 5, 1)},
+    ]
+
+    def _assert_identical(self, result, expected):
+        assert result.model_dump() == expected.model_dump()
+
+    @pytest.mark.parametrize("edit", EDITS)
+    @pytest.mark.parametrize("gain", ["250000", "800", "-5000"])
+    def test_matches_compute(self, edit, gain):
+        engine = get_engine("SH")
+        previous = engine.compute(_sh_inputs(Decimal(gain)), checkpoint=True)
+        expected = engine.compute(_sh_inputs(Decimal(gain)).model_copy(update=edit))
+        self._assert_identical(engine.recompute(previous, edit), expected)
+
+    def test_random_edits_every_canton(self):
+        rng = random.Random(11)
+        for code in available_cantons():
+            engine = get_engine(code)
+            years = engine.get_available_years()
+            result = None
+            for _ in range(15):
+                year = rng.choice(years)
+                inputs = _make_inputs(Decimal(rng.randrange(-10_000, 2_000_000)), rng.randrange(1, 400)).model_copy(
+                    update={
+                        "canton": code,
+                        "tax_year": year,
+                        "commune": rng.choice(engine.get_communes(year)),
+                        "confessions": {rng.choice(["evangR", "roemK", "christK"]): rng.randrange(3)},
+                    },
+                )
+                expected = engine.compute(inputs)
+                if result is not None:
+                    self._assert_identical(engine.recompute(result, inputs), expected)
+                result = expected
+
+    def test_confession_edit_reuses_earlier_states(self):
+        engine = get_engine("SH")
+        previous = engine.compute(_sh_inputs(Decimal("250000")), checkpoint=True)
+        result = engine.recompute(previous, {"confessions": {"roemK": 1}})
+        church = first_readers(load_tariff("SH"))["confessions"]
+        assert church > 0
+        kept = [i for i in previous._checkpoint.states if i < church]
+        assert kept and all(result._checkpoint.states[i] is previous._checkpoint.states[i] for i in kept)
+        assert result.simple_tax == previous.simple_tax
+        assert result.church_tax_breakdown != previous.church_tax_breakdown
+
+    def test_checkpoint_is_opt_in(self):
+        engine = get_engine("SH")
+        inputs = _sh_inputs(Decimal("250000"))
+        assert engine.compute(inputs)._checkpoint is None
+        result = engine.compute(inputs, checkpoint=True)
+        assert result._checkpoint is not None
+        self._assert_identical(result, engine.compute(inputs))
+        with pytest.raises(ValueError, match="checkpoint=True"):
+            engine.recompute(engine.compute(inputs), {"confessions": {}})
+        assert engine.recompute(engine.compute(inputs), inputs)._checkpoint is not None
+
+    def test_checkpoint_is_not_part_of_the_value(self):
+        engine = get_engine("SH")
+        result = engine.compute(_sh_inputs(Decimal("250000")), checkpoint=True)
+        restored = pickle.loads(pickle.dumps(result))
+        assert restored == result and restored._checkpoint is None
+        with pytest.raises(ValueError, match="no checkpoint"):
+            engine.recompute(restored, {"confessions": {}})
+        changed = _sh_inputs(Decimal("250000"), commune="Thayngen")
+        self._assert_identical(engine.recompute(restored, changed), engine.compute(changed))
+
+    def test_first_readers(self):
+        sh = first_readers(load_tariff("SH"))
+        assert sh["commune"] == sh["tax_year"] < sh["confessions"] < len(load_tariff("SH")["pipeline"])
+        assert set(first_readers(load_tariff("ZH")).values()) == {len(load_tariff("ZH")["pipeline"])}
+
+
+class TestComputeAllCommunes:
+    @pytest.mark.parametrize("gain", ["250000", "1500", "-5000"])
+    def test_matches_compute_per_commune(self, gain):
+        engine = get_engine("SH")
+        inputs = _sh_inputs(Decimal(gain)).model_copy(update={"confessions": {"evangR": 1, "roemK": 1}})
+        rows = engine.compute_all_communes(inputs)
+        assert sorted(row.commune for row in rows) == sorted(engine.get_communes(2025))
+        for row in rows:
+            result = engine.compute(inputs.model_copy(update={"commune": row.commune}))
+            assert row == (
+                row.commune, result.total_tax, result.canton_share, result.commune_share,
+                result.church_tax_total, result.commune_multiplier_percent,
+            )
+
+    def test_ranked_cheapest_first(self):
+        rows = get_engine("SH").compute_all_communes(_sh_inputs(Decimal("250000")))
+        assert [(row.total_tax, row.commune) for row in rows] == sorted((row.total_tax, row.commune) for row in rows)
+        assert rows[0].total_tax < rows[-1].total_tax
+
+    def test_canton_without_commune_stages(self):
+        engine = get_engine("ZH")
+        inputs = _make_inputs(Decimal("250000"))
+        rows = engine.compute_all_communes(inputs)
+        assert {row.total_tax for row in rows} == {engine.compute(inputs).total_tax}
+
+
+class TestMarginal:
+    def test_rate_and_holding_delta(self):
+        engine = get_engine("ZH")
+        inputs = _make_inputs(Decimal("250000"), months=30)
+        m = engine.marginal(inputs)
+        assert m.holding_months == 30 and m.next_holding_months == 60
+        later = _make_inputs(Decimal("250000"), months=60)
+        assert m.holding_delta == engine.compute(later).total_tax - engine.compute(inputs).total_tax < 0
+        step = engine.compute(_make_inputs(Decimal("251000"), months=30)).total_tax - engine.compute(inputs).total_tax
+        assert abs(m.marginal_rate_percent * 10 - step) <= Decimal("0.01")
+
+    def test_no_tax_no_breaks_left(self):
+        m = get_engine("ZH").marginal(_make_inputs(Decimal("-5000"), months=600))
+        assert m == (0, 600, None, 0)
+
+
+class TestHoldingRateTables:
+    @pytest.mark.parametrize("code", ["AG", "NW", "GE", "TI", "VD", "FR", "UR"])
+    def test_table_matches_engine(self, code):
+        engine = get_engine(code)
+        table = holding_rate_table(code)
+        for years in (0, 1, 2, 5, 10, 15, 20, 24, 25, 26, 40, 80):
+            inputs = _make_inputs(Decimal("300000"), months=12 * years + 3).model_copy(
+                update={"canton": code, "commune": engine.get_communes(2025)[0]},
+            )
+            result = engine.compute(inputs)
+            expected = Decimal(result.extra.get("applied_rate", result.extra.get("holding_period_rate")))
+            assert table.rate(years) == expected, years
+
+    def test_self_used(self):
+        assert holding_rate_table("BS", self_used=True) != holding_rate_table("BS")
+        with pytest.raises(KeyError):
+            holding_rate_table("AG", self_used=True)
+        with pytest.raises(ValueError, match="holding_rate"):
+            holding_rate_table("ZH")
+
+
+class TestCompiledTariff:
+    @pytest.mark.parametrize("code", available_cantons())
+    def test_packaged_tariffs_are_valid(self, code):
+        validate_tariff(load_tariff(code))
+
+    def test_cached_and_immutable(self):
+        compiled = compiled_tariff("sh")
+        assert compiled is compiled_tariff("SH")
+        assert get_engine("SH")._stages is compiled.stages
+        assert compiled.stage_names[:2] == ("min_gain", "brackets")
+        with pytest.raises(AttributeError):
+            compiled.stages = ()
+        with pytest.raises(TypeError):
+            compiled.first_readers["commune"] = 0
+
+    def test_rate_tables(self):
+        assert compiled_tariff("GE").rate_tables[False] == holding_rate_table("GE")
+        assert not compiled_tariff("ZH").rate_tables
+
+    @pytest.mark.parametrize(("change", "message"), [
+        ({"brackets": [{"limit": 2000, "rate": 0.02}, {"limit": 1000, "rate": 0.04}]}, "strictly ascending"),
+        ({"brackets": [{"limit": 2000, "rate": 1.5}]}, r"outside \[0, 1\]"),
+        ({"top_rate": -0.1}, "top_rate"),
+        ({"minimum_taxable_gain": -1}, "must not be negative"),
+        ({"pipeline": []}, "pipeline"),
+    ])
+    def test_rejects_invalid(self, change, message):
+        tariff = {**load_tariff("SH"), **change}
+        with pytest.raises(ValueError, match=message):
+            compile_tariff(tariff, "SH")
+
+    def test_rejects_overlapping_holding_buckets(self):
+        tariff = {**load_tariff("GE"), "rate_schedule": [{"max_years": 2, "rate": 0.5}, {"max_years": 2, "rate": 0.4}]}
+        with pytest.raises(ValueError, match="(?s)GE: .*rate_schedule"):
+            compile_tariff(tariff, "GE")
+
+    def test_reports_every_problem(self):
+        tariff = {**load_tariff("SH"), "top_rate": 2, "minimum_taxable_gain": -5}
+        with pytest.raises(ValueError, match="(?s)top_rate.*minimum_taxable_gain"):
+            validate_tariff(tariff)
+
+
+class TestHelpers:
+    def test_months_between(self):
+        assert months_between(date(2020, 3, 31), date(2021, 3, 1)) == 12
@@ -0,0 +1,99 @@
+"""Tests for the pre-warmed EnginePool."""
+
+import multiprocessing as mp
+import threading
+from concurrent.futures import CancelledError
+from datetime import date
+from decimal import Decimal
+from multiprocessing import forkserver
+
+import pytest
+
+from grundstueckgewinnsteuer import pool as pool_module
+from grundstueckgewinnsteuer.cantons.registry import available_cantons, get_engine
+from grundstueckgewinnsteuer.models import TaxInputs
+from grundstueckgewinnsteuer.pool import EnginePool, warm_up
+
+
+def _inputs(i: int) -> TaxInputs:
+    code = available_cantons()[i % len(available_cantons())]
+    engine = get_engine(code)
+    return TaxInputs(
+        canton=code,
+        commune=engine.get_communes(2025)[0],
+        tax_year=2025,
+        purchase_date=date(2000 + i % 20, 1 + i % 12, 1),
+        sale_date=date(2025, 6, 1),
+        purchase_price=Decimal("400000"),
+        sale_price=Decimal(400000 + 1000 * i),
+    )
+
+
+@pytest.fixture(scope="module")
+def cases():
+    inputs = [_inputs(i) for i in range(60)]
+    return inputs, [get_engine(c.canton).compute(c).total_tax for c in inputs]
+
+
+class TestEnginePool:
+    def test_warm_up_covers_registry(self):
+        assert warm_up() == available_cantons()
+
+    def test_thread_pool(self, cases):
+        inputs, expected = cases
+        with EnginePool(4, kind="thread") as pool:
+            assert [r.total_tax for r in pool.map(inputs)] == expected
+            assert pool.submit(inputs[0]).result().total_tax == expected[0]
+
+    def test_submit_propagates_errors(self, cases):
+        inputs, _ = cases
+        with EnginePool(1, kind="thread") as pool, pytest.raises(KeyError):
+            pool.submit(inputs[0].model_copy(update={"canton": "XX"})).result()
+
+    def test_queued_submissions_can_be_cancelled(self, cases, monkeypatch):
+        inputs, expected = cases
+        started, gate = [], threading.Event()
+
+        def gated(item):
+            started.append(item)
+            gate.wait(5)
+            return get_engine(item.canton).compute(item)
+
+        monkeypatch.setattr(pool_module, "compute", gated)
+        with EnginePool(2, kind="thread", warm=False) as pool:
+            futures = [pool.submit(item) for item in inputs[:6]]
+            assert [f.cancel() for f in futures] == [False, False, True, True, True, True]
+            gate.set()
+            assert [f.result().total_tax for f in futures[:2]] == expected[:2]
+        assert started == inputs[:2]
+
+    def test_cancelling_shutdown_settles_running_futures(self, cases):
+        inputs, _ = cases
+        pool = EnginePool(2)
+        futures = [pool.submit(item) for item in inputs[:50]]
+        pool.shutdown(cancel_futures=True)
+        assert all(f.done() for f in futures)
+        assert sum(f.cancelled() for f in futures) >= 48
+        for f in futures[:2]:
+            with pytest.raises(CancelledError):
+                f.result(timeout=0)
+
+    def test_process_pool_with_recycling(self, cases):
+        inputs, expected = cases
+        with EnginePool(2, max_tasks_per_worker=5) as pool:
+            assert [r.total_tax for r in pool.map(inputs, chunksize=4)] == expected
+            unordered = [r.total_tax for r in pool.imap_unordered(inputs)]
+        assert sorted(unordered) == sorted(expected)
+
+    @pytest.mark.skipif("forkserver" not in mp.get_all_start_methods(), reason="no forkserver")
+    def test_leaves_forkserver_preload_alone(self):
+        before = list(forkserver._forkserver._preload_modules)
+        with EnginePool(1, start_method="forkserver", warm=False) as pool:
+            pool.submit(_inputs(0)).result()
+        assert forkserver._forkserver._preload_modules == before
+
+    def test_invalid_configuration(self):
+        with pytest.raises(ValueError, match="kind"):
+            EnginePool(1, kind="fiber")
+        with pytest.raises(ValueError, match="max_tasks_per_worker"):
+            EnginePool(1, kind="thread", max_tasks_per_worker=10)
@@ -0,0 +1,127 @@
+"""Tests for portfolio aggregation."""
+
+import random
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from grundstueckgewinnsteuer.models import TaxInputs
+from grundstueckgewinnsteuer.pool import EnginePool, compute
+from grundstueckgewinnsteuer.portfolio import Portfolio, Totals
+
+
+def _inputs(canton: str, commune: str, year: int, gain: int, **kwargs) -> TaxInputs:
+    return TaxInputs(
+        canton=canton,
+        commune=commune,
+        tax_year=year,
+        purchase_date=date(2010, 3, 1),
+        sale_date=date(year, 6, 1),
+        purchase_price=Decimal("500000"),
+        sale_price=Decimal(500000 + gain),
+        **kwargs,
+    )
+
+
+PROPERTIES = {
+    "a": _inputs("SH", "Schaffhausen", 2025, 120_000),
+    "b": _inputs("SH", "Beringen", 2024, 80_000, confessions={"evangR": 1}),
+    "c": _inputs("ZH", "Zürich", 2025, 300_000),
+    "d": _inputs("ZH", "Winterthur", 2025, -20_000),
+}
+
+
+def _fresh(portfolio: Portfolio) -> tuple[Totals, dict, dict, dict]:
+    total, cantons, communes, years = Totals(), {}, {}, {}
+    for key in portfolio:
+        inputs, result = portfolio.inputs(key), portfolio.result(key)
+        total = total.adjust(result, 1)
+        for groups, group in (
+            (cantons, inputs.canton),
+            (communes, (inputs.canton, inputs.commune)),
+            (years, inputs.tax_year),
+        ):
+            groups[group] = groups.get(group, Totals()).adjust(result, 1)
+    return total, cantons, communes, years
+
+
+def _assert_consistent(portfolio: Portfolio) -> None:
+    assert (portfolio.total, dict(portfolio.by_canton), dict(portfolio.by_commune), dict(portfolio.by_year)) == (
+        _fresh(portfolio)
+    )
+
+
+class TestPortfolio:
+    def test_aggregates(self):
+        portfolio = Portfolio(PROPERTIES)
+        results = {key: compute(inputs) for key, inputs in PROPERTIES.items()}
+        assert portfolio.total.count == 4
+        assert portfolio.total.total_tax == sum(r.total_tax for r in results.values())
+        assert portfolio.by_canton["SH"].total_tax == results["a"].total_tax + results["b"].total_tax
+        assert portfolio.by_commune[("ZH", "Zürich")].total_tax == results["c"].total_tax
+        assert portfolio.by_year[2024].count == 1
+        _assert_consistent(portfolio)
+
+    def test_effective_rate_ignores_losses(self):
+        portfolio = Portfolio(PROPERTIES)
+        zh = portfolio.by_canton["ZH"]
+        assert zh.taxable_gain == portfolio.result("c").taxable_gain
+        assert zh.effective_rate_percent == 100 * zh.total_tax / zh.taxable_gain
+        assert Totals().effective_rate_percent == 0
+
+    def test_edit_computes_one_property(self):
+        calls = []
+
+        def counting(inputs):
+            calls.append(inputs)
+            return compute(inputs)
+
+        portfolio = Portfolio(PROPERTIES, compute=counting)
+        calls.clear()
+        portfolio.update("a", sale_price=Decimal("700000"))
+        assert len(calls) == 1
+        assert portfolio.result("a") == compute(portfolio.inputs("a"))
+        _assert_consistent(portfolio)
+
+    def test_moving_and_removing_drop_empty_groups(self):
+        portfolio = Portfolio(PROPERTIES)
+        portfolio.update("b", tax_year=2025)
+        assert 2024 not in portfolio.by_year
+        portfolio.remove("a")
+        portfolio.remove("b")
+        assert "SH" not in portfolio.by_canton
+        assert len(portfolio) == 2
+        _assert_consistent(portfolio)
+
+    def test_random_edits_stay_exact(self):
+        rng = random.Random(5)
+        portfolio = Portfolio()
+        communes = [("SH", "Schaffhausen"), ("SH", "Thayngen"), ("ZH", "Zürich"), ("ZH", "Uster")]
+        for _ in range(200):
+            key = rng.randrange(20)
+            if key in portfolio and rng.random() < 0.2:
+                portfolio.remove(key)
+            else:
+                canton, commune = rng.choice(communes)
+                portfolio.set(key, _inputs(canton, commune, rng.choice([2024, 2025]), rng.randrange(-50_000, 900_000)))
+        _assert_consistent(portfolio)
+
+    def test_failed_update_leaves_portfolio_unchanged(self):
+        portfolio = Portfolio(PROPERTIES)
+        before = portfolio.total
+        with pytest.raises(ValueError):
+            portfolio.update("a", commune="Nowhere")
+        assert portfolio.total == before
+        assert portfolio.inputs("a") == PROPERTIES["a"]
+
+    def test_views_are_read_only(self):
+        portfolio = Portfolio(PROPERTIES)
+        with pytest.raises(TypeError):
+            portfolio.by_canton["SH"] = Totals()
+
+    def test_extend_with_pool(self):
+        with EnginePool(2, kind="thread", warm=False) as pool:
+            portfolio = Portfolio()
+            portfolio.extend(PROPERTIES.items(), pool=pool)
+        assert portfolio.total == Portfolio(PROPERTIES).total
@@ -0,0 +1,94 @@
+"""Tests for the Monte Carlo sale simulation."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from grundstueckgewinnsteuer.cantons.registry import get_engine  # noqa: E402
+from grundstueckgewinnsteuer.engine.simulation import Simulation, simulate  # noqa: E402
+from grundstueckgewinnsteuer.models import TaxInputs  # noqa: E402
+
+
+def _inputs(canton: str = "SH", commune: str = "Schaffhausen", **kwargs) -> TaxInputs:
+    return TaxInputs(
+        canton=canton,
+        commune=commune,
+        tax_year=2025,
+        purchase_date=date(2015, 4, 1),
+        sale_date=date(2025, 4, 1),
+        purchase_price=Decimal("800000"),
+        sale_price=Decimal("1000000"),
+        selling_costs=Decimal("12000"),
+        **kwargs,
+    )
+
+
+def _sold(inputs: TaxInputs, price: int, months: int) -> TaxInputs:
+    total = 2015 * 12 + 3 + months
+    return inputs.model_copy(update={
+        "sale_price": Decimal(price).scaleb(-2), "sale_date": date(total // 12, total % 12 + 1, 1),
+    })
+
+
+class TestSimulate:
+    @pytest.mark.parametrize(
+        "canton, commune", [("SH", "Schaffhausen"), ("ZH", "Zürich"), ("ZG", "Zug"), ("BL", "Liestal")],
+    )
+    def test_draws_match_engine(self, canton, commune):
+        inputs = _inputs(canton, commune, confessions={"evangR": 1, "roemK": 1} if canton == "SH" else {})
+        prices = [700_000, 905_000.25, 1_000_000, 1_450_000]
+        months = [3, 30, 120, 400]
+        sim = simulate(inputs, prices, months)
+        engine = get_engine(canton)
+        for i, (price, held) in enumerate(zip(prices, months, strict=True)):
+            rappen = round(price * 100)
+            expected = engine.compute(_sold(inputs, rappen, held))
+            assert Decimal(int(sim.total_tax[i])).scaleb(-2) == expected.total_tax.quantize(Decimal("0.01"))
+            assert sim.net_proceeds[i] == rappen - 12_000_00 - sim.total_tax[i]
+
+    def test_seeded_and_chunk_bounded(self):
+        def price(rng, n):
+            return rng.normal(1_000_000, 80_000, n)
+
+        def months(rng, n):
+            return rng.integers(1, 240, n)
+
+        sim = simulate(_inputs(), price, months, draws=5_000, seed=42, chunk_size=1_000)
+        assert len(sim) == 5_000
+        again = simulate(_inputs(), price, months, draws=5_000, seed=42, chunk_size=1_000)
+        assert np.array_equal(sim.total_tax, again.total_tax)
+        other = simulate(_inputs(), price, months, draws=5_000, seed=43, chunk_size=1_000)
+        assert not np.array_equal(sim.total_tax, other.total_tax)
+
+    def test_default_holding_period_and_constant_price(self):
+        inputs = _inputs("ZH", "Zürich")
+        sim = simulate(inputs, 1_000_000, draws=3)
+        assert set(sim.total_tax.tolist()) == {int(get_engine("ZH").compute(inputs).total_tax * 100)}
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError, match="differ in length"):
+            simulate(_inputs(), [1, 2], [1, 2, 3])
+        with pytest.raises(ValueError, match="does not match"):
+            simulate(_inputs(), [1, 2], draws=5)
+        with pytest.raises(ValueError, match="No Steuerfuss data"):
+            simulate(_inputs(commune="Nowhere"), [1_000_000])
+
+
+class TestSummaries:
+    SIM = Simulation(np.arange(0, 10_001, dtype=np.int64), np.arange(10_000, -1, -1, dtype=np.int64))
+
+    def test_quantiles_are_drawn_values(self):
+        q = self.SIM.quantiles((0.0, 0.5, 1.0))
+        assert q["total_tax"] == {0.0: Decimal("0.00"), 0.5: Decimal("50.00"), 1.0: Decimal("100.00")}
+        assert q["net_proceeds"][0.5] == Decimal("50.00")
+
+    def test_histogram_and_mean(self):
+        counts, edges = self.SIM.histogram(bins=4)
+        assert counts.sum() == len(self.SIM)
+        assert edges[0] == 0 and edges[-1] == 100
+        assert self.SIM.mean() == Decimal("50")
+        with pytest.raises(KeyError, match="bogus"):
+            self.SIM.histogram("bogus")
@@ -0,0 +1,91 @@
+"""Tests for the compiled, memory-mapped Steuerfuss store."""
+
+from decimal import Decimal
+
+import pytest
+
+from grundstueckgewinnsteuer.engine.steuerfuss import (
+    SteuerfussStore,
+    compile_file,
+    compile_steuerfuesse,
+    load_steuerfuss_store,
+    read_source,
+    source_files,
+    to_decimal,
+)
+
+SOURCE = {
+    "2025": [
+        {"Gemeinde": "Kanton", "natPers": "79", "evangR": "0"},
+        {"Gemeinde": "Zürich", "natPers": "119", "evangR": "12.5", "roemK": "11"},
+    ],
+    "2024": [
+        {"Gemeinde": "Kanton", "natPers": "81"},
+    ],
+}
+
+
+@pytest.fixture
+def store():
+    return SteuerfussStore(compile_steuerfuesse(SOURCE))
+
+
+class TestPackagedStores:
+    @pytest.mark.parametrize("source", source_files(), ids=lambda p: p.parent.name)
+    def test_compiled_file_is_current(self, source):
+        """The packaged ``.bin`` must be recompiled whenever its source changes."""
+        assert source.with_suffix(".bin").read_bytes() == compile_steuerfuesse(read_source(source))
+
+    @pytest.mark.parametrize("source", source_files(), ids=lambda p: p.parent.name)
+    def test_values_match_source(self, source):
+        store = load_steuerfuss_store(f"communes/{source.parent.name}/steuerfuesse.bin")
+        for year, entries in read_source(source).items():
+            for entry in entries:
+                for column in store.columns:
+                    expected = Decimal(str(entry.get(column, "0")))
+                    value = store.value(int(year), entry["Gemeinde"], column)
+                    assert (value, str(value)) == (expected, str(expected))
+
+
+class TestSteuerfussStore:
+    def test_rows(self, store):
+        assert store.keys == [(2025, "Kanton"), (2025, "Zürich"), (2024, "Kanton")]
+        assert store.years == [2024, 2025]
+        assert store.communes(2025) == ["Kanton", "Zürich"]
+        assert store.columns == ("natPers", "evangR", "roemK")
+
+    def test_values(self, store):
+        assert store.value(2025, "Zürich", "evangR") == Decimal("12.5")
+        assert store.value(2024, "Kanton", "roemK") == 0
+        assert store.value(2025, "Zürich", "christK") == 0
+        with pytest.raises(KeyError):
+            store.value(2023, "Kanton", "natPers")
+
+    def test_column_is_scaled_int64_view(self, store):
+        column = store.column("natPers")
+        assert isinstance(column, memoryview) and column.format == "q"
+        assert list(column) == [79_000_000, 119_000_000, 81_000_000]
+        with pytest.raises(KeyError, match="jurPers"):
+            store.column("jurPers")
+
+    def test_mmap_file(self, tmp_path):
+        source = tmp_path / "steuerfuesse.yaml"
+        source.write_text("2025:\n  - {Gemeinde: Kanton, natPers: 79}\n  - {Gemeinde: Bern, natPers: 154.5}\n")
+        store = SteuerfussStore.open(compile_file(source))
+        assert store.value(2025, "Bern", "natPers") == Decimal("154.5")
+        assert store.column("natPers").readonly
+
+    def test_rejects_other_files(self):
+        with pytest.raises(ValueError, match="Not a compiled"):
+            SteuerfussStore(b"\0" * 64)
+
+    def test_rejects_bad_sources(self):
+        with pytest.raises(ValueError, match="six decimal"):
+            compile_steuerfuesse({"2025": [{"Gemeinde": "Kanton", "natPers": "1.0000001"}]})
+        with pytest.raises(ValueError, match="Duplicate"):
+            compile_steuerfuesse({"2025": [{"Gemeinde": "Kanton"}, {"Gemeinde": "Kanton"}]})
+
+    def test_to_decimal(self):
+        assert str(to_decimal(102_000_000)) == "102"
+        assert str(to_decimal(12_500_000)) == "12.5"
+        assert str(to_decimal(-500_000)) == "-0.5"
@@ -5,6 +5,7 @@ from decimal import Decimal
 from grundstueckgewinnsteuer.engine.tariff import (
     Bracket,
     DiscountEntry,
+    RateTable,
     SurchargeEntry,
     apply_discount,
     apply_surcharge,
@@ -162,3 +163,19 @@ class TestComputeChurchTax:
         assert total == Decimal("65")
         assert breakdown["evangR"] == Decimal("65")
         assert breakdown["Andere"] == Decimal("0")
+
+
+class TestRateTable:
+    def test_from_schedule(self):
+        table = RateTable.from_schedule(
+            [{"max_years": 2, "rate": 0.3}, {"max_years": 4, "rate": "0.2"}], floor_rate=0.1,
+        )
+        assert table.rates == (Decimal("0.3"), Decimal("0.3"), Decimal("0.2"), Decimal("0.2"), Decimal("0.1"))
+        assert table.rate(-3) == Decimal("0.3")
+        assert table.rate(99) == Decimal("0.1")
+
+    def test_from_years(self):
+        table = RateTable.from_years({1: 0.4, 2: 0.35, 4: 0.3}, min_rate=0.05, last=5)
+        assert [str(r) for r in table.rates] == ["0.4", "0.4", "0.35", "0.05", "0.3", "0.05", "0.05"]
+        assert table.rate(0) == table.rate(1) == Decimal("0.4")
+        assert table.rate(30) == Decimal("0.05")
@@ -0,0 +1,85 @@
+"""Tests for the streaming Parquet / Arrow result writer."""
+
+import io
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pytest.importorskip("numpy")
+
+import pyarrow.parquet as pq  # noqa: E402
+
+from grundstueckgewinnsteuer.cantons.registry import get_engine  # noqa: E402
+from grundstueckgewinnsteuer.engine.batch import compute_table  # noqa: E402
+from grundstueckgewinnsteuer.engine.writer import RESULT_SCHEMA, ResultWriter  # noqa: E402
+from grundstueckgewinnsteuer.models import TaxInputs  # noqa: E402
+
+
+def _inputs(canton: str, commune: str, gain: int, confessions: dict | None = None) -> TaxInputs:
+    return TaxInputs(
+        canton=canton,
+        commune=commune,
+        tax_year=2025,
+        purchase_date=date(2015, 3, 1),
+        sale_date=date(2025, 6, 1),
+        purchase_price=Decimal("500000"),
+        sale_price=Decimal("500000") + gain,
+        confessions=confessions or {},
+    )
+
+
+@pytest.fixture
+def results():
+    cases = [_inputs("ZH", "Zürich", 1000 * i + 7) for i in range(1, 8)]
+    cases += [_inputs("SH", "Schaffhausen", 33333, {"evangR": 1, "roemK": 1})]
+    return [get_engine(c.canton).compute(c) for c in cases]
+
+
+class TestResultWriter:
+    def test_parquet_row_groups(self, results, tmp_path):
+        path = tmp_path / "out.parquet"
+        with ResultWriter(path, row_group_size=3) as writer:
+            for result in results:
+                writer.write(result)
+        assert writer.rows_written == len(results)
+
+        parquet = pq.ParquetFile(path)
+        assert parquet.metadata.num_row_groups == 3
+        table = parquet.read()
+        assert table.schema.field("total_tax").type == pa.decimal128(18, 2)
+        assert pa.types.is_dictionary(table.schema.field("commune").type)
+        assert table.column("commune").to_pylist() == [r.metadata.commune for r in results]
+        assert table.column("simple_tax").to_pylist() == [r.simple_tax for r in results]
+
+    def test_church_tax_rounded_to_rappen(self, results, tmp_path):
+        path = tmp_path / "out.parquet"
+        with ResultWriter(path) as writer:
+            writer.write(results[-1])
+        church = pq.read_table(path).column("church_tax_total")[0].as_py()
+        assert church == results[-1].church_tax_total.quantize(Decimal("0.01"))
+
+    def test_arrow_stream_with_batches(self, results):
+        sink = io.BytesIO()
+        batch = compute_table({
+            "canton": ["ZH", "GR", "ZH"],
+            "commune": ["Winterthur", "Chur", "Zürich"],
+            "tax_year": [2025] * 3,
+            "purchase_date": [date(2010, 1, 1)] * 3,
+            "sale_date": [date(2025, 1, 1)] * 3,
+            "purchase_price": [100_000] * 3,
+            "sale_price": [150_000, 250_000, 180_000],
+        })
+        with ResultWriter(sink, format="arrow", row_group_size=2) as writer:
+            writer.write(results[0])
+            writer.write_batch(batch)
+            writer.write(results[1])
+        table = pa.ipc.open_stream(sink.getvalue()).read_all()
+        assert table.schema == RESULT_SCHEMA
+        assert table.column("commune").to_pylist() == ["Zürich", "Winterthur", "Chur", "Zürich", "Zürich"]
+        assert table.column("total_tax").to_pylist()[1:4] == batch.to_arrow().column("total_tax").to_pylist()
+
+    def test_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError, match="Unknown format"):
+            ResultWriter(tmp_path / "x", format="csv")